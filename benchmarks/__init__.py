@@ -0,0 +1 @@
+"""Performance benchmarks of SeleniumScraper against the local web application from /tests/web_app/app.py."""
@@ -0,0 +1,121 @@
+import logging
+import math
+import statistics
+import subprocess
+import sys
+import threading
+import timeit
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import psutil
+import requests
+
+from selenium_scraper import CommonScraper, Scraper
+
+logger = logging.getLogger("benchmarks")
+
+BASE_URL = "http://127.0.0.1:8000"
+STARTUP_TIMEOUT = 5
+BROWSERS: dict[str, Callable[..., CommonScraper]] = {"chrome": Scraper.chrome, "firefox": Scraper.firefox}
+
+
+@contextmanager
+def web_app(base_url: str = BASE_URL) -> Iterator[str]:
+    """Start local web application `tests/web_app/app.py` while the benchmark is running.
+
+    :param base_url: URL of the application
+    :return: URL of the application
+    """
+    process = subprocess.Popen(args=[sys.executable, "-u", "tests/web_app/app.py"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    start_time = timeit.default_timer()
+    try:
+        while timeit.default_timer() - start_time < STARTUP_TIMEOUT:
+            try:
+                if requests.get(base_url + "/ping", timeout=0.5).text == "pong":
+                    break
+            except requests.exceptions.RequestException:
+                continue
+        else:
+            msg = "Local web application was not launched"
+            raise RuntimeError(msg)
+        yield base_url
+    finally:
+        process.terminate()
+
+
+def measure(func: Callable[[], object], repeat: int) -> list[float]:
+    """Call `func` `repeat` times.
+
+    :return: durations of the calls (seconds)
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = timeit.default_timer()
+        func()
+        durations.append(timeit.default_timer() - start_time)
+    return durations
+
+
+def log_durations(name: str, durations: list[float]) -> None:
+    """Log min/median/max of the durations."""
+    logger.info("%-30s min %8.1f ms, median %8.1f ms, max %8.1f ms", name,
+                min(durations) * 1000, statistics.median(durations) * 1000, max(durations) * 1000)
+
+
+def percentile(durations: list[float], q: float) -> float:
+    """Percentile of the durations with the nearest-rank method.
+
+    :param q: percentile, from 0 to 100
+    """
+    ordered = sorted(durations)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def process_tree_rss(process: psutil.Process) -> int:
+    """Resident set size of the process with all its children (bytes)."""
+    def rss(tree_process: psutil.Process) -> int:
+        try:
+            return tree_process.memory_info().rss
+        except psutil.Error:
+            # The process has exited
+            return 0
+
+    try:
+        children = process.children(recursive=True)
+    except psutil.Error:
+        children = []
+    return sum(rss(tree_process) for tree_process in (process, *children))
+
+
+class PeakRssMonitor:
+    """Context manager sampling the RSS of the process tree (e.g. the driver with its browser) in the background."""
+
+    def __init__(self, process: psutil.Process, interval: float = 0.05):
+        """Initialize PeakRssMonitor.
+
+        :param process: root process of the tree
+        :param interval: sampling interval (seconds)
+        """
+        self._process = process
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self.peak_rss = 0
+
+    def __enter__(self) -> "PeakRssMonitor":
+        """Start sampling."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_rss = max(self.peak_rss, process_tree_rss(self._process))
+            if self._stop.wait(self._interval):
+                break
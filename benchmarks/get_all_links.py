@@ -0,0 +1,36 @@
+"""Compare link extraction in the browser with parsing of the page source.
+
+Usage: python -m benchmarks.get_all_links --browser chrome --links 10000 100000
+"""
+import argparse
+import logging
+from functools import partial
+
+from selenium_scraper.mapping import LinkExtractionMethods
+
+from .common import BROWSERS, log_durations, logger, measure, web_app
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=BROWSERS, default="chrome")
+    parser.add_argument("--links", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="number of links on the page")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with web_app() as base_url:
+        scraper = BROWSERS[args.browser](headless=True)
+        for count in args.links:
+            scraper.get(base_url + "/page_with_many_links", {"count": str(count)}, timeout=60)
+            logger.info("Page with %d links, %d bytes", count, len(scraper.driver.page_source))
+            for method in (LinkExtractionMethods.js, LinkExtractionMethods.soup):
+                durations = measure(partial(scraper.get_all_links, method=method), args.repeat)
+                log_durations(f"get_all_links(method={method!r})", durations)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("selenium_scraper").setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,51 @@
+"""Compare browser startup without and with the startup cache.
+
+Usage: python -m benchmarks.startup --browser chrome --repeat 5
+"""
+import argparse
+import logging
+import tempfile
+import timeit
+from collections.abc import Callable
+from functools import partial
+
+from selenium_scraper import CommonScraper, StartupCache
+
+from .common import BROWSERS, log_durations, logger
+
+
+def measure_startup(start: Callable[[], CommonScraper], repeat: int) -> list[float]:
+    """Start and close the browser `repeat` times.
+
+    :return: durations of the starts (seconds)
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = timeit.default_timer()
+        scraper = start()
+        durations.append(timeit.default_timer() - start_time)
+        scraper.close()
+    return durations
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browser", choices=BROWSERS, default="chrome")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    browser = BROWSERS[args.browser]
+    log_durations("cold start", measure_startup(partial(browser, headless=True), args.repeat))
+
+    with tempfile.TemporaryDirectory() as cache_directory:
+        start = partial(browser, headless=True, startup_cache=StartupCache(cache_directory))
+        logger.info("First start with the cache (creates the profile template)")
+        log_durations("cached start (first)", measure_startup(start, 1))
+        log_durations("cached start", measure_startup(start, args.repeat))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("selenium_scraper").setLevel(logging.WARNING)
+    main()
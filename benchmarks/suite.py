@@ -0,0 +1,191 @@
+"""Benchmark suite of the main scraper operations on generated pages.
+
+Every scenario is run on every browser, the results are saved as JSON, so that they can be compared
+between versions:
+
+    python -m benchmarks.suite --output before.json
+    git checkout my-branch
+    python -m benchmarks.suite --output after.json --compare before.json
+
+Scenarios:
+    get                  - load a small page
+    get_slow_resource    - load a page with an image loading for --latency seconds
+    current_page         - transfer and parse a huge DOM (--depth levels of --breadth children)
+    get_all_links        - collect --links links in the browser (LinkExtractionMethods.js)
+    get_all_links_soup   - collect --links links from the parsed page (LinkExtractionMethods.soup)
+    scroll_infinite_page - scroll a feed --scrolls times, every request of the feed items takes --latency seconds
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+from importlib import metadata
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import psutil
+
+from selenium_scraper import CommonScraper
+from selenium_scraper.mapping import LinkExtractionMethods
+
+from .common import BROWSERS, PeakRssMonitor, logger, percentile, process_tree_rss, web_app
+
+ScraperAction = Callable[[CommonScraper], object]
+
+
+def skip(_scraper: CommonScraper) -> None:
+    """Scenario step doing nothing."""
+
+
+class Scenario(NamedTuple):
+    """Benchmark scenario: `run` is timed `repeat` times after `setup` and before every run `prepare`."""
+    name: str
+    run: ScraperAction
+    setup: ScraperAction = skip
+    prepare: ScraperAction = skip
+
+
+def build_scenarios(base_url: str, args: argparse.Namespace) -> list[Scenario]:
+    """Scenarios with the pages of the local web application."""
+    small_page_url = f"{base_url}/page_with_many_links?count=100"
+    slow_page_url = f"{base_url}/page_with_slow_resource?delay={args.latency}"
+    huge_dom_url = f"{base_url}/page_with_huge_dom?depth={args.depth}&breadth={args.breadth}"
+    many_links_url = f"{base_url}/page_with_many_links?count={args.links}"
+    feed_url = f"{base_url}/infinite_feed?latency={args.latency}&pages={args.scrolls + 1}"
+    timeout = 120
+
+    def get(url: str) -> ScraperAction:
+        return lambda scraper: scraper.get(url, timeout=timeout)
+
+    return [
+        Scenario("get", get(small_page_url)),
+        Scenario("get_slow_resource", get(slow_page_url)),
+        Scenario("current_page",
+                 run=lambda scraper: scraper.current_page,
+                 setup=get(huge_dom_url),
+                 prepare=lambda scraper: scraper.clear_page_cache()),
+        Scenario("get_all_links",
+                 run=lambda scraper: scraper.get_all_links(method=LinkExtractionMethods.js),
+                 setup=get(many_links_url)),
+        Scenario("get_all_links_soup",
+                 run=lambda scraper: scraper.get_all_links(method=LinkExtractionMethods.soup),
+                 setup=get(many_links_url),
+                 prepare=lambda scraper: scraper.clear_page_cache()),
+        Scenario("scroll_infinite_page",
+                 run=lambda scraper: scraper.scroll_infinite_page(limit=args.scrolls, timeout=args.latency + 5),
+                 prepare=get(feed_url)),
+    ]
+
+
+def run_scenario(scraper: CommonScraper, scenario: Scenario, repeat: int) -> dict[str, Any]:
+    """Run the scenario and summarize the durations and memory usage."""
+    driver_process = psutil.Process(scraper.driver.service.process.pid)
+    scenario.setup(scraper)
+
+    durations = []
+    with PeakRssMonitor(driver_process) as browser_monitor, PeakRssMonitor(psutil.Process()) as python_monitor:
+        for _ in range(repeat):
+            scenario.prepare(scraper)
+            start_time = timeit.default_timer()
+            scenario.run(scraper)
+            durations.append(timeit.default_timer() - start_time)
+
+    return {
+        "repeat": repeat,
+        "ops_per_sec": repeat / sum(durations),
+        "mean_ms": statistics.mean(durations) * 1000,
+        "p50_ms": percentile(durations, 50) * 1000,
+        "p99_ms": percentile(durations, 99) * 1000,
+        "browser_peak_rss_mb": browser_monitor.peak_rss / 2 ** 20,
+        "python_peak_rss_mb": python_monitor.peak_rss / 2 ** 20,
+    }
+
+
+def environment() -> dict[str, str]:
+    """Versions of the software the benchmark has been run with."""
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": str(psutil.cpu_count()),
+        "selenium_scraper": metadata.version("selenium_scraper"),
+        "selenium": metadata.version("selenium"),
+    }
+
+
+def compare(results: list[dict[str, Any]], baseline_path: Path, threshold: float) -> bool:
+    """Log the change of the median durations against the baseline results.
+
+    :param threshold: relative growth of the median duration considered a regression, e.g. 0.1 (10%)
+    :return: whether there are no regressions
+    """
+    baseline = {(result["browser"], result["scenario"]): result
+                for result in json.loads(baseline_path.read_text(encoding="utf-8"))["results"]}
+    passed = True
+    for result in results:
+        baseline_result = baseline.get((result["browser"], result["scenario"]))
+        if baseline_result is None:
+            continue
+        change = result["p50_ms"] / baseline_result["p50_ms"] - 1
+        regression = change > threshold
+        passed = passed and not regression
+        logger.info("%-8s %-22s p50 %9.1f ms -> %9.1f ms (%+6.1f%%)%s", result["browser"], result["scenario"],
+                    baseline_result["p50_ms"], result["p50_ms"], change * 100, "  REGRESSION" if regression else "")
+    return passed
+
+
+def main() -> int:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--browsers", choices=BROWSERS, nargs="+", default=list(BROWSERS))
+    parser.add_argument("--scenarios", nargs="+", help="names of the scenarios to run. Default: all")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--links", type=int, default=100000, help="number of links on the page")
+    parser.add_argument("--depth", type=int, default=5, help="depth of the huge DOM")
+    parser.add_argument("--breadth", type=int, default=8, help="children of every element of the huge DOM")
+    parser.add_argument("--latency", type=float, default=0.2, help="latency of the slow requests (seconds)")
+    parser.add_argument("--scrolls", type=int, default=10, help="number of scrolls of the infinite feed")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--compare", type=Path, help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative growth of the median duration considered a regression")
+    args = parser.parse_args()
+
+    results = []
+    with web_app() as base_url:
+        scenarios = [scenario for scenario in build_scenarios(base_url, args)
+                     if not args.scenarios or scenario.name in args.scenarios]
+        for browser in args.browsers:
+            start_time = timeit.default_timer()
+            scraper = BROWSERS[browser](headless=True)
+            logger.info("%s started in %.1f s, %.1f MB", browser, timeit.default_timer() - start_time,
+                        process_tree_rss(psutil.Process(scraper.driver.service.process.pid)) / 2 ** 20)
+            for scenario in scenarios:
+                result = {"browser": browser, "scenario": scenario.name,
+                          **run_scenario(scraper, scenario, args.repeat)}
+                logger.info("%-8s %-22s %7.2f ops/s, p50 %9.1f ms, p99 %9.1f ms, browser peak RSS %7.1f MB",
+                            browser, scenario.name, result["ops_per_sec"], result["p50_ms"], result["p99_ms"],
+                            result["browser_peak_rss_mb"])
+                results.append(result)
+            scraper.close()
+
+    parameters = {name: value for name, value in vars(args).items()
+                  if name in ("repeat", "links", "depth", "breadth", "latency", "scrolls")}
+    args.output.write_text(json.dumps({"environment": environment(), "parameters": parameters, "results": results},
+                                      indent=2), encoding="utf-8")
+    logger.info("Results are saved to %s", args.output)
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("selenium_scraper").setLevel(logging.WARNING)
+    sys.exit(main())
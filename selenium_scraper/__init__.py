@@ -1,8 +1,20 @@
+from .async_scraper import AsyncScraper, AsyncScraperPool
 from .browsers import ChromeScraper, FirefoxScraper
-from .scraper import CommonScraper
+from .crawler import Crawler, CrawlResult, Frontier
+from .extraction import ExtractionSchema, Field
+from .hybrid import HybridScraper
+from .pipeline import ParsePipeline, ParseResult
+from .pool import ScraperPool
+from .scheduler import HostScheduler
+from .scraper import CommonScraper, RecoveryPolicy, close_all_scrapers
+from .sharding import ShardedCrawler, ShardedFrontier
+from .snapshots import ReplayScraper, SnapshotStore
+from .startup import StartupCache
+from .tabs import TabMultiplexer
 
 
 class Scraper:
     """Scraper."""
     chrome = ChromeScraper
     firefox = FirefoxScraper
+    replay = ReplayScraper
@@ -0,0 +1,294 @@
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from types import TracebackType
+from typing import Any, TypeVar
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .extraction import ExtractionSchema, Schema
+from .helpers.urls import PageLinks
+from .logger import logger
+from .mapping import LinkExtractionMethods, ScrollMethods, WaitMethods
+from .pool import ScraperFactory, ScraperPool
+from .scraper import CapturedResponse, CommonScraper, SupportedSeleniumWebDriver
+
+T = TypeVar("T")
+
+
+class AsyncScraper:
+    """Asyncio front-end for CommonScraper.
+
+    Every call is executed on a dedicated worker thread of the session, so the event loop is never blocked
+    and calls to the same browser are never interleaved. Calls to different sessions run concurrently.
+
+    Example:
+        from selenium_scraper import AsyncScraper, Scraper
+
+        async with await AsyncScraper.start(partial(Scraper.chrome, headless=True)) as scraper:
+            await scraper.get('https://github.com/nparamonov/SeleniumScraper')
+            page = await scraper.current_page()
+
+    Cancellation and timeouts: a call that has not started yet is cancelled immediately.
+    A call that is already running in the browser cannot be interrupted, it is completed in the background
+    and its result is discarded; the next calls of this session wait for it.
+    """
+
+    def __init__(self, scraper: CommonScraper, timeout: float | None = 60.0):
+        """Wrap a started scraper.
+
+        :param scraper: scraper with a running browser
+        :param timeout: default max time (s) of a single call. If None, calls are not limited
+        """
+        self._scraper = scraper
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium_scraper")
+
+    @classmethod
+    async def start(cls, factory: ScraperFactory, timeout: float | None = 60.0) -> "AsyncScraper":
+        """Start a browser without blocking the event loop.
+
+        :param factory: callable without arguments returning a new scraper,
+            e.g. functools.partial(Scraper.chrome, headless=True)
+        :param timeout: default max time (s) of a single call. If None, calls are not limited
+        """
+        scraper = await asyncio.get_running_loop().run_in_executor(None, factory)
+        return cls(scraper, timeout)
+
+    @property
+    def scraper(self) -> CommonScraper:
+        """Access the synchronous scraper directly. Use it only inside `run`."""
+        return self._scraper
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any) -> T:
+        """Execute a blocking function on the worker thread of the session.
+
+        :param func: function to be called, e.g. a method of `scraper` or a function taking the scraper
+        :param timeout: max time (s) of the call. If None, the default timeout of the session is used
+        :return: the result of the function
+        """
+        if timeout is None:
+            timeout = self._timeout
+        future = asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Call %s has not been completed in %s seconds", getattr(func, "__name__", func), timeout)
+            raise
+
+    async def get(self,
+                  url: str,
+                  params: dict[str, str] | None = None,
+                  timeout: float = 5.0,
+                  ready: Callable[[SupportedSeleniumWebDriver], bool] | None = None) -> None:
+        """Load a web page, see `CommonScraper.get`.
+
+        :param url: string of target URL
+        :param params: dict containing query params for url
+        :param timeout: page load timeout (seconds)
+        :param ready: readiness condition of the page (see `selenium_scraper.conditions`)
+        """
+        await self.run(self._scraper.get, url, params, timeout, ready)
+
+    async def current_page(self) -> BeautifulSoup:
+        """Get the source of the current page, see `CommonScraper.current_page`."""
+        return await self.run(lambda: self._scraper.current_page)
+
+    async def get_page_fragment(self, selector: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Get the source of the elements matching the CSS selector, see `CommonScraper.get_page_fragment`."""
+        return await self.run(self._scraper.get_page_fragment, selector, parse_only)
+
+    async def extract(self, schema: ExtractionSchema | Schema) -> dict[str, Any]:
+        """Extract the fields described by the schema, see `CommonScraper.extract`."""
+        return await self.run(self._scraper.extract, schema)
+
+    async def scroll_down(self, method: str = ScrollMethods.end_key) -> None:
+        """Scroll current page down once, see `CommonScraper.scroll_down`."""
+        await self.run(self._scraper.scroll_down, method)
+
+    async def scroll_infinite_page(self,  # noqa: PLR0913
+                                   limit: int = 3,
+                                   timeout: float = 5,
+                                   method: str = ScrollMethods.end_key,
+                                   wait_method: str = WaitMethods.mutations,
+                                   quiet_period: float = 0.3) -> None:
+        """Scroll current page down for `limit` times, see `CommonScraper.scroll_infinite_page`."""
+        await self.run(self._scraper.scroll_infinite_page, limit, timeout, method, wait_method, quiet_period)
+
+    async def iter_infinite_page(self,  # noqa: PLR0913
+                                 selector: str,
+                                 limit: int | None = None,
+                                 timeout: float = 5,
+                                 method: str = ScrollMethods.end_key,
+                                 wait_method: str = WaitMethods.mutations,
+                                 quiet_period: float = 0.3,
+                                 *,
+                                 prune: bool = False) -> AsyncIterator[BeautifulSoup]:
+        """Scroll current page down and yield the new elements, see `CommonScraper.iter_infinite_page`."""
+        elements = self._scraper.iter_infinite_page(selector, limit, timeout, method, wait_method, quiet_period,
+                                                    prune=prune)
+        while (element := await self.run(next, elements, None)) is not None:
+            yield element
+
+    async def get_all_links(self,
+                            schemes: tuple[str, ...] | None = PageLinks.default_schemes,
+                            method: str = LinkExtractionMethods.js) -> PageLinks:
+        """Get all links on the current page, see `CommonScraper.get_all_links`."""
+        return await self.run(self._scraper.get_all_links, schemes, method)
+
+    async def start_capture(self, url_patterns: Iterable[str], max_body_size: int = 10 * 2 ** 20) -> None:
+        """Record the responses to the matching requests, see `CommonScraper.start_capture`."""
+        await self.run(self._scraper.start_capture, list(url_patterns), max_body_size)
+
+    async def captured_responses(self) -> list[CapturedResponse]:
+        """Take the recorded responses, see `CommonScraper.captured_responses`."""
+        return await self.run(self._scraper.captured_responses)
+
+    async def stop_capture(self) -> None:
+        """Stop recording the responses, see `CommonScraper.stop_capture`."""
+        await self.run(self._scraper.stop_capture)
+
+    async def reset(self) -> None:
+        """Reset the browser session state, see `CommonScraper.reset`."""
+        await self.run(self._scraper.reset)
+
+    async def is_healthy(self, timeout: float = 5.0) -> bool:
+        """Check whether the browser session works, see `CommonScraper.is_healthy`."""
+        return await self.run(self._scraper.is_healthy, timeout)
+
+    async def recover(self) -> None:
+        """Replace a dead or hung browser with a new one, see `CommonScraper.recover`."""
+        await self.run(self._scraper.recover)
+
+    async def detach(self) -> CommonScraper:
+        """Stop the worker thread without quitting the browser.
+
+        The calls already submitted are completed first, new calls are rejected.
+
+        :return: the synchronous scraper
+        """
+        await asyncio.get_running_loop().run_in_executor(None, partial(self._executor.shutdown, wait=True))
+        return self._scraper
+
+    async def close(self) -> None:
+        """Stop the worker thread and quit the browser."""
+        scraper = await self.detach()
+        await asyncio.get_running_loop().run_in_executor(None, scraper.close)
+
+    async def __aenter__(self) -> "AsyncScraper":
+        """Use the scraper as an asynchronous context manager."""
+        return self
+
+    async def __aexit__(self,
+                        exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None) -> None:
+        """Quit the browser."""
+        await self.close()
+
+
+class AsyncScraperPool:
+    """Asyncio front-end for ScraperPool.
+
+    Example:
+        from selenium_scraper import AsyncScraperPool, Scraper
+
+        async with AsyncScraperPool(partial(Scraper.chrome, headless=True), size=8) as pool:
+            async with pool.lease() as scraper:
+                await scraper.get('https://github.com/nparamonov/SeleniumScraper')
+    """
+
+    def __init__(self, factory: ScraperFactory, size: int = 2, *, timeout: float | None = 60.0, **pool_kwargs: Any):
+        """Initialize the pool. Browsers are started in `start` or when entering `async with`.
+
+        :param factory: callable without arguments returning a new scraper,
+            e.g. functools.partial(Scraper.chrome, headless=True)
+        :param size: number of sessions kept in the pool
+        :param timeout: default max time (s) of a single call of leased scrapers. If None, calls are not limited
+        :param pool_kwargs: other keyword arguments of `ScraperPool` (max_uses, max_age, reset)
+        """
+        self._factory = factory
+        self._size = size
+        self._timeout = timeout
+        self._pool_kwargs = pool_kwargs
+        self._pool: ScraperPool | None = None
+        self._semaphore = asyncio.Semaphore(size)
+        # Threads waiting for `ScraperPool.acquire`, at most one per session thanks to the semaphore
+        self._acquire_executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="ScraperPoolAcquire")
+
+    async def start(self) -> None:
+        """Start the browsers without blocking the event loop."""
+        self._pool = await asyncio.get_running_loop().run_in_executor(
+            None, partial(ScraperPool, self._factory, self._size, **self._pool_kwargs),
+        )
+
+    async def close(self) -> None:
+        """Quit all idle sessions."""
+        if self._pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._pool.close)
+        # After the pool, so that the threads blocked in `ScraperPool.acquire` are woken up
+        self._acquire_executor.shutdown(wait=False)
+
+    @asynccontextmanager
+    async def lease(self, timeout: float | None = None) -> AsyncIterator[AsyncScraper]:
+        """Take a session from the pool for the duration of the `async with` block.
+
+        :param timeout: max waiting time (s) for a free session. If None, wait forever
+        """
+        if self._pool is None:
+            msg = "Scraper pool is not started"
+            raise RuntimeError(msg)
+        pool = self._pool
+
+        loop = asyncio.get_running_loop()
+        # One deadline for the semaphore and the pool
+        deadline = None if timeout is None else loop.time() + timeout
+        await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        remaining_time = None if deadline is None else max(deadline - loop.time(), 0)
+        acquire_future = self._acquire_executor.submit(pool.acquire, remaining_time)
+        try:
+            scraper = await asyncio.wrap_future(acquire_future)
+        except BaseException as error:
+            self._semaphore.release()
+            # The waiting thread cannot be interrupted: the session it gets after the cancellation is returned
+            acquire_future.add_done_callback(partial(_release_acquired, pool))
+            if isinstance(error, TimeoutError):
+                # `ScraperPool.acquire` raises the builtin TimeoutError, a different class before Python 3.11
+                raise asyncio.TimeoutError(*error.args) from error
+            raise
+
+        async_scraper = AsyncScraper(scraper, self._timeout)
+        try:
+            yield async_scraper
+        finally:
+            # The session is returned even if the leasing task is cancelled
+            await asyncio.shield(self._release(pool, async_scraper))
+
+    async def _release(self, pool: ScraperPool, async_scraper: AsyncScraper) -> None:
+        try:
+            scraper = await async_scraper.detach()
+            await asyncio.get_running_loop().run_in_executor(None, pool.release, scraper)
+        finally:
+            self._semaphore.release()
+
+    async def __aenter__(self) -> "AsyncScraperPool":
+        """Start the browsers."""
+        await self.start()
+        return self
+
+    async def __aexit__(self,
+                        exc_type: type[BaseException] | None,
+                        exc_val: BaseException | None,
+                        exc_tb: TracebackType | None) -> None:
+        """Quit all sessions."""
+        await self.close()
+
+
+def _release_acquired(pool: ScraperPool, future: "Future[CommonScraper]") -> None:
+    """Return the session acquired for a cancelled lease to the pool."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    logger.info("Return the scraper acquired for a cancelled lease")
+    pool.release(future.result())
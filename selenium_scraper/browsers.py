@@ -1,10 +1,45 @@
+import json
+from typing import Any
+from urllib import parse
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
 
+from .logger import logger
 from .scraper import CommonScraper
+from .startup import (
+    CHROME_STARTUP_ARGUMENTS,
+    FIREFOX_STARTUP_PREFERENCES,
+    StartupCache,
+    init_chrome_profile,
+    init_firefox_profile,
+)
+
+# URL patterns of the resource types for Chrome DevTools Protocol Network.setBlockedURLs ('*' is a wildcard)
+RESOURCE_URL_PATTERNS = {
+    "images": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "fonts": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "m4v", "mov", "m3u8", "mpd"),
+    "stylesheets": ("css",),
+}
+
+# Fields of the cookies returned by Network.getAllCookies accepted by Network.setCookies
+CDP_COOKIE_PARAMS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority",
+                     "sourceScheme", "sourcePort")
+
+
+def _resource_url_patterns(resource_type: str) -> list[str]:
+    return [pattern for extension in RESOURCE_URL_PATTERNS[resource_type]
+            for pattern in (f"*.{extension}", f"*.{extension}?*")]
+
+
+def _proxy_auto_config(blocked_urls: list[str]) -> str:
+    """Proxy auto-config script sending requests to the blocked URLs to a closed port, so they fail immediately."""
+    conditions = " || ".join(f"shExpMatch(url, {json.dumps(pattern)})" for pattern in blocked_urls)
+    return f'function FindProxyForURL(url, host) {{ return ({conditions}) ? "PROXY 127.0.0.1:9" : "DIRECT"; }}'
 
 
 class ChromeScraper(CommonScraper):
@@ -21,7 +56,15 @@ class ChromeScraper(CommonScraper):
                  disable_dev_shm_usage: bool = False,
                  no_sandbox: bool = True,
                  no_default_browser_check: bool = True,
-                 no_first_run: bool = True):
+                 no_first_run: bool = True,
+                 page_load_strategy: str | None = None,
+                 lean_page: bool = False,
+                 block_images: bool = False,
+                 block_fonts: bool = False,
+                 block_media: bool = False,
+                 block_stylesheets: bool = False,
+                 blocked_urls: list[str] | None = None,
+                 startup_cache: StartupCache | None = None):
         """Initialize Chrome driver for scraper.
 
         :param options: instance of ChromeOptions
@@ -48,9 +91,45 @@ class ChromeScraper(CommonScraper):
             Disables the default browser check to avoid having the default browser info-bar displayed
         :param no_first_run: ('--no-first-run')
             Skip First Run tasks, whether or not it`s actually the First Run
+        :param page_load_strategy: ('pageLoadStrategy' capability) when `get` considers the page loaded,
+            see `mapping.PageLoadStrategies`: 'normal' - the 'load' event, 'eager' - the document has been parsed,
+            'none' - right after the navigation has started. Use it with the `ready` condition of `get`
+
+        Resource blocking. The browser does not download the resources you never parse,
+        so pages load faster and take less memory:
+
+        :param lean_page: block images, fonts and media (the same as all three options below)
+        :param block_images: do not load images
+        :param block_fonts: do not load web fonts
+        :param block_media: do not load audio and video
+        :param block_stylesheets: do not load CSS. Note that layout-dependent features,
+            such as loading content on scroll, may stop working
+        :param blocked_urls: URL patterns to be blocked, '*' is a wildcard (e.g. ['*google-analytics.com*']).
+            Chrome DevTools Protocol Network.setBlockedURLs is used
+
+        :param startup_cache: cache of the driver and browser paths and of the profile template,
+            so that the browser starts faster. Startup work like component updates and background networking
+            is disabled (see `startup.CHROME_STARTUP_ARGUMENTS`). Ignored for the profile if '--user-data-dir'
+            is in `options`
         """
         if not options:
             options = self._browser_options()
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
+
+        blocked_resources = {
+            "images": block_images or lean_page,
+            "fonts": block_fonts or lean_page,
+            "media": block_media or lean_page,
+            "stylesheets": block_stylesheets,
+        }
+        self._blocked_urls = [pattern for resource_type, blocked in blocked_resources.items() if blocked
+                              for pattern in _resource_url_patterns(resource_type)]
+        self._blocked_urls.extend(blocked_urls or [])
+        if blocked_resources["images"]:
+            prefs = options.experimental_options.get("prefs", {})
+            prefs.setdefault("profile.managed_default_content_settings.images", 2)
+            options.add_experimental_option("prefs", prefs)
 
         arguments = {
             "--headless": headless,
@@ -63,20 +142,100 @@ class ChromeScraper(CommonScraper):
             if enabled and argument not in options.arguments:
                 options.add_argument(argument)
 
+        if startup_cache is not None:
+            service = self._use_startup_cache(startup_cache, options, service)
+
         super().__init__(options, service, keep_alive)
 
+    def _use_startup_cache(self,
+                           startup_cache: StartupCache,
+                           options: ChromeOptions,
+                           service: ChromeService | None) -> ChromeService:
+        """Set the cached paths, disable the startup work and copy the profile template."""
+        service = service or ChromeService()
+        startup_cache.resolve_paths(service, options)
+        for argument in CHROME_STARTUP_ARGUMENTS:
+            if argument not in options.arguments:
+                options.add_argument(argument)
+        if options.binary_location and not any(argument.startswith("--user-data-dir")
+                                               for argument in options.arguments):
+            self._profile_dir = startup_cache.new_profile("chrome", options.binary_location, init_chrome_profile)
+            options.add_argument(f"--user-data-dir={self._profile_dir}")
+        return service
+
+    def _setup_driver(self) -> None:
+        """Block the URLs of the unwanted resources."""
+        if self._blocked_urls:
+            self._driver.execute_cdp_cmd("Network.enable", {})
+            self._driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self._blocked_urls})
+            logger.info("Block %d URL patterns", len(self._blocked_urls))
+
+    @property
+    def full_reset(self) -> bool:
+        """Chrome deletes the cookies of all domains in `reset`."""
+        return True
+
+    def reset(self) -> None:
+        """Reset the browser session state so that it can be reused for another job.
+
+        In addition to `CommonScraper.reset`, cookies of all domains are deleted via Chrome DevTools Protocol.
+        """
+        super().reset()
+        self._driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+
+    def _add_init_script(self, source: str) -> str:
+        """Run the script in every new document before the page scripts via Chrome DevTools Protocol."""
+        return self._driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+
+    def _remove_init_script(self, script_id: str) -> None:
+        """Stop running the script added with `_add_init_script` in new documents."""
+        self._driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+
+    def export_cookies(self) -> list[dict[str, Any]]:
+        """Get the cookies of all domains via Chrome DevTools Protocol.
+
+        :return: cookies in Chrome DevTools Protocol format
+        """
+        return self._driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+
+    def import_cookies(self, url: str, cookies: list[dict[str, Any]]) -> None:  # noqa: ARG002
+        """Add the cookies of any domains via Chrome DevTools Protocol, without loading the page.
+
+        :param url: not used, the cookies domains are taken from the cookies
+        :param cookies: cookies in WebDriver format or received from `export_cookies`
+        """
+        cookie_params = [
+            {name: value for name, value in cookie.items() if name in CDP_COOKIE_PARAMS and
+             not (name == "expires" and cookie.get("session"))}
+            for cookie in cookies
+        ]
+        for cookie, params in zip(cookies, cookie_params, strict=True):
+            # Cookies in WebDriver format, e.g. set by the HTTP responses of HybridScraper
+            if "expiry" in cookie and "expires" not in params:
+                params["expires"] = cookie["expiry"]
+        if cookie_params:
+            self._driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookie_params})
+
 
 class FirefoxScraper(CommonScraper):
     """Firefox scraper."""
     _browser = webdriver.Firefox
     _browser_options = webdriver.FirefoxOptions
 
-    def __init__(self,
+    def __init__(self,  # noqa: PLR0913
                  options: FirefoxOptions | None = None,
                  service: FirefoxService | None = None,
                  keep_alive: bool = True,  # noqa: FBT001, FBT002
                  *,
-                 headless: bool = False):
+                 headless: bool = False,
+                 page_load_strategy: str | None = None,
+                 lean_page: bool = False,
+                 block_images: bool = False,
+                 block_fonts: bool = False,
+                 block_media: bool = False,
+                 block_stylesheets: bool = False,
+                 blocked_urls: list[str] | None = None,
+                 startup_cache: StartupCache | None = None):
         """Initialize Firefox driver for scraper.
 
         :param options: instance of FirefoxOptions
@@ -89,9 +248,31 @@ class FirefoxScraper(CommonScraper):
 
         :param headless: ('-headless')
             Do not open the browser so that it runs in the background
+        :param page_load_strategy: ('pageLoadStrategy' capability) when `get` considers the page loaded,
+            see `mapping.PageLoadStrategies`: 'normal' - the 'load' event, 'eager' - the document has been parsed,
+            'none' - right after the navigation has started. Use it with the `ready` condition of `get`
+
+        Resource blocking. The browser does not download the resources you never parse,
+        so pages load faster and take less memory:
+
+        :param lean_page: block images, fonts and media (the same as all three options below)
+        :param block_images: ('permissions.default.image') do not load images
+        :param block_fonts: ('gfx.downloadable_fonts.enabled') do not load web fonts
+        :param block_media: ('media.autoplay.default', 'media.preload.*') do not play and preload audio and video
+        :param block_stylesheets: ('permissions.default.stylesheet') do not load CSS.
+            Note that layout-dependent features, such as loading content on scroll, may stop working
+        :param blocked_urls: URL patterns to be blocked, '*' is a wildcard (e.g. ['*google-analytics.com*']).
+            A proxy auto-config script is used, so for HTTPS only the scheme and the host are matched
+            (e.g. 'https://www.google-analytics.com/')
+
+        :param startup_cache: cache of the driver and browser paths and of the profile template,
+            so that the browser starts faster. Startup work like updates and telemetry is disabled
+            (see `startup.FIREFOX_STARTUP_PREFERENCES`). Ignored for the profile if '-profile' is in `options`
         """
         if not options:
             options = self._browser_options()
+        if page_load_strategy:
+            options.page_load_strategy = page_load_strategy
 
         arguments = {
             "-headless": headless,
@@ -100,4 +281,55 @@ class FirefoxScraper(CommonScraper):
             if enabled and argument not in options.arguments:
                 options.add_argument(argument)
 
+        proxy_auto_config_url = ("data:text/javascript," + parse.quote(_proxy_auto_config(blocked_urls))
+                                 if blocked_urls else "")
+        preferences: dict[tuple[str, str | int | bool], bool] = {
+            ("permissions.default.image", 2): block_images or lean_page,
+            ("gfx.downloadable_fonts.enabled", False): block_fonts or lean_page,
+            ("media.autoplay.default", 5): block_media or lean_page,
+            ("media.preload.default", 0): block_media or lean_page,
+            ("media.preload.auto", 0): block_media or lean_page,
+            ("permissions.default.stylesheet", 2): block_stylesheets,
+            ("network.proxy.type", 2): bool(blocked_urls),
+            ("network.proxy.autoconfig_url", proxy_auto_config_url): bool(blocked_urls),
+            ("network.proxy.allow_hijacking_localhost", True): bool(blocked_urls),
+        }
+        for (name, value), enabled in preferences.items():
+            if enabled and name not in options.preferences:
+                options.set_preference(name, value)
+
+        if startup_cache is not None:
+            service = self._use_startup_cache(startup_cache, options, service)
+
         super().__init__(options, service, keep_alive)
+
+    @property
+    def full_reset(self) -> bool:
+        """Firefox deletes the cookies of all domains in `reset` with WebDriver BiDi enabled (selenium 4.33+)."""
+        return bool(self._driver.caps.get("webSocketUrl")) and hasattr(self._driver, "storage")
+
+    def reset(self) -> None:
+        """Reset the browser session state so that it can be reused for another job.
+
+        In addition to `CommonScraper.reset`, cookies of all domains are deleted via WebDriver BiDi
+        if the session has been started with it (`options.enable_bidi = True`).
+        """
+        super().reset()
+        if self.full_reset:
+            self._driver.storage.delete_cookies()
+
+    def _use_startup_cache(self,
+                           startup_cache: StartupCache,
+                           options: FirefoxOptions,
+                           service: FirefoxService | None) -> FirefoxService:
+        """Set the cached paths, disable the startup work and copy the profile template."""
+        service = service or FirefoxService()
+        startup_cache.resolve_paths(service, options)
+        for name, value in FIREFOX_STARTUP_PREFERENCES.items():
+            if name not in options.preferences:
+                options.set_preference(name, value)
+        if options.binary_location and "-profile" not in options.arguments:
+            self._profile_dir = startup_cache.new_profile("firefox", options.binary_location, init_firefox_profile)
+            options.add_argument("-profile")
+            options.add_argument(str(self._profile_dir))
+        return service
@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from .scripts import JS_NETWORK_IDLE
+
+
+class ReadyCondition(ABC):
+    """Condition of the page readiness for `CommonScraper.get`.
+
+    The condition is polled until it returns True, so it must be cheap: a single WebDriver command.
+    """
+
+    @abstractmethod
+    def __call__(self, driver: WebDriver) -> bool:
+        """Check whether the page is ready."""
+
+    def __repr__(self) -> str:
+        """Condition with its parameters, e.g. SelectorPresent('div.results')."""
+        params = ", ".join(repr(value) for value in vars(self).values())
+        return f"{self.__class__.__name__}({params})"
+
+
+class SelectorPresent(ReadyCondition):
+    """The page contains an element matching the CSS selector."""
+
+    def __init__(self, selector: str):
+        """Initialize SelectorPresent.
+
+        :param selector: CSS selector, e.g. 'div.results'
+        """
+        self.selector = selector
+
+    def __call__(self, driver: WebDriver) -> bool:
+        """Check whether the page contains an element matching the CSS selector."""
+        return bool(driver.execute_script("return document.querySelector(arguments[0]) !== null", self.selector))
+
+
+class JsPredicate(ReadyCondition):
+    """JavaScript code returns a truthy value."""
+
+    def __init__(self, script: str):
+        """Initialize JsPredicate.
+
+        :param script: JavaScript code with a return statement, e.g. 'return window.app && window.app.loaded'
+        """
+        self.script = script
+
+    def __call__(self, driver: WebDriver) -> bool:
+        """Check whether the script returns a truthy value. Script errors (e.g. during navigation) mean False."""
+        try:
+            return bool(driver.execute_script(self.script))
+        except WebDriverException:
+            return False
+
+
+class NetworkIdle(ReadyCondition):
+    """The document has been parsed and no resource has finished loading for `quiet_period` seconds."""
+
+    def __init__(self, quiet_period: float = 0.5):
+        """Initialize NetworkIdle.
+
+        :param quiet_period: time (s) without network activity
+        """
+        self.quiet_period = quiet_period
+
+    def __call__(self, driver: WebDriver) -> bool:
+        """Check whether the network has been idle for `quiet_period` seconds."""
+        return bool(driver.execute_script(JS_NETWORK_IDLE, self.quiet_period * 1000))
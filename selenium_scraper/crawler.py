@@ -0,0 +1,259 @@
+import heapq
+import itertools
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from selenium.common.exceptions import WebDriverException
+
+from .helpers.url_sets import ExactUrlSet, UrlSet
+from .helpers.urls import PageLinks, canonicalize_url
+from .logger import logger
+from .pool import ScraperPool
+from .scheduler import HostScheduler
+from .scraper import CommonScraper
+
+PageHandler = Callable[[CommonScraper, str], Any]
+Priority = Callable[[str, int], float]
+
+
+@dataclass(frozen=True)
+class CrawlResult:
+    """Result of a crawled page."""
+
+    url: str
+    depth: int
+    data: Any = None
+    error: Exception | None = None
+
+
+class Frontier:
+    """Thread-safe queue of URLs to be crawled.
+
+    Every URL is canonicalized (see `helpers.urls.canonicalize_url`) and queued only once.
+    By default URLs are ordered breadth-first, with `priority` you can crawl the most promising URLs first:
+    the URL with the lowest priority value is taken first.
+    """
+
+    def __init__(self,
+                 max_depth: int | None = None,
+                 max_pages: int | None = None,
+                 priority: Priority | None = None,
+                 seen: UrlSet | None = None):
+        """Initialize Frontier.
+
+        :param max_depth: URLs deeper than `max_depth` links from the start URLs are not queued. If None, unlimited
+        :param max_pages: max number of URLs given out by `pop`. If None, unlimited
+        :param priority: function (url, depth) -> priority value. If None, breadth-first order is used
+        :param seen: set of the queued URLs. If None, `ExactUrlSet` is used. For crawls of millions of pages use
+            `HashedUrlSet` (8 bytes per URL, optionally spilled to disk) or `BloomUrlSet` (probabilistic)
+        """
+        self._max_depth = max_depth
+        self._max_pages = max_pages
+        self._priority = priority or (lambda _url, depth: depth)
+
+        self._condition = threading.Condition()
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._seen = seen if seen is not None else ExactUrlSet()
+        self._in_progress = 0
+        self._popped = 0
+
+    @property
+    def popped(self) -> int:
+        """Number of URLs given out by `pop`."""
+        return self._popped
+
+    def push(self, url: str, depth: int = 0) -> bool:
+        """Add URL to the queue if it has not been seen before.
+
+        :param url: string of absolute URL
+        :param depth: number of links from the start URL
+        :return: whether the URL was queued
+        """
+        if self._max_depth is not None and depth > self._max_depth:
+            return False
+
+        url = canonicalize_url(url)
+        with self._condition:
+            if not self._seen.add(url):
+                return False
+            heapq.heappush(self._heap, (self._priority(url, depth), next(self._counter), url, depth))
+            self._condition.notify()
+        return True
+
+    def pop(self) -> tuple[str, int] | None:
+        """Take the next URL. Wait while the queue is empty and other URLs are being crawled.
+
+        Every URL taken must be marked with `task_done` after its links have been pushed.
+
+        :return: (url, depth) or None if the crawl is finished
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._heap or not self._in_progress or self._is_exhausted())
+            if not self._heap or self._is_exhausted():
+                return None
+            _, _, url, depth = heapq.heappop(self._heap)
+            self._in_progress += 1
+            self._popped += 1
+            return url, depth
+
+    def task_done(self) -> None:
+        """Mark the URL taken with `pop` as crawled."""
+        with self._condition:
+            self._in_progress -= 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Stop giving out URLs."""
+        with self._condition:
+            self._max_pages = self._popped
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        """Number of queued URLs."""
+        return len(self._heap)
+
+    def _is_exhausted(self) -> bool:
+        return self._max_pages is not None and self._popped >= self._max_pages
+
+
+class Crawler:
+    """Crawler fetching pages with several browser sessions in parallel.
+
+    Every session of the pool takes URLs from the shared `Frontier`, loads the page, passes it to `handler`
+    and pushes the internal links of the page (see `CommonScraper.get_all_links`) back to the frontier.
+
+    Example:
+        from functools import partial
+        from selenium_scraper import Crawler, Scraper, ScraperPool
+
+        def handler(scraper, url):
+            return scraper.current_page.title.text
+
+        with ScraperPool(partial(Scraper.chrome, headless=True), size=4) as pool:
+            for result in Crawler(pool, handler, max_depth=2, max_pages=100).crawl(['https://example.com']):
+                print(result.url, result.data)
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 pool: ScraperPool,
+                 handler: PageHandler | None = None,
+                 *,
+                 max_depth: int | None = None,
+                 max_pages: int | None = None,
+                 priority: Priority | None = None,
+                 follow_external: bool = False,
+                 timeout: float = 5.0,
+                 url_set_factory: Callable[[], UrlSet] = ExactUrlSet,
+                 scheduler: HostScheduler | None = None):
+        """Initialize Crawler.
+
+        :param pool: pool of browser sessions; all sessions of the pool are used for crawling
+        :param handler: function (scraper, url) -> data, called for each loaded page.
+            Its result is returned in `CrawlResult.data`
+        :param max_depth: max number of links from the start URLs. If None, unlimited
+        :param max_pages: max number of pages to be loaded. If None, unlimited
+        :param priority: function (url, depth) -> priority value, lower values are crawled first.
+            If None, pages are crawled breadth-first
+        :param follow_external: whether to follow links to other sites
+        :param timeout: page load timeout (seconds)
+        :param url_set_factory: function creating the set of the seen URLs for every crawl,
+            e.g. `partial(HashedUrlSet, spill_directory='seen')` for large crawls, see `Frontier`.
+            The set is closed when the crawl ends
+        :param scheduler: per-host limits of the page loads. If None, pages are loaded as soon as a session is free
+        """
+        self._pool = pool
+        self._handler = handler
+        self._max_depth = max_depth
+        self._max_pages = max_pages
+        self._priority = priority
+        self._follow_external = follow_external
+        self._timeout = timeout
+        self._url_set_factory = url_set_factory
+        self._scheduler = scheduler
+
+    def crawl(self, start_urls: Iterable[str]) -> Iterator[CrawlResult]:
+        """Crawl the sites starting from `start_urls`.
+
+        :param start_urls: URLs of the pages to start from
+        :return: iterator of results in the order the pages are crawled
+        """
+        seen = self._url_set_factory()
+        frontier = Frontier(self._max_depth, self._max_pages, self._priority, seen)
+        for url in start_urls:
+            frontier.push(url)
+
+        results: queue.Queue[CrawlResult | None] = queue.Queue()
+        workers = [threading.Thread(target=self._work, args=(frontier, results), daemon=True)
+                   for _ in range(self._pool.size)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            finished_workers = 0
+            while finished_workers < len(workers):
+                result = results.get()
+                if result is None:
+                    finished_workers += 1
+                else:
+                    yield result
+        finally:
+            frontier.close()
+            for worker in workers:
+                worker.join()
+            seen.close()
+
+    def _work(self, frontier: Frontier, results: "queue.Queue[CrawlResult | None]") -> None:
+        try:
+            with self._pool.lease() as scraper:
+                while (task := frontier.pop()) is not None:
+                    url, depth = task
+                    try:
+                        results.put(self._crawl_page(scraper, frontier, url, depth))
+                    finally:
+                        frontier.task_done()
+        finally:
+            results.put(None)
+
+    def _crawl_page(self, scraper: CommonScraper, frontier: Frontier, url: str, depth: int) -> CrawlResult:
+        result, links = crawl_page(scraper, url, depth, self._handler, self._timeout, self._scheduler)
+        if links is not None:
+            for link in next_links(links, follow_external=self._follow_external):
+                frontier.push(link, depth + 1)
+        return result
+
+
+def crawl_page(scraper: CommonScraper,  # noqa: PLR0913
+               url: str,
+               depth: int,
+               handler: PageHandler | None = None,
+               timeout: float = 5.0,
+               scheduler: HostScheduler | None = None) -> tuple[CrawlResult, PageLinks | None]:
+    """Load the page, pass it to the handler and collect its links.
+
+    :return: result of the page and its links, None if the page has failed
+    """
+    try:
+        if scheduler is not None:
+            scheduler.get(scraper, url, timeout)
+        else:
+            scraper.get(url, timeout=timeout)
+        data = handler(scraper, url) if handler else None
+        links = scraper.get_all_links()
+    except WebDriverException as error:
+        logger.warning("Failed to crawl %s: %s", url, error.msg)
+        return CrawlResult(url, depth, error=error), None
+    except Exception as error:  # noqa: BLE001 - errors of the user handler must not stop the crawl
+        logger.warning("Failed to handle %s: %r", url, error)
+        return CrawlResult(url, depth, error=error), None
+    return CrawlResult(url, depth, data), links
+
+
+def next_links(links: PageLinks, *, follow_external: bool = False) -> Iterator[str]:
+    """Links of the page to be crawled next."""
+    yield from links.internal
+    if follow_external:
+        yield from links.external
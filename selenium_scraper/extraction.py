@@ -0,0 +1,130 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+from urllib import parse
+
+from bs4 import BeautifulSoup, Tag
+
+# Attributes resolved to absolute URLs
+URL_ATTRIBUTES = ("href", "src")
+
+
+@dataclass(frozen=True)
+class Field:
+    """Field of an extraction schema.
+
+    :param selector: CSS selector (or XPath expression with `xpath`) of the elements, relative to the parent field
+    :param attribute: value of the field: 'text' (text content), 'html' (inner HTML) or the name of an attribute.
+        'href' and 'src' are resolved to absolute URLs
+    :param many: whether the value is the list of all matching elements rather than the first one
+    :param fields: schema of the nested fields; if set, the value is a dict (or a list of dicts)
+        extracted from the matching element and `attribute` is ignored
+    :param xpath: whether `selector` is an XPath expression
+    """
+
+    selector: str
+    attribute: str = "text"
+    many: bool = False
+    fields: "Schema | None" = None
+    xpath: bool = False
+
+
+# Field name -> Field or CSS selector of a single text field
+Schema = Mapping[str, Field | str]
+
+
+class ExtractionSchema:
+    """Schema compiled for `CommonScraper.extract`: fields are extracted by one script call in the browser.
+
+    Example:
+        schema = ExtractionSchema({
+            'title': 'h1',
+            'price': Field('.price', attribute='data-value'),
+            'reviews': Field('.review', many=True, fields={'author': '.author', 'text': '.text'}),
+        })
+        for url in urls:
+            scraper.get(url)
+            data = scraper.extract(schema)  # {'title': ..., 'price': ..., 'reviews': [{'author': ..., ...}]}
+
+    Missing single fields are None, missing list fields are empty lists.
+    """
+
+    def __init__(self, fields: Schema):
+        """Compile the schema.
+
+        :param fields: field name -> `Field` or CSS selector of a single text field
+        """
+        self._fields = fields
+        self._payload = _compile(fields)
+
+    @property
+    def fields(self) -> Schema:
+        """Fields of the schema."""
+        return self._fields
+
+    @property
+    def payload(self) -> list[dict[str, Any]]:
+        """JSON-serializable schema passed to the extraction script."""
+        return self._payload
+
+    def extract_soup(self, page: BeautifulSoup | Tag, page_url: str) -> dict[str, Any]:
+        """Extract the fields from a parsed page, e.g. `current_page` of `ReplayScraper`.
+
+        XPath fields are not supported: BeautifulSoup only supports CSS selectors.
+
+        :param page: parsed page
+        :param page_url: URL of the page to resolve relative URLs
+        :return: field name -> value
+        """
+        return _extract_soup(self._fields, page, page_url)
+
+
+def _compile(fields: Schema) -> list[dict[str, Any]]:
+    payload = []
+    for name, field in fields.items():
+        if isinstance(field, str):
+            field = Field(field)  # noqa: PLW2901
+        if not field.selector:
+            msg = f"Field {name!r} has an empty selector"
+            raise ValueError(msg)
+        payload.append({
+            "name": name,
+            "selector": field.selector,
+            "attribute": field.attribute,
+            "many": field.many,
+            "xpath": field.xpath,
+            "fields": _compile(field.fields) if field.fields is not None else None,
+        })
+    return payload
+
+
+def _extract_soup(fields: Mapping[str, Field | str], root: BeautifulSoup | Tag, page_url: str) -> dict[str, Any]:
+    result: dict[str, Any] = {}
+    for name, field in fields.items():
+        if isinstance(field, str):
+            field = Field(field)  # noqa: PLW2901
+        if field.xpath:
+            msg = f"XPath field {name!r} cannot be extracted from a parsed page"
+            raise ValueError(msg)
+        if field.many:
+            result[name] = [_soup_value(element, field, page_url) for element in root.select(field.selector)]
+        else:
+            element = root.select_one(field.selector)
+            result[name] = _soup_value(element, field, page_url) if element is not None else None
+    return result
+
+
+def _soup_value(element: Tag, field: Field, page_url: str) -> Any:
+    if field.fields is not None:
+        return _extract_soup(field.fields, element, page_url)
+    if field.attribute == "text":
+        return element.get_text().strip()
+    if field.attribute == "html":
+        return element.decode_contents()
+    value = element.get(field.attribute)
+    if isinstance(value, list):
+        # Multi-valued attributes, e.g. class
+        value = " ".join(value)
+    if value is not None and field.attribute in URL_ATTRIBUTES:
+        value = parse.urljoin(page_url, value.strip())
+    return value
@@ -0,0 +1,256 @@
+import bisect
+import hashlib
+import heapq
+import itertools
+import math
+import mmap
+import tempfile
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+# Size of the array item with a 64-bit URL hash
+_HASH_SIZE = array("Q").itemsize
+# Number of hashes written at once when the spilled files are merged
+_SPILL_CHUNK_SIZE = 2 ** 16
+
+
+def url_hash(url: str) -> int:
+    """64-bit hash of the URL, stable between processes (unlike `hash`).
+
+    >>> url_hash('https://example.com/') == url_hash('https://example.com/')
+    True
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "little")
+
+
+class UrlSet(ABC):
+    """Set of seen URLs, e.g. the visited set of `Frontier`.
+
+    URLs are compared as strings, canonicalize them first (see `urls.canonicalize_url`).
+    """
+
+    @abstractmethod
+    def add(self, url: str) -> bool:
+        """Add the URL.
+
+        :return: whether the URL has not been in the set
+        """
+
+    @abstractmethod
+    def __contains__(self, url: object) -> bool:
+        """Whether the URL is in the set."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of added URLs."""
+
+    def close(self) -> None:  # noqa: B027 - most sets have nothing to release
+        """Release the resources of the set, e.g. the spilled files. The set must not be used afterwards."""
+
+
+class ExactUrlSet(UrlSet):
+    """URL set keeping the full strings: exact, but takes about 100 bytes per URL."""
+
+    def __init__(self) -> None:
+        """Initialize an empty set."""
+        self._urls: set[str] = set()
+
+    def add(self, url: str) -> bool:
+        """Add the URL, see `UrlSet.add`."""
+        if url in self._urls:
+            return False
+        self._urls.add(url)
+        return True
+
+    def __contains__(self, url: object) -> bool:
+        """Whether the URL is in the set."""
+        return url in self._urls
+
+    def __len__(self) -> int:
+        """Number of added URLs."""
+        return len(self._urls)
+
+
+class _SpilledRun:
+    """Sorted 64-bit hashes in a file, searched without loading it."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as run_file:
+            self._mmap = mmap.mmap(run_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._hashes = memoryview(self._mmap).cast("Q")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, hash_value: int) -> bool:
+        index = bisect.bisect_left(self._hashes, hash_value)
+        return index < len(self._hashes) and self._hashes[index] == hash_value
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._hashes)
+
+    def remove(self) -> None:
+        self._hashes.release()
+        self._mmap.close()
+        self.path.unlink(missing_ok=True)
+
+
+class HashedUrlSet(UrlSet):
+    """Compact URL set keeping 64-bit hashes of the URLs in sorted arrays: about 8 bytes per URL.
+
+    Different URLs may have the same hash, but the probability is negligible: about 3 * 10^-6 for the first
+    false match among 10 million URLs. With `spill_directory`, the hashes above `memory_limit` are moved
+    to sorted files and searched there, so the set is limited by the disk space.
+    """
+
+    def __init__(self,
+                 spill_directory: str | Path | None = None,
+                 memory_limit: int = 256 * 2 ** 20,
+                 buffer_size: int = 2 ** 16,
+                 max_runs: int = 8):
+        """Initialize an empty set.
+
+        :param spill_directory: directory for the spilled hashes. If None, all hashes are kept in memory
+        :param memory_limit: max size of the hashes kept in memory (bytes) when `spill_directory` is set
+        :param buffer_size: number of new hashes kept in a hash set before they are sorted into an array
+        :param max_runs: max number of sorted arrays (and files), fewer arrays make lookups faster
+            but merges more frequent
+        """
+        self._spill_directory = Path(spill_directory) if spill_directory is not None else None
+        if self._spill_directory is not None:
+            self._spill_directory.mkdir(parents=True, exist_ok=True)
+        self._memory_limit = memory_limit
+        self._buffer_size = buffer_size
+        self._max_runs = max_runs
+
+        self._buffer: set[int] = set()
+        self._runs: list[array[int]] = []
+        self._spilled_runs: list[_SpilledRun] = []
+        self._size = 0
+
+    def add(self, url: str) -> bool:
+        """Add the URL, see `UrlSet.add`."""
+        hash_value = url_hash(url)
+        if self._contains_hash(hash_value):
+            return False
+        self._buffer.add(hash_value)
+        self._size += 1
+        if len(self._buffer) >= self._buffer_size:
+            self._flush()
+        return True
+
+    def __contains__(self, url: object) -> bool:
+        """Whether the URL is in the set."""
+        return isinstance(url, str) and self._contains_hash(url_hash(url))
+
+    def __len__(self) -> int:
+        """Number of added URLs."""
+        return self._size
+
+    @property
+    def memory_size(self) -> int:
+        """Size of the hashes kept in memory, without the buffer (bytes)."""
+        return sum(len(run) for run in self._runs) * _HASH_SIZE
+
+    def close(self) -> None:
+        """Remove the spilled files."""
+        for spilled_run in self._spilled_runs:
+            spilled_run.remove()
+        self._spilled_runs.clear()
+
+    def _contains_hash(self, hash_value: int) -> bool:
+        if hash_value in self._buffer:
+            return True
+        for run in reversed(self._runs):
+            index = bisect.bisect_left(run, hash_value)
+            if index < len(run) and run[index] == hash_value:
+                return True
+        return any(hash_value in spilled_run for spilled_run in self._spilled_runs)
+
+    def _flush(self) -> None:
+        """Sort the buffer into a new array, merge the arrays and spill them if needed."""
+        run = array("Q", sorted(self._buffer))
+        self._buffer.clear()
+        # Runs of similar size are merged, so that there are O(log n) runs and every hash is merged O(log n) times.
+        # Sorting the concatenation is fast, as Timsort merges the two sorted parts in C
+        while self._runs and (len(self._runs[-1]) <= 2 * len(run) or len(self._runs) >= self._max_runs):
+            run = array("Q", sorted(self._runs.pop() + run))
+        self._runs.append(run)
+
+        if self._spill_directory is not None and self.memory_size > self._memory_limit:
+            self._spill()
+
+    def _spill(self) -> None:
+        # The runs in memory are merged by sorting their concatenation, see `_flush`
+        self._spilled_runs.append(self._write_run([array("Q", sorted(itertools.chain.from_iterable(self._runs)))]))
+        self._runs.clear()
+
+        if len(self._spilled_runs) > self._max_runs:
+            spilled_runs = self._spilled_runs
+            # The spilled runs may not fit in memory: they are merged lazily and written in chunks
+            merged = heapq.merge(*spilled_runs)
+            chunks = iter(lambda: array("Q", itertools.islice(merged, _SPILL_CHUNK_SIZE)), array("Q"))
+            self._spilled_runs = [self._write_run(chunks)]
+            for spilled_run in spilled_runs:
+                spilled_run.remove()
+
+    def _write_run(self, chunks: Iterable["array[int]"]) -> _SpilledRun:
+        """Write the sorted hashes to a new file."""
+        with tempfile.NamedTemporaryFile(dir=self._spill_directory, suffix=".hashes", delete=False) as run_file:
+            for chunk in chunks:
+                chunk.tofile(run_file)
+        return _SpilledRun(Path(run_file.name))
+
+
+class BloomUrlSet(UrlSet):
+    """Probabilistic URL set (Bloom filter): about 1.2 bytes per URL with 1% false positives.
+
+    A new URL may be considered seen with probability `error_rate`, so with a crawler some pages are not crawled.
+    Seen URLs are never considered new.
+    """
+
+    def __init__(self, capacity: int = 10_000_000, error_rate: float = 0.01):
+        """Initialize an empty set.
+
+        :param capacity: expected number of URLs; above it the error rate grows
+        :param error_rate: probability that a new URL is considered seen
+        """
+        self._bits_count = max(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self._hashes_count = max(round(self._bits_count / capacity * math.log(2)), 1)
+        self._bits = bytearray(math.ceil(self._bits_count / 8))
+        self._size = 0
+
+    def add(self, url: str) -> bool:
+        """Add the URL, see `UrlSet.add`."""
+        is_new = False
+        for bit in self._bit_indexes(url):
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self._bits[byte] & mask:
+                is_new = True
+                self._bits[byte] |= mask
+        self._size += is_new
+        return is_new
+
+    def __contains__(self, url: object) -> bool:
+        """Whether the URL is probably in the set."""
+        return isinstance(url, str) and all(self._bits[bit >> 3] & (1 << (bit & 7)) for bit in self._bit_indexes(url))
+
+    def __len__(self) -> int:
+        """Approximate number of added URLs (URLs considered seen by mistake are not counted)."""
+        return self._size
+
+    @property
+    def memory_size(self) -> int:
+        """Size of the filter (bytes)."""
+        return len(self._bits)
+
+    def _bit_indexes(self, url: str) -> list[int]:
+        # Double hashing: k indexes from two 64-bit hashes
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+        bits_count = self._bits_count
+        return [(first_hash + i * second_hash) % bits_count for i in range(self._hashes_count)]
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from urllib import parse
 
 from selenium_scraper.logger import logger
@@ -20,21 +21,57 @@ def update_url_params(url: str, params: dict[str, str]) -> str:
     return parse.urlunparse(url_parts)
 
 
+DEFAULT_PORTS = {"http": 80, "https": 443, "ws": 80, "wss": 443, "ftp": 21}
+
+
+def canonicalize_url(url: str) -> str:
+    """Bring URL to the canonical form, so that equivalent URLs are equal strings.
+
+    The scheme and host are lowercased, the default port and the fragment are removed,
+    query params are sorted and an empty path is replaced with '/'.
+
+    :param url: string of absolute URL
+    :return: string with canonical URL
+
+    >>> canonicalize_url('HTTPS://Example.com:443?b=2&a=1#top')
+    'https://example.com/?a=1&b=2'
+    """
+    parsed_url = parse.urlsplit(url)
+    scheme = parsed_url.scheme.lower()
+    netloc = (parsed_url.hostname or "").rstrip(".")
+    if ":" in netloc:
+        netloc = f"[{netloc}]"
+    try:
+        port = parsed_url.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if parsed_url.username:
+        credentials = parsed_url.username + (f":{parsed_url.password}" if parsed_url.password else "")
+        netloc = f"{credentials}@{netloc}"
+    query = "&".join(sorted(param for param in parsed_url.query.split("&") if param))
+    return parse.urlunsplit((scheme, netloc, parsed_url.path or "/", query, ""))
+
+
 class PageLinks:
     """Internal and external links of the page."""
 
     default_schemes = ("http", "https")
 
-    def __init__(self, page_url: str, schemes: tuple[str, ...] | None = default_schemes):
+    def __init__(self, page_url: str, schemes: tuple[str, ...] | None = default_schemes, *, canonicalize: bool = False):
         """Initialize PageLinks.
 
         :param page_url: Full URL of the page where the links are located
         :param schemes: Schemes tuple by which links will be filtered.
             If None, all links will be left. If specified, links with different schemes will be excluded
             (e.g. ('ftp', 'http', 'https', 'ws', 'wss', 'git', 'git+ssh')). Default: ('http', 'https')
+        :param canonicalize: If True, the links are kept in the canonical form (see `canonicalize_url`),
+            so that e.g. links differing only in the fragment are kept once
         """
         self._page = parse.urlparse(page_url)
-        self._schemes = schemes
+        self._schemes = (*schemes, "") if schemes else None
+        self._canonicalize = canonicalize
         self._internal: set[str] = set()
         self._external: set[str] = set()
 
@@ -55,27 +92,57 @@ class PageLinks:
             'https://github.com/nparamonov/SeleniumScraper#usage', '//github.com/nparamonov/SeleniumScraper',
             'javascript:void(0)', ...)
         """
+        resolved_link = self._resolve(raw_link)
+        if resolved_link is None:
+            logger.debug('Link "%s" skipped', raw_link)
+            return
+        url, is_internal = resolved_link
+        logger.debug('Link "%s" is %s', url, "internal" if is_internal else "external")
+        (self._internal if is_internal else self._external).add(url)
+
+    def add_links(self, raw_links: Iterable[str]) -> None:
+        """Add and process several links.
+
+        Unlike `add_link` in a loop, repeated links are processed once and no message is logged per link,
+        which matters on pages with hundreds of thousands of links.
+
+        :param raw_links: Original links from the page, see `add_link`
+        """
+        internal, external = self._internal, self._external
+        resolve = self._resolve
+        unique_links = dict.fromkeys(raw_links)
+        skipped = 0
+        for raw_link in unique_links:
+            resolved_link = resolve(raw_link)
+            if resolved_link is None:
+                skipped += 1
+            elif resolved_link[1]:
+                internal.add(resolved_link[0])
+            else:
+                external.add(resolved_link[0])
+        logger.debug("%d unique links processed, %d skipped", len(unique_links), skipped)
+
+    def _resolve(self, raw_link: str) -> tuple[str, bool] | None:
+        """Absolute URL of the link and whether it is internal, None if the link is skipped."""
         parsed_url = parse.urlparse(raw_link)
 
-        if self._schemes and parsed_url.scheme not in (*self._schemes, ""):
-            logger.debug('Link "%s" skipped: wrong scheme', raw_link)
-            return
+        if self._schemes and parsed_url.scheme not in self._schemes:
+            return None
 
-        if parsed_url.netloc and parsed_url.netloc != self._page.netloc:
+        if parsed_url.netloc:
             if not parsed_url.scheme:
                 # https://stackoverflow.com/questions/9646407/two-forward-slashes-in-a-url-src-href-attribute/9646435#9646435
                 parsed_url = parsed_url._replace(scheme=self._page.scheme)
-            restored_url = parse.urlunparse(parsed_url)
-            logger.debug('Link "%s" is external', restored_url)
-            self._external.add(restored_url)
-            return
-
-        if not parsed_url.netloc and parsed_url.path:
+            is_internal = parsed_url.netloc == self._page.netloc
+        elif parsed_url.path:
             parsed_url = parsed_url._replace(
                 netloc=self._page.netloc,
                 scheme=self._page.scheme,
                 path=parse.urljoin(self._page.path, parsed_url.path),
             )
-            restored_url = parse.urlunparse(parsed_url)
-            logger.debug('Link "%s" is internal', restored_url)
-            self._internal.add(restored_url)
+            is_internal = True
+        else:
+            return None
+
+        url = parse.urlunparse(parsed_url)
+        return (canonicalize_url(url) if self._canonicalize else url), is_internal
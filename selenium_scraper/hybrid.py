@@ -0,0 +1,344 @@
+import contextlib
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.cookies import CookieError, Morsel, SimpleCookie
+from typing import Any
+from urllib import parse
+
+import urllib3
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .extraction import ExtractionSchema, Schema
+from .helpers.urls import PageLinks, update_url_params
+from .logger import logger
+from .mapping import LinkExtractionMethods
+from .metrics import registry
+from .scraper import CommonScraper, SupportedSeleniumWebDriver
+from .static import StaticPageScraper
+
+# Function (page loaded over HTTP, page rendered by the browser) -> whether the HTTP page has the same content
+StaticCheck = Callable[[BeautifulSoup, BeautifulSoup], bool]
+
+# Min share of the rendered text and links found in the page loaded over HTTP for the host to be considered static
+STATIC_CONTENT_RATIO = 0.9
+# Max number of redirects followed by an HTTP request
+MAX_REDIRECTS = 10
+# Status codes of the redirects
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# Expiry time of the cookies deleted by the HTTP responses (Unix time, seconds)
+_DELETED_COOKIE_EXPIRY = 1
+# Elements which text is not rendered
+_HIDDEN_ELEMENTS = ("script", "style", "noscript", "template")
+
+
+def same_content(http_page: BeautifulSoup, rendered_page: BeautifulSoup) -> bool:
+    """Default check of `HybridScraper`: the page loaded over HTTP has most of the text and links of the rendered page.
+
+    :param http_page: page loaded over HTTP
+    :param rendered_page: the same page rendered by the browser
+    """
+    rendered_links = {link["href"] for link in rendered_page.find_all("a", href=True)}
+    http_links = {link["href"] for link in http_page.find_all("a", href=True)}
+    if len(rendered_links & http_links) < STATIC_CONTENT_RATIO * len(rendered_links):
+        return False
+    return _visible_text_length(http_page) >= STATIC_CONTENT_RATIO * _visible_text_length(rendered_page)
+
+
+def _visible_text_length(page: BeautifulSoup) -> int:
+    return sum(len(string.strip()) for string in page.find_all(string=True)
+               if string.parent is not None and string.parent.name not in _HIDDEN_ELEMENTS)
+
+
+class HybridScraper(StaticPageScraper):
+    """Scraper loading static pages with plain HTTP requests in the browser session, other pages with the browser.
+
+    Rendering a static page in the browser costs 10-50 times more than an HTTP request. The first page of every host
+    is loaded both ways and compared (see `same_content`): if the page loaded over HTTP has the same content,
+    the next pages of the host are loaded over HTTP, otherwise with the browser. The decision is cached per host.
+
+    HTTP requests are sent with the cookies and the user agent of the browser through a pool of keep-alive
+    connections; the cookies set by the responses are passed back to the browser before its next page load.
+    `current_page`, `get_all_links`, `get_page_fragment` and `extract` work on the last loaded page either way.
+
+    Example:
+        with Scraper.chrome(headless=True) as browser:
+            scraper = HybridScraper(browser)
+            scraper.get('https://example.com/login')  # log in with scraper.browser if needed
+            for url in urls:
+                scraper.get(url)
+                links = scraper.get_all_links()
+    """
+
+    def __init__(self,
+                 browser: CommonScraper,
+                 *,
+                 check: StaticCheck = same_content,
+                 max_connections: int = 4,
+                 http_timeout: float | None = None) -> None:
+        """Initialize HybridScraper.
+
+        :param browser: browser session loading the pages which need rendering; it is not closed by HybridScraper
+        :param check: function (page loaded over HTTP, rendered page) -> whether the host is static
+        :param max_connections: max number of keep-alive connections kept per host
+        :param http_timeout: timeout of the HTTP requests (seconds). If None, `timeout` of `get`
+        """
+        super().__init__()
+        self.browser = browser
+        self._check = check
+        self._http = urllib3.PoolManager(maxsize=max_connections)
+        self._http_timeout = http_timeout
+        # Host -> whether its pages need the browser
+        self._needs_browser: dict[str, bool] = {}
+        # Whether the last page has been loaded with the browser
+        self._rendered = False
+        # Cookies of the HTTP requests: (domain, path, name) -> cookie in WebDriver format
+        self._cookies: dict[tuple[str, str, str], dict[str, Any]] = {}
+        # Cookies set or deleted (see `_deleted_cookie`) by the HTTP responses and not passed to the browser yet
+        self._new_cookies: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._user_agent: str | None = None
+        # Whether the browser may have changed the cookies since they have been copied
+        self._session_stale = True
+
+    def get(self,
+            url: str,
+            params: dict[str, str] | None = None,
+            timeout: float = 5.0,
+            ready: Callable[[SupportedSeleniumWebDriver], bool] | None = None) -> None:
+        """Load a web page over HTTP or with the browser, see `CommonScraper.get`.
+
+        Pages with a `ready` condition, pages of the hosts needing the browser and pages which cannot be loaded
+        over HTTP (network errors, error statuses, non-HTML content) are loaded with the browser.
+        The first page of a host loaded without `ready` probes the host: if it cannot be loaded over HTTP,
+        or its rendered content differs, the later pages of the host are loaded with the browser only.
+
+        :param url: string of target URL
+        :param params: dict containing query params for url
+        :param timeout: timeout (seconds)
+        :param ready: readiness condition of the page, see `CommonScraper.get`
+        """
+        url = update_url_params(url, params or {})
+        host = parse.urlsplit(url).hostname or ""
+        needs_browser = self._needs_browser.get(host)
+        if ready is not None or needs_browser:
+            self._browser_get(url, timeout, ready)
+            return
+
+        if not self._http_get(url, timeout):
+            if needs_browser is None:
+                # The probe has failed, the host is not probed again
+                self._needs_browser[host] = True
+                logger.info("Pages of %s are loaded with the browser", host)
+            self._browser_get(url, timeout, ready)
+            return
+        if needs_browser is None:
+            http_page = self.current_page
+            self._browser_get(url, timeout, ready)
+            needs_browser = not self._check(http_page, self.browser.current_page)
+            self._needs_browser[host] = needs_browser
+            logger.info("Pages of %s are loaded %s", host, "with the browser" if needs_browser else "over HTTP")
+
+    @property
+    def host_modes(self) -> dict[str, bool]:
+        """Host -> whether its pages are loaded with the browser, for the hosts probed so far."""
+        return dict(self._needs_browser)
+
+    def set_host_mode(self, host: str, *, needs_browser: bool) -> None:
+        """Skip the probe of the host: load its pages with the browser or over HTTP.
+
+        :param host: host name, e.g. 'example.com'
+        :param needs_browser: whether the pages of the host need the browser
+        """
+        self._needs_browser[host] = needs_browser
+
+    def close(self) -> None:
+        """Close the HTTP connections. The browser is not closed."""
+        self._http.clear()
+
+    @property
+    def current_url(self) -> str:
+        """URL of the current page (after redirects)."""
+        return self.browser.driver.current_url if self._rendered else super().current_url
+
+    @property
+    def page_source(self) -> str:
+        """Source of the current page."""
+        return self.browser.driver.page_source if self._rendered else super().page_source
+
+    @property
+    def current_page(self) -> BeautifulSoup:
+        """Get the source of the current page, see `CommonScraper.current_page`.
+
+        :return: BeautifulSoup object representing a parsed HTML
+        """
+        return self.browser.current_page if self._rendered else super().current_page
+
+    def get_page_fragment(self, selector: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Get the source of the elements matching the CSS selector, see `CommonScraper.get_page_fragment`.
+
+        :param selector: CSS selector of the elements, e.g. 'div.results'
+        :param parse_only: parse only the matching parts of the fragment, e.g. SoupStrainer('a')
+        :return: BeautifulSoup object with the matching elements in the page order
+        """
+        if self._rendered:
+            return self.browser.get_page_fragment(selector, parse_only)
+        return super().get_page_fragment(selector, parse_only)
+
+    def extract(self, schema: ExtractionSchema | Schema) -> dict[str, Any]:
+        """Extract the fields described by the schema from the current page, see `CommonScraper.extract`.
+
+        :param schema: compiled schema, or field name -> `extraction.Field` or CSS selector of a text field.
+            XPath fields are only supported on the pages loaded with the browser
+        :return: field name -> value
+        """
+        if self._rendered:
+            return self.browser.extract(schema)
+        return super().extract(schema)
+
+    def get_all_links(self,
+                      schemes: tuple[str, ...] | None = PageLinks.default_schemes,
+                      method: str = LinkExtractionMethods.js) -> PageLinks:
+        """Get a helpers.urls.PageLinks object with all links on the current page, see `CommonScraper.get_all_links`.
+
+        :param schemes: Schemes tuple by which links will be filtered
+        :param method: way to collect the links from the pages loaded with the browser
+        """
+        if self._rendered:
+            return self.browser.get_all_links(schemes, method)
+        return super().get_all_links(schemes)
+
+    def _browser_get(self,
+                     url: str,
+                     timeout: float,
+                     ready: Callable[[SupportedSeleniumWebDriver], bool] | None) -> None:
+        if self._new_cookies:
+            host = parse.urlsplit(url).hostname or ""
+            keys = [key for key in self._new_cookies if _domain_matches(host, key[0])]
+            self.browser.import_cookies(url, [self._new_cookies.pop(key) for key in keys])
+        self.browser.get(url, timeout=timeout, ready=ready)
+        self._rendered = True
+        self._session_stale = True
+
+    def _http_get(self, url: str, timeout: float) -> bool:
+        """Load the page over HTTP.
+
+        :return: whether an HTML page has been loaded
+        """
+        if self._session_stale:
+            self._copy_session()
+        request_url = url
+        with registry.measure("http_get") as timer:
+            try:
+                for _ in range(MAX_REDIRECTS + 1):
+                    response = self._http.request(
+                        "GET", request_url, headers=self._headers(request_url), redirect=False,
+                        timeout=self._http_timeout if self._http_timeout is not None else timeout,
+                    )
+                    self._store_cookies(request_url, response.headers.getlist("Set-Cookie"))
+                    location = response.headers.get("Location")
+                    if response.status not in REDIRECT_STATUSES or location is None:
+                        break
+                    request_url = parse.urljoin(request_url, location)
+                else:
+                    logger.info("Too many redirects at %s, load it with the browser", url)
+                    return False
+            except urllib3.exceptions.HTTPError as error:
+                logger.info("HTTP request to %s has failed (%s), load it with the browser", url, error)
+                return False
+            timer.size = len(response.data)
+
+        content_type = response.headers.get("Content-Type", "")
+        if response.status >= 400 or "html" not in content_type:  # noqa: PLR2004
+            logger.info("HTTP request to %s has returned %d %s, load it with the browser",
+                        url, response.status, content_type)
+            return False
+        self._set_page(request_url, _decode(response.data, content_type))
+        self._rendered = False
+        logger.info("Load %s over HTTP", url)
+        return True
+
+    def _copy_session(self) -> None:
+        """Copy the cookies and the user agent of the browser.
+
+        The cookies deleted by the browser are dropped, the changes of the HTTP responses not passed to the browser
+        yet are kept.
+        """
+        self._cookies = {(cookie["domain"], cookie.get("path", "/"), cookie["name"]): cookie
+                         for cookie in self.browser.export_cookies()}
+        for key, cookie in self._new_cookies.items():
+            if cookie.get("expiry") == _DELETED_COOKIE_EXPIRY:
+                self._cookies.pop(key, None)
+            else:
+                self._cookies[key] = cookie
+        if self._user_agent is None:
+            self._user_agent = self.browser.driver.execute_script("return navigator.userAgent;")
+        self._session_stale = False
+
+    def _headers(self, url: str) -> dict[str, str]:
+        headers = {"Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"}
+        if self._user_agent is not None:
+            headers["User-Agent"] = self._user_agent
+        split_url = parse.urlsplit(url)
+        host, path = split_url.hostname or "", split_url.path or "/"
+        cookies = [f"{cookie['name']}={cookie['value']}"
+                   for (domain, cookie_path, _), cookie in self._cookies.items()
+                   if _domain_matches(host, domain) and path.startswith(cookie_path)
+                   and (split_url.scheme == "https" or not cookie.get("secure"))]
+        if cookies:
+            headers["Cookie"] = "; ".join(cookies)
+        return headers
+
+    def _store_cookies(self, url: str, set_cookie_headers: list[str]) -> None:
+        host = parse.urlsplit(url).hostname or ""
+        for header in set_cookie_headers:
+            try:
+                morsels = SimpleCookie(header).values()
+            except CookieError:
+                logger.debug("Invalid Set-Cookie header at %s: %s", url, header)
+                continue
+            for morsel in morsels:
+                domain = morsel["domain"] or host
+                key = (domain, morsel["path"] or "/", morsel.key)
+                if _is_expired(morsel):
+                    self._cookies.pop(key, None)
+                    self._new_cookies[key] = _deleted_cookie(*key)
+                    continue
+                cookie = {"name": morsel.key, "value": morsel.value, "domain": domain, "path": key[1],
+                          "secure": bool(morsel["secure"]), "httpOnly": bool(morsel["httponly"])}
+                self._cookies[key] = self._new_cookies[key] = cookie
+
+
+def _is_expired(morsel: Morsel[str]) -> bool:
+    """Whether the Set-Cookie header deletes the cookie: Max-Age is not positive or Expires is in the past."""
+    if morsel["max-age"]:
+        with contextlib.suppress(ValueError):
+            return int(morsel["max-age"]) <= 0
+    if morsel["expires"]:
+        try:
+            expires = parsedate_to_datetime(morsel["expires"])
+        except (TypeError, ValueError):
+            return False
+        if expires.tzinfo is None:
+            expires = expires.replace(tzinfo=timezone.utc)
+        return expires <= datetime.now(timezone.utc)
+    return False
+
+
+def _deleted_cookie(domain: str, path: str, name: str) -> dict[str, Any]:
+    """Expired cookie in WebDriver format: importing it deletes the cookie from the browser."""
+    return {"name": name, "value": "", "domain": domain, "path": path, "expiry": _DELETED_COOKIE_EXPIRY}
+
+
+def _domain_matches(host: str, domain: str) -> bool:
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+def _decode(data: bytes, content_type: str) -> str:
+    """Decode the body with the charset of the Content-Type header, UTF-8 by default."""
+    for parameter in content_type.split(";")[1:]:
+        name, _, value = parameter.strip().partition("=")
+        if name.lower() == "charset":
+            with contextlib.suppress(LookupError):
+                return data.decode(value.strip("\"' "), errors="replace")
+    return data.decode("utf-8", errors="replace")
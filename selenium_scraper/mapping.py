@@ -3,3 +3,22 @@ class ScrollMethods:
     js_instant = "js_instant"
     js_smooth = "js_smooth"
     end_key = "end_key"
+
+
+class LinkExtractionMethods:
+    """Available ways to collect links from the page."""
+    js = "js"
+    soup = "soup"
+
+
+class WaitMethods:
+    """Available ways to wait for new content after scrolling."""
+    mutations = "mutations"
+    scroll_height = "scroll_height"
+
+
+class PageLoadStrategies:
+    """Available page load strategies (when the browser considers a page loaded in `get`)."""
+    normal = "normal"
+    eager = "eager"
+    none = "none"
@@ -0,0 +1,335 @@
+import bisect
+import itertools
+import threading
+import timeit
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from types import TracebackType
+from typing import NamedTuple
+
+# Upper bounds of the duration histogram buckets (seconds)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Measurement(NamedTuple):
+    """Timing of a scraper operation.
+
+    Operations (`name`): 'driver_start', 'driver_stop', 'recover', 'get', 'current_page', 'page_source', 'parse',
+    'scroll_down', 'scroll_infinite_page', 'get_all_links', 'extract', 'http_get' (see `hybrid.HybridScraper`),
+    'tab_get' (from the start of the navigation until the page is ready, see `tabs.TabMultiplexer`).
+    `size` is the amount of the transferred or processed data if known: characters of the page source
+    for 'page_source' and 'parse', bytes of the response body for 'http_get', links for 'get_all_links',
+    scrolls for 'scroll_infinite_page'.
+    """
+    name: str
+    duration: float
+    size: int | None
+    labels: Labels
+
+
+class Sample(NamedTuple):
+    """Current value of a resource gauge.
+
+    Gauges (`name`): 'browser_rss_bytes', 'browser_cpu_percent', 'browser_processes',
+    sampled by `watchdog.BrowserWatchdog`, and 'host_concurrency' set by `scheduler.HostScheduler`.
+    """
+    name: str
+    value: float
+    labels: Labels
+
+
+class MetricsSink(ABC):
+    """Receiver of the measurements, see `MetricsRegistry.add_sink`."""
+
+    @abstractmethod
+    def record(self, measurement: Measurement) -> None:
+        """Process the measurement. It is called in the scraper thread, so it must be fast."""
+
+    def record_sample(self, sample: Sample) -> None:  # noqa: B027
+        """Process the gauge sample. Samples are ignored unless the sink overrides it."""
+
+
+class CallbackSink(MetricsSink):
+    """Sink passing every measurement to a function, e.g. to send it to your monitoring system."""
+
+    def __init__(self,
+                 callback: Callable[[Measurement], None],
+                 sample_callback: Callable[[Sample], None] | None = None):
+        """Initialize CallbackSink.
+
+        :param callback: function (measurement) -> None
+        :param sample_callback: function (sample) -> None for the gauge samples. If None, samples are ignored
+        """
+        self._callback = callback
+        self._sample_callback = sample_callback
+
+    def record(self, measurement: Measurement) -> None:
+        """Call the callback."""
+        self._callback(measurement)
+
+    def record_sample(self, sample: Sample) -> None:
+        """Call the sample callback."""
+        if self._sample_callback is not None:
+            self._sample_callback(sample)
+
+
+class Histogram:
+    """Distribution of the durations of an operation."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Initialize an empty Histogram.
+
+        :param buckets: sorted upper bounds of the buckets (seconds)
+        """
+        self.buckets = buckets
+        # The last bucket counts the durations above the largest bound
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.size = 0
+
+    def observe(self, duration: float, size: int | None = None) -> None:
+        """Add a duration (seconds) and the size of the processed data."""
+        self.bucket_counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.count += 1
+        self.sum += duration
+        self.size += size or 0
+
+    @property
+    def mean(self) -> float:
+        """Mean duration (seconds)."""
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate the quantile of the durations as the upper bound of its bucket.
+
+        :param q: quantile, from 0 to 1 (e.g. 0.95)
+        :return: duration (seconds), infinity if the quantile is above the largest bucket
+        """
+        rank = q * self.count
+        cumulative_count = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts, strict=False):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                return bound
+        return float("inf")
+
+
+class HistogramSink(MetricsSink):
+    """Sink aggregating the measurements in memory into a histogram per operation and labels."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Initialize HistogramSink.
+
+        :param buckets: sorted upper bounds of the duration buckets (seconds)
+        """
+        self._buckets = buckets
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, measurement: Measurement) -> None:
+        """Add the measurement to the histogram of its operation."""
+        key = (measurement.name, measurement.labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            histogram.observe(measurement.duration, measurement.size)
+
+    def record_sample(self, sample: Sample) -> None:
+        """Keep the last value of the gauge."""
+        with self._lock:
+            self._gauges[sample.name, sample.labels] = sample.value
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """Get the histogram of the operation.
+
+        :param name: operation, see `Measurement`
+        :param labels: labels of the measurements, e.g. browser='chrome'. If not given, histograms of
+            all labels are merged
+        """
+        with self._lock:
+            histograms = [histogram for (histogram_name, histogram_labels), histogram in self._histograms.items()
+                          if histogram_name == name and labels.items() <= dict(histogram_labels).items()]
+        merged = Histogram(self._buckets)
+        for histogram in histograms:
+            merged.bucket_counts = [a + b for a, b in zip(merged.bucket_counts, histogram.bucket_counts, strict=True)]
+            merged.count += histogram.count
+            merged.sum += histogram.sum
+            merged.size += histogram.size
+        return merged
+
+    def gauge(self, name: str, **labels: str) -> float | None:
+        """Get the last value of the gauge.
+
+        :param name: gauge, see `Sample`
+        :param labels: labels of the samples, e.g. browser='chrome'. If not given, values of all labels are summed
+        :return: value or None if the gauge has not been sampled
+        """
+        with self._lock:
+            values = [value for (gauge_name, gauge_labels), value in self._gauges.items()
+                      if gauge_name == name and labels.items() <= dict(gauge_labels).items()]
+        return sum(values) if values else None
+
+    def clear(self) -> None:
+        """Drop all histograms and gauges."""
+        with self._lock:
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+class PrometheusSink(HistogramSink):
+    """Histogram sink rendering the Prometheus text exposition format.
+
+    Serve `exposition()` on your /metrics endpoint, e.g. with the standard http.server.
+    Every operation is exposed as the `selenium_scraper_<name>_seconds` histogram
+    and the `selenium_scraper_<name>_size_total` counter, every gauge as `selenium_scraper_<name>`.
+    """
+
+    namespace = "selenium_scraper"
+
+    def exposition(self) -> str:
+        """Render all histograms in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            gauges = sorted(self._gauges.items())
+
+        lines = []
+        for name, group in itertools.groupby(histograms, key=lambda item: item[0][0]):
+            metric = f"{self.namespace}_{name}"
+            group_histograms = [(labels, histogram) for (_, labels), histogram in group]
+
+            lines.append(f"# TYPE {metric}_seconds histogram")
+            for labels, histogram in group_histograms:
+                cumulative_count = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts, strict=False):
+                    cumulative_count += bucket_count
+                    lines.append(f"{metric}_seconds_bucket{self._labels(labels, le=repr(bound))} {cumulative_count}")
+                lines.append(f"{metric}_seconds_bucket{self._labels(labels, le='+Inf')} {histogram.count}")
+                lines.append(f"{metric}_seconds_sum{self._labels(labels)} {histogram.sum!r}")
+                lines.append(f"{metric}_seconds_count{self._labels(labels)} {histogram.count}")
+
+            lines.append(f"# TYPE {metric}_size_total counter")
+            lines.extend(f"{metric}_size_total{self._labels(labels)} {histogram.size}"
+                         for labels, histogram in group_histograms)
+
+        for name, gauge_group in itertools.groupby(gauges, key=lambda item: item[0][0]):
+            lines.append(f"# TYPE {self.namespace}_{name} gauge")
+            lines.extend(f"{self.namespace}_{name}{self._labels(labels)} {value!r}"
+                         for (_, labels), value in gauge_group)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels: Labels, **extra_labels: str) -> str:
+        pairs = [*labels, *extra_labels.items()]
+        if not pairs:
+            return ""
+        escaped_pairs = (
+            (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in pairs
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in escaped_pairs) + "}"
+
+
+class Timer:
+    """Context manager measuring the duration of an operation, see `MetricsRegistry.measure`."""
+
+    __slots__ = ("_registry", "name", "labels", "size", "_start_time")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Labels):
+        """Initialize the Timer, the time is measured from entering the context."""
+        self._registry = registry
+        self.name = name
+        self.labels = labels
+        # Can be set inside the context, see `Measurement.size`
+        self.size: int | None = None
+        self._start_time = 0.0
+
+    def __enter__(self) -> "Timer":
+        """Start the timer."""
+        self._start_time = timeit.default_timer()
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Stop the timer and pass the measurement to the sinks."""
+        duration = timeit.default_timer() - self._start_time
+        self._registry.record(Measurement(self.name, duration, self.size, self.labels))
+
+
+class _NullTimer(Timer):
+    """Timer doing nothing, it is returned while metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "Timer":
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        pass
+
+
+class MetricsRegistry:
+    """Registry of the metrics sinks.
+
+    The scrapers measure their operations only while at least one sink is added,
+    otherwise measuring costs a single attribute check.
+
+    Example:
+        from selenium_scraper.metrics import PrometheusSink, registry
+
+        sink = PrometheusSink()
+        registry.add_sink(sink)
+        scraper.get('https://github.com/nparamonov/SeleniumScraper')
+        links = scraper.get_all_links()
+        print(sink.histogram('get').mean, sink.histogram('get_all_links', browser='chrome').quantile(0.95))
+        print(sink.exposition())
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry without sinks (metrics are disabled)."""
+        self._sinks: tuple[MetricsSink, ...] = ()
+        self._null_timer = _NullTimer(self, "", ())
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any sink is added."""
+        return bool(self._sinks)
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """Start passing the measurements to the sink."""
+        self._sinks = (*self._sinks, sink)
+
+    def remove_sink(self, sink: MetricsSink) -> None:
+        """Stop passing the measurements to the sink."""
+        self._sinks = tuple(added_sink for added_sink in self._sinks if added_sink is not sink)
+
+    def measure(self, name: str, labels: Labels = ()) -> Timer:
+        """Measure the duration of the code inside the returned context manager.
+
+        :param name: operation, see `Measurement`
+        :param labels: labels of the measurement, e.g. (('browser', 'chrome'),)
+        """
+        if not self._sinks:
+            return self._null_timer
+        return Timer(self, name, labels)
+
+    def record(self, measurement: Measurement) -> None:
+        """Pass the measurement to all sinks."""
+        for sink in self._sinks:
+            sink.record(measurement)
+
+    def record_sample(self, sample: Sample) -> None:
+        """Pass the gauge sample to all sinks."""
+        for sink in self._sinks:
+            sink.record_sample(sample)
+
+
+registry = MetricsRegistry()
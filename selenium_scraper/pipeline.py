@@ -0,0 +1,204 @@
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from .logger import logger
+from .pool import ScraperPool
+from .static import StaticPageScraper
+
+Extractor = Callable[[StaticPageScraper, str], Any]
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """Result of a fetched and parsed page."""
+
+    url: str
+    data: Any = None
+    error: BaseException | None = None
+
+
+def _parse_page(extractor: Extractor, url: str, page_source: str) -> Any:
+    """Parse the page source and run the extractor, in a worker process."""
+    scraper = StaticPageScraper()
+    scraper._set_page(url, page_source)  # noqa: SLF001
+    return extractor(scraper, url)
+
+
+class _Feed:
+    """Thread-safe source of numbered URLs."""
+
+    def __init__(self, urls: Iterable[str]):
+        self._urls = enumerate(urls)
+        self._lock = threading.Lock()
+        self.taken = 0
+
+    def take(self) -> tuple[int, str] | None:
+        with self._lock:
+            item = next(self._urls, None)
+            if item is not None:
+                self.taken += 1
+            return item
+
+
+class ParsePipeline:
+    """Pipeline overlapping page fetching in the browser sessions with parsing in worker processes.
+
+    Parsing of the page source with BeautifulSoup is CPU-bound and blocks the session while it runs.
+    In the pipeline every session of the pool only loads the page and takes its source, then moves on
+    to the next URL, while the source is parsed and passed to `extractor` in a process pool.
+    The number of pages fetched but not yet consumed is limited by `max_pending`, so the sessions wait
+    when parsing or the consumer falls behind.
+
+    `extractor` gets a `StaticPageScraper` with the page (`current_page`, `get_all_links`, `get_page_fragment`)
+    and the URL. It runs in another process, so it and its result must be picklable,
+    e.g. `extractor` must be a module-level function.
+
+    Example:
+        from functools import partial
+        from selenium_scraper import ParsePipeline, Scraper, ScraperPool
+
+        def extract_title(scraper, url):
+            return scraper.current_page.title.text
+
+        with ScraperPool(partial(Scraper.chrome, headless=True), size=2) as pool:
+            for result in ParsePipeline(pool, extract_title).run(urls):
+                print(result.url, result.data)
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 pool: ScraperPool,
+                 extractor: Extractor,
+                 *,
+                 processes: int | None = None,
+                 max_pending: int | None = None,
+                 ordered: bool = True,
+                 timeout: float = 5.0):
+        """Initialize ParsePipeline.
+
+        :param pool: pool of browser sessions; all sessions of the pool are used for fetching
+        :param extractor: function (scraper, url) -> data, called in a worker process for each page.
+            Its result is returned in `ParseResult.data`
+        :param processes: number of worker processes. If None, the number of CPUs
+        :param max_pending: max number of pages being fetched, parsed or waiting for the consumer.
+            If None, twice the number of sessions and processes
+        :param ordered: whether to return the results in the order of URLs, otherwise as soon as they are parsed
+        :param timeout: page load timeout (seconds)
+        """
+        self._pool = pool
+        self._extractor = extractor
+        self._processes = processes or os.cpu_count() or 1
+        self._max_pending = max_pending or 2 * (self._pool.size + self._processes)
+        if self._max_pending < self._pool.size:
+            msg = "max_pending must not be less than the pool size"
+            raise ValueError(msg)
+        self._ordered = ordered
+        self._timeout = timeout
+
+    def run(self, urls: Iterable[str]) -> Iterator[ParseResult]:
+        """Fetch and parse the pages.
+
+        :param urls: URLs of the pages, the iterable is consumed lazily
+        :return: iterator of results, in the order of `urls` if `ordered`
+        """
+        feed = _Feed(urls)
+        slots = threading.Semaphore(self._max_pending)
+        stop = threading.Event()
+        results: queue.Queue[tuple[int, ParseResult] | None] = queue.Queue()
+
+        with ProcessPoolExecutor(self._processes) as executor:
+            workers = [threading.Thread(target=self._work, args=(executor, feed, slots, stop, results), daemon=True)
+                       for _ in range(self._pool.size)]
+            for worker in workers:
+                worker.start()
+
+            try:
+                yield from self._collect(feed, slots, results, len(workers))
+            finally:
+                stop.set()
+                for _ in workers:
+                    slots.release()
+                for worker in workers:
+                    worker.join()
+                executor.shutdown(cancel_futures=True)
+
+    def _collect(self,
+                 feed: _Feed,
+                 slots: threading.Semaphore,
+                 results: "queue.Queue[tuple[int, ParseResult] | None]",
+                 workers: int) -> Iterator[ParseResult]:
+        buffer: dict[int, ParseResult] = {}
+        next_index = 0
+        received = 0
+        finished_workers = 0
+        while finished_workers < workers or received < feed.taken:
+            item = results.get()
+            if item is None:
+                finished_workers += 1
+                continue
+
+            received += 1
+            index, result = item
+            if not self._ordered:
+                slots.release()
+                yield result
+                continue
+
+            buffer[index] = result
+            while next_index in buffer:
+                slots.release()
+                yield buffer.pop(next_index)
+                next_index += 1
+
+    def _work(self,  # noqa: PLR0913
+              executor: ProcessPoolExecutor,
+              feed: _Feed,
+              slots: threading.Semaphore,
+              stop: threading.Event,
+              results: "queue.Queue[tuple[int, ParseResult] | None]") -> None:
+        try:
+            with self._pool.lease() as scraper:
+                while True:
+                    slots.acquire()
+                    item = None if stop.is_set() else feed.take()
+                    if item is None:
+                        slots.release()
+                        break
+
+                    index, url = item
+                    try:
+                        scraper.get(url, timeout=self._timeout)
+                        page_url, page_source = scraper.driver.current_url, scraper.driver.page_source
+                    except Exception as error:  # noqa: BLE001 - every taken URL must get a result
+                        logger.warning("Failed to fetch %s: %r", url, error)
+                        results.put((index, ParseResult(url, error=error)))
+                        continue
+
+                    try:
+                        future = executor.submit(_parse_page, self._extractor, page_url, page_source)
+                    except Exception as error:  # noqa: BLE001 - e.g. BrokenProcessPool
+                        logger.warning("Failed to parse %s: %r", url, error)
+                        results.put((index, ParseResult(url, error=error)))
+                        continue
+                    future.add_done_callback(partial(self._put_result, results, index, url))
+        finally:
+            results.put(None)
+
+    @staticmethod
+    def _put_result(results: "queue.Queue[tuple[int, ParseResult] | None]",
+                    index: int,
+                    url: str,
+                    future: "Future[Any]") -> None:
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            results.put((index, ParseResult(url, future.result())))
+        else:
+            logger.warning("Failed to parse %s: %r", url, error)
+            results.put((index, ParseResult(url, error=error)))
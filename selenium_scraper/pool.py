@@ -0,0 +1,244 @@
+import threading
+import time
+import timeit
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from types import TracebackType
+
+from .logger import logger
+from .scraper import CommonScraper, close_scrapers
+
+ScraperFactory = Callable[[], CommonScraper]
+
+# Delay before the second attempt to start a replacement session (seconds), doubled after every failure
+REPLACEMENT_BACKOFF = 1.0
+# Max delay between the attempts to start a replacement session (seconds)
+MAX_REPLACEMENT_BACKOFF = 60.0
+
+
+class _PooledScraper:
+    """Scraper with the statistics needed to decide when it should be recycled."""
+
+    __slots__ = ("scraper", "created_at", "uses")
+
+    def __init__(self, scraper: CommonScraper):
+        self.scraper = scraper
+        self.created_at = timeit.default_timer()
+        self.uses = 0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the browser was started."""
+        return timeit.default_timer() - self.created_at
+
+
+class ScraperPool:
+    """Pool of pre-started browser sessions.
+
+    Starting a browser is often slower than the scraping itself, so the pool keeps `size` sessions warm
+    and lends them out. Between leases the session state is reset (see `CommonScraper.reset`).
+    A session is replaced with a fresh one in the background after `max_uses` leases or `max_age` seconds.
+
+    Example:
+        from functools import partial
+        from selenium_scraper import Scraper, ScraperPool
+
+        with ScraperPool(partial(Scraper.chrome, headless=True), size=4) as pool:
+            with pool.lease() as scraper:
+                scraper.get('https://github.com/nparamonov/SeleniumScraper')
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 factory: ScraperFactory,
+                 size: int = 2,
+                 *,
+                 max_uses: int | None = None,
+                 max_age: float | None = None,
+                 reset: bool = True):
+        """Initialize the pool and start `size` browser sessions.
+
+        :param factory: callable without arguments returning a new scraper,
+            e.g. functools.partial(Scraper.chrome, headless=True)
+        :param size: number of sessions kept in the pool
+        :param max_uses: recycle a session after this number of leases. If None, the number of leases is unlimited
+        :param max_age: recycle a session after this number of seconds since its start. If None, the age is unlimited
+        :param reset: whether to reset the session state (tabs, cookies, storage) when it is returned to the pool.
+            Sessions which cannot delete the cookies of all domains (see `CommonScraper.full_reset`,
+            e.g. Firefox without WebDriver BiDi) keep the cookies of the domains other than the last page,
+            a warning is logged when the pool is started with them
+        """
+        if size < 1:
+            msg = "Pool size must be at least 1"
+            raise ValueError(msg)
+
+        self._factory = factory
+        self._size = size
+        self._max_uses = max_uses
+        self._max_age = max_age
+        self._reset = reset
+
+        self._condition = threading.Condition()
+        self._idle: deque[_PooledScraper] = deque()
+        self._leased: dict[int, _PooledScraper] = {}
+        self._closed = False
+        # Error of the last failed start of a replacement session, None after a successful start
+        self._start_error: Exception | None = None
+
+        try:
+            for _ in range(size):
+                self._start_session()
+        except BaseException:
+            self.close()
+            raise
+
+        if reset and not all(pooled.scraper.full_reset for pooled in self._idle):
+            logger.warning("Scrapers of the pool cannot delete the cookies of all domains, only the cookies "
+                           "of the last page domain are deleted between leases (enable WebDriver BiDi in Firefox)")
+
+    @property
+    def size(self) -> int:
+        """Number of sessions kept in the pool."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of started sessions waiting for a lease."""
+        with self._condition:
+            return len(self._idle)
+
+    def acquire(self, timeout: float | None = None) -> CommonScraper:
+        """Take a session from the pool. The session must be returned with `release`.
+
+        :param timeout: max waiting time (s) for a free session. If None, wait forever
+        :return: scraper with a running browser
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                if not self._condition.wait_for(lambda: self._idle or self._closed or self._exhausted, remaining):
+                    msg = f"No free scraper in the pool within {timeout} seconds"
+                    raise TimeoutError(msg)
+                if self._closed:
+                    msg = "Scraper pool is closed"
+                    raise RuntimeError(msg)
+                if not self._idle:
+                    msg = "No scraper of the pool is running, the replacements have failed to start"
+                    raise RuntimeError(msg) from self._start_error
+
+                pooled = self._idle.popleft()
+                if not self._is_expired(pooled):
+                    pooled.uses += 1
+                    self._leased[id(pooled.scraper)] = pooled
+                    return pooled.scraper
+            # The session has been idle for longer than `max_age`
+            self._discard(pooled)
+
+    def release(self, scraper: CommonScraper) -> None:
+        """Return the session to the pool.
+
+        :param scraper: scraper received from `acquire`
+        """
+        with self._condition:
+            pooled = self._leased.pop(id(scraper), None)
+        if pooled is None:
+            msg = "Scraper does not belong to this pool"
+            raise ValueError(msg)
+
+        if self._closed or self._is_expired(pooled):
+            self._discard(pooled)
+            return
+
+        if self._reset:
+            try:
+                scraper.reset()
+            except Exception:  # noqa: BLE001 - e.g. urllib3 errors of a crashed driver
+                logger.exception("Failed to reset scraper, it will be replaced")
+                self._discard(pooled)
+                return
+
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[CommonScraper]:
+        """Take a session from the pool for the duration of the `with` block.
+
+        :param timeout: max waiting time (s) for a free session. If None, wait forever
+        """
+        scraper = self.acquire(timeout)
+        try:
+            yield scraper
+        finally:
+            self.release(scraper)
+
+    def close(self) -> None:
+        """Quit all idle sessions. Leased sessions are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        close_scrapers(pooled.scraper for pooled in idle)
+        logger.info("Scraper pool has been closed")
+
+    def __enter__(self) -> "ScraperPool":
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the pool."""
+        self.close()
+
+    def _is_expired(self, pooled: _PooledScraper) -> bool:
+        if self._max_uses is not None and pooled.uses >= self._max_uses:
+            return True
+        return self._max_age is not None and pooled.age >= self._max_age
+
+    @property
+    def _exhausted(self) -> bool:
+        """Whether no session is running and the last start of a replacement has failed."""
+        return self._start_error is not None and not self._idle and not self._leased
+
+    def _start_session(self) -> None:
+        scraper = self._factory()
+        with self._condition:
+            if not self._closed:
+                self._start_error = None
+                self._idle.append(_PooledScraper(scraper))
+                self._condition.notify()
+                return
+        scraper.close()
+
+    def _discard(self, pooled: _PooledScraper) -> None:
+        """Quit the session and start a replacement in the background."""
+        logger.info("Recycle scraper after %d uses and %.1f seconds", pooled.uses, pooled.age)
+        try:
+            pooled.scraper.close()
+        except Exception:  # noqa: BLE001 - the replacement is started anyway
+            logger.exception("Failed to close scraper")
+        if not self._closed:
+            threading.Thread(target=self._replace_session, daemon=True).start()
+
+    def _replace_session(self) -> None:
+        """Start a replacement session, retrying with a growing delay until it starts or the pool is closed."""
+        delay = REPLACEMENT_BACKOFF
+        while True:
+            try:
+                self._start_session()
+            except Exception as error:  # noqa: BLE001, PERF203 - the pool must not shrink for good
+                logger.exception("Failed to start a replacement scraper, retry in %.1f seconds", delay)
+                with self._condition:
+                    self._start_error = error
+                    # Wake the waiters, so that they fail if no session is left
+                    self._condition.notify_all()
+                    if self._condition.wait_for(lambda: self._closed, delay):
+                        return
+                delay = min(delay * 2, MAX_REPLACEMENT_BACKOFF)
+            else:
+                return
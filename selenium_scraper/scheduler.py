@@ -0,0 +1,222 @@
+import contextlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import NamedTuple
+from urllib import parse
+
+from .logger import logger
+from .metrics import Sample, registry
+from .scraper import CommonScraper
+
+ErrorPageCheck = Callable[[CommonScraper], bool]
+
+# Weight of the latest page load in the latency moving average
+LATENCY_SMOOTHING = 0.2
+# Relative growth of the baseline latency per page load, so that a baseline measured once
+# on an idle site does not keep the concurrency low forever
+BASELINE_DRIFT = 0.01
+# Latency growth above the baseline (seconds) considered noise rather than overload
+LATENCY_NOISE = 0.05
+
+
+class TokenBucket:
+    """Thread-safe token bucket: on average `rate` acquisitions per second, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """Initialize a full TokenBucket.
+
+        :param rate: tokens added per second
+        :param burst: capacity of the bucket
+        """
+        self.rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, possibly in advance.
+
+        :return: time to wait before the token may be used (seconds)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+    def acquire(self) -> None:
+        """Wait for a token and take it."""
+        time.sleep(self.reserve())
+
+
+class HostStats(NamedTuple):
+    """Current state of a host in `HostScheduler`."""
+    concurrency: int
+    in_flight: int
+    latency: float | None
+    baseline_latency: float | None
+    failures: int
+
+
+@dataclass
+class _HostState:
+    limit: float
+    bucket: TokenBucket | None
+    in_flight: int = 0
+    latency: float | None = None
+    baseline_latency: float | None = None
+    failures: int = 0
+    decreased_at: float = 0.0
+
+
+class Slot:
+    """Permission to load one page of a host, see `HostScheduler.slot`."""
+
+    def __init__(self, host: str):
+        """Initialize Slot."""
+        self.host = host
+        self.failed = False
+        self.loaded_at: float | None = None
+
+    def fail(self) -> None:
+        """Report that the host has answered with an error page, e.g. '429 Too Many Requests'."""
+        self.failed = True
+
+    def loaded(self) -> None:
+        """Report that the page has been loaded, the rest of the block is not counted in the latency."""
+        self.loaded_at = time.monotonic()
+
+
+class HostScheduler:
+    """Per-host limits of the page loads shared by browser sessions, e.g. of a `Crawler`.
+
+    Every host has a token bucket (`rate` page loads per second) and a concurrency limit adjusted AIMD-style,
+    like the TCP congestion window: the limit grows by about one after each `limit` successful page loads
+    and is multiplied by `backoff` when a page load fails (timeout, WebDriver error, error page)
+    or the average page load latency exceeds `latency_tolerance` times the baseline (the lowest latency seen).
+    So the sessions load pages of every host as fast as it answers without slowing down.
+
+    Example:
+        scheduler = HostScheduler(rate=5, max_concurrency=4,
+                                  is_error_page=lambda scraper: 'Too Many Requests' in scraper.driver.title)
+        crawler = Crawler(pool, handler, scheduler=scheduler)
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 *,
+                 rate: float | None = None,
+                 burst: float = 1.0,
+                 initial_concurrency: int = 1,
+                 max_concurrency: int = 8,
+                 latency_tolerance: float = 2.0,
+                 backoff: float = 0.5,
+                 is_error_page: ErrorPageCheck | None = None):
+        """Initialize HostScheduler.
+
+        :param rate: max page loads per second of every host. If None, unlimited
+        :param burst: max page loads of a host at once when it has been idle, see `TokenBucket`
+        :param initial_concurrency: concurrency limit of a new host
+        :param max_concurrency: max number of pages of a host loaded at the same time
+        :param latency_tolerance: average latency relative to the baseline considered as overload of the host
+        :param backoff: factor of the concurrency limit after a failure or overload, from 0 to 1
+        :param is_error_page: function (scraper) -> bool detecting an error page (e.g. by the title or content)
+            after the page has been loaded; error pages are failures
+        """
+        if not 0 < backoff < 1:
+            msg = f"Backoff must be between 0 and 1, got {backoff}"
+            raise ValueError(msg)
+        self._rate = rate
+        self._burst = burst
+        self._initial_concurrency = initial_concurrency
+        self._max_concurrency = max_concurrency
+        self._latency_tolerance = latency_tolerance
+        self._backoff = backoff
+        self._is_error_page = is_error_page
+
+        self._condition = threading.Condition()
+        self._hosts: dict[str, _HostState] = {}
+
+    @contextlib.contextmanager
+    def slot(self, url: str) -> Iterator[Slot]:
+        """Wait until the host of the URL may be loaded, time the page load inside the block.
+
+        An exception raised in the block is a failure, call `Slot.fail` for an error page.
+        If the block goes on after the page load (e.g. to check the page), call `Slot.loaded` to stop the timing.
+
+        :param url: string of absolute URL
+        """
+        host = parse.urlsplit(url).hostname or ""
+        with self._condition:
+            state = self._hosts.get(host)
+            if state is None:
+                bucket = TokenBucket(self._rate, self._burst) if self._rate else None
+                state = self._hosts[host] = _HostState(self._initial_concurrency, bucket)
+            self._condition.wait_for(lambda: state.in_flight < int(state.limit))
+            state.in_flight += 1
+
+        slot = Slot(host)
+        start_time = time.monotonic()
+        try:
+            if state.bucket is not None:
+                state.bucket.acquire()
+                start_time = time.monotonic()
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            self._release(state, slot, start_time)
+
+    def get(self, scraper: CommonScraper, url: str, timeout: float = 5.0) -> None:
+        """Load the page with `CommonScraper.get` within the limits of its host.
+
+        :param scraper: browser session
+        :param url: string of absolute URL
+        :param timeout: page load timeout (seconds)
+        """
+        with self.slot(url) as slot:
+            scraper.get(url, timeout=timeout)
+            slot.loaded()
+            if self._is_error_page is not None and self._is_error_page(scraper):
+                logger.warning("Error page at %s", url)
+                slot.fail()
+
+    def stats(self) -> dict[str, HostStats]:
+        """Current state of the hosts seen."""
+        with self._condition:
+            return {host: HostStats(int(state.limit), state.in_flight, state.latency, state.baseline_latency,
+                                    state.failures)
+                    for host, state in self._hosts.items()}
+
+    def _release(self, state: _HostState, slot: Slot, start_time: float) -> None:
+        end_time = time.monotonic() if slot.loaded_at is None else slot.loaded_at
+        with self._condition:
+            state.in_flight -= 1
+            if not slot.failed:
+                latency = end_time - start_time
+                state.latency = latency if state.latency is None else (
+                    LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * state.latency)
+                state.baseline_latency = latency if state.baseline_latency is None else (
+                    min(latency, state.baseline_latency * (1 + BASELINE_DRIFT)))
+            overloaded = (state.latency is not None and state.baseline_latency is not None
+                          and state.latency > max(self._latency_tolerance * state.baseline_latency,
+                                                  state.baseline_latency + LATENCY_NOISE))
+
+            if slot.failed or overloaded:
+                state.failures += slot.failed
+                # Page loads started before the last decrease have seen the same overload, it is not counted twice
+                if start_time >= state.decreased_at:
+                    state.limit = max(state.limit * self._backoff, 1.0)
+                    state.decreased_at = end_time
+                    logger.info("Concurrency of %s is decreased to %d", slot.host, int(state.limit))
+            else:
+                state.limit = min(state.limit + 1 / state.limit, float(self._max_concurrency))
+            limit = state.limit
+            self._condition.notify_all()
+
+        if registry.enabled:
+            registry.record_sample(Sample("host_concurrency", limit, (("host", slot.host),)))
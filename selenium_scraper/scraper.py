@@ -1,28 +1,120 @@
+import atexit
+import contextlib
+import json
+import shutil
+import threading
+import time
+import timeit
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
 
 import psutil
-from bs4 import BeautifulSoup
+import urllib3
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, UnexpectedAlertPresentException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.options import ArgOptions as Options
 from selenium.webdriver.common.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 
+from .extraction import ExtractionSchema, Schema
 from .helpers.urls import PageLinks, update_url_params
 from .logger import logger
-from .mapping import ScrollMethods
+from .mapping import LinkExtractionMethods, ScrollMethods, WaitMethods
+from .metrics import Labels, registry
+from .scripts import (
+    JS_CAPTURE_RESPONSES,
+    JS_EXTRACT,
+    JS_GET_ALL_LINKS,
+    JS_GET_NEW_ELEMENTS,
+    JS_GET_PAGE_FRAGMENT,
+    JS_PAGE_STATE,
+    JS_TAKE_CAPTURED_RESPONSES,
+    JS_WAIT_FOR_CHANGES,
+    JS_WATCH_CHANGES,
+)
+from .watchdog import BrowserWatchdog
+
+if TYPE_CHECKING:
+    from .snapshots import SnapshotStore
 
 # Unfortunately, selenium does not have a base class containing .service and .options attributes
 SupportedSeleniumWebDriverTypes = (type[webdriver.Chrome] | type[webdriver.Firefox] | type[webdriver.Edge] |
                               type[webdriver.Ie] | type[webdriver.Safari])
 SupportedSeleniumWebDriver = (webdriver.Chrome | webdriver.Firefox | webdriver.Edge | webdriver.Ie | webdriver.Safari)
+ScraperT = TypeVar("ScraperT", bound="BaseScraper")
+# Default time (seconds) to wait for the browser to quit gracefully before its processes are killed
+SHUTDOWN_TIMEOUT = 5.0
+
+def get_page_links(page_url: str,
+                   page: BeautifulSoup,
+                   schemes: tuple[str, ...] | None = PageLinks.default_schemes) -> PageLinks:
+    """Get a helpers.urls.PageLinks object with all links of the parsed page.
+
+    :param page_url: Full URL of the page
+    :param page: BeautifulSoup object representing a parsed HTML
+    :param schemes: Schemes tuple by which links will be filtered, see `PageLinks`
+    """
+    page_links = PageLinks(page_url, schemes)
+    page_links.add_links(link["href"] for link in page.find_all("a", href=True))
+    return page_links
+
+
+class PageCacheInfo(NamedTuple):
+    """Statistics of the current page cache."""
+    hits: int
+    misses: int
+
+
+class CapturedResponse(NamedTuple):
+    """Response to a fetch/XMLHttpRequest request of the page, see `CommonScraper.start_capture`."""
+    url: str
+    status: int
+    content_type: str
+    body: str
+
+    def json(self) -> Any:
+        """Body parsed as JSON."""
+        return json.loads(self.body)
+
+
+@dataclass(frozen=True)
+class RecoveryPolicy:
+    """How a scraper recovers from a dead or hung browser session, see `CommonScraper.recovery`.
+
+    :param max_retries: max number of browser restarts for one `get`
+    :param backoff: delay before the first retry (seconds), doubled for every next retry
+    :param max_backoff: max delay before a retry (seconds)
+    :param ping_timeout: time (s) the driver is given to answer the health check, see `CommonScraper.is_healthy`
+    :param restore_cookies: whether to restore the cookies of the last loaded page in the new browser.
+        They are taken after every `get`, which costs a WebDriver command
+    """
+    max_retries: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    ping_timeout: float = 5.0
+    restore_cookies: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """Delay (seconds) before the retry number `attempt`, counted from 0."""
+        return min(self.backoff * 2 ** attempt, self.max_backoff)
 
 
 class BaseScraper(ABC):
     """Abstract scraper."""
+    # True until the browser has been started, so that a scraper failed in `__init__` is not closed
+    _closed = True
+    # Temporary browser profile of the session, deleted when the scraper is closed (see `startup.StartupCache`)
+    _profile_dir: Path | None = None
 
     @property
     @abstractmethod
@@ -46,52 +138,266 @@ class BaseScraper(ABC):
         :param service: service object for handling the browser driver if you need to pass extra details
         :param keep_alive: whether to configure RemoteConnection to use HTTP keep-alive
         """
-        self._driver = self._browser(options=options, service=service, keep_alive=keep_alive) # type: ignore[arg-type]
+        # The arguments are kept to start the browser again in `restart`
+        self._driver_args = {"options": options, "service": service, "keep_alive": keep_alive}
+        try:
+            self._start_driver()
+        except BaseException:
+            self._remove_profile()
+            raise
+        self._closed = False
+        _running_scrapers.add(self)
+
+    def _start_driver(self) -> None:
+        with registry.measure("driver_start") as timer:
+            self._driver = self._browser(**self._driver_args)  # type: ignore[arg-type]
+            # Labels of the metrics measured by this scraper, see `metrics.MetricsRegistry`
+            self._metrics_labels: Labels = (("browser", str(self._driver.capabilities.get("browserName"))),)
+            timer.labels = self._metrics_labels
         logger.info("Start driver. Browser: %s, version: %s",
                     self._driver.capabilities.get("browserName"),
                     self._driver.capabilities.get("browserVersion"))
         self._driver_process = psutil.Process(self._driver.service.process.pid)
+        self._setup_driver()
+
+    def _setup_driver(self) -> None:  # noqa: B027
+        """Configure the started driver, e.g. with browser-specific commands. Override it in subclasses."""
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Quit the browser and kill its remaining processes.
+
+        It is called automatically when the scraper is used as a context manager, is garbage collected
+        or at the interpreter exit (see `close_all_scrapers`). Repeated calls do nothing.
+
+        :param timeout: max time (s) to wait for the browser to quit gracefully, then its processes are killed
+        """
+        if self._closed:
+            return
+        self._closed = True
+        _running_scrapers.discard(self)
+        self._quit_driver(timeout)
+        self._remove_profile()
+
+    def _remove_profile(self) -> None:
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    def __enter__(self: ScraperT) -> ScraperT:
+        """Use the scraper as a context manager."""
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the scraper."""
+        self.close()
 
     def __del__(self) -> None:
-        """Close the driver to save the RAM.
+        """Close the driver to save the RAM."""
+        self.close()
+
+    def _quit_driver(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Quit the driver within `timeout` seconds.
 
-        Selenium has some issues with closing the browser. Here's an attempt to kill
-        all driver processes, but need more debugging with different browsers
+        Selenium has some issues with closing the browser: `quit` may hang or leave browser processes behind.
+        So `quit` is given `timeout` seconds, then all processes of the tree which are still running are killed
+        at once, without waiting for each of them.
         """
         if not self._driver_process.is_running():
             logger.info("Driver has already been closed")
             return
 
         logger.info("Trying to quit driver")
-        process_children = self._driver_process.children()
-        self._driver.quit()
+        with registry.measure("driver_stop", self._metrics_labels):
+            try:
+                process_children = self._driver_process.children(recursive=True)
+            except psutil.Error:
+                process_children = []
 
-        for process in process_children:
-            if process.is_running():
-                process.kill()
-                logger.warning("Kill process %s", process)
+            quit_thread = threading.Thread(target=self._quit_quietly, name="DriverQuit", daemon=True)
+            try:
+                quit_thread.start()
+            except RuntimeError:
+                # New threads cannot be started at the interpreter shutdown
+                self._quit_quietly()
+            else:
+                quit_thread.join(timeout)
+                if quit_thread.is_alive():
+                    logger.warning("Driver has not quit in %.1f seconds", timeout)
+
+            for process in process_children:
+                if process.is_running() and _kill(process):
+                    logger.warning("Kill process %s", process)
+
+            if not self._driver_process.is_running():
+                logger.info("Driver was closed successfully")
+                return
+
+            if _kill(self._driver_process):
+                # Reap the killed driver, so that it does not remain a zombie
+                with contextlib.suppress(psutil.Error):
+                    self._driver_process.wait(timeout=1)
+        logger.warning("Driver was killed")
 
-        if not self._driver_process.is_running():
-            logger.info("Driver was closed successfully")
-            return
+    def _driver_running(self) -> bool:
+        """Whether the driver process is running (exited processes not reaped yet are not running)."""
+        try:
+            return self._driver_process.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    def _quit_quietly(self) -> None:
+        try:
+            self._driver.quit()
+        except Exception:  # noqa: BLE001 - the processes are killed anyway
+            logger.warning("Failed to quit driver", exc_info=True)
 
-        self._driver_process.kill()
-        logger.warning("Driver was killed")
+
+def _kill(process: psutil.Process) -> bool:
+    """Kill the process (SIGKILL is not waited for, so a tree is killed in parallel).
+
+    :return: whether the process was running
+    """
+    try:
+        process.kill()
+    except psutil.NoSuchProcess:
+        return False
+    return True
+
+
+def close_scrapers(scrapers: Iterable[BaseScraper], timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Close the scrapers concurrently, so that closing takes about `timeout` seconds at most in total.
+
+    :param scrapers: scrapers to be closed
+    :param timeout: max time (s) to wait for every browser to quit gracefully, see `BaseScraper.close`
+    """
+    scrapers = list(scrapers)
+    if len(scrapers) == 1:
+        scrapers[0].close(timeout)
+    elif scrapers:
+        with ThreadPoolExecutor(len(scrapers), thread_name_prefix="ScraperClose") as executor:
+            for scraper in scrapers:
+                executor.submit(scraper.close, timeout)
+
+
+def close_all_scrapers(timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """Close all scrapers with a running browser concurrently.
+
+    It is registered with `atexit`, so browsers are not left running when the program exits.
+
+    :param timeout: max time (s) to wait for every browser to quit gracefully, see `BaseScraper.close`
+    """
+    close_scrapers(list(_running_scrapers), timeout)
+
+
+# Scrapers with a running browser, see `close_all_scrapers`
+_running_scrapers: "weakref.WeakSet[BaseScraper]" = weakref.WeakSet()
+atexit.register(close_all_scrapers)
 
 
 class CommonScraper(BaseScraper, ABC):
     """Scraper functionality for all browsers."""
-    def get(self, url: str, params: dict[str, str] | None = None, timeout: float = 5.0) -> None:
+    _page_cache: BeautifulSoup | None = None
+    _page_cache_key: list[str | int] | None = None
+    _page_cache_hits = 0
+    _page_cache_misses = 0
+    # If set, every page loaded with `get` is recorded to the store, see `snapshots.SnapshotStore`
+    snapshot_store: "SnapshotStore | None" = None
+    _watchdog: BrowserWatchdog | None = None
+    # Script recording the responses, see `start_capture`, and the id of its installation for new documents
+    _capture_script: str | None = None
+    _capture_script_id: Any = None
+    _captured: list[CapturedResponse]
+    # If set, a dead or hung browser is restarted and the failed `get` is retried, see `RecoveryPolicy`
+    recovery: RecoveryPolicy | None = None
+    # Page and cookies restored by `recover`, saved after every `get` with `recovery`
+    _recovery_url = "about:blank"
+    _recovery_cookies: tuple[dict[str, Any], ...] = ()
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Stop the watchdog, quit the browser and kill its remaining processes, see `BaseScraper.close`.
+
+        :param timeout: max time (s) to wait for the browser to quit gracefully, then its processes are killed
+        """
+        self.stop_watchdog()
+        super().close(timeout)
+
+    def get(self,
+            url: str,
+            params: dict[str, str] | None = None,
+            timeout: float = 5.0,
+            ready: Callable[[SupportedSeleniumWebDriver], bool] | None = None) -> None:
         """Load a web page in the current browser session.
 
         :param url: string of target URL
         :param params: dict containing query params for url
         :param timeout: timeout (seconds)
+        :param ready: readiness condition of the page (see `selenium_scraper.conditions`),
+            e.g. SelectorPresent('div.results'), JsPredicate('return window.app.loaded') or NetworkIdle().
+            It is polled after the browser has loaded the page according to its page load strategy
+
+        By default, the browser waits for the full 'load' event of the page. With `page_load_strategy` 'eager'
+        or 'none' (see the scraper init) and a `ready` condition, `get` returns as soon as the data you need
+        is on the page, without waiting for images, ads and trackers.
+
+        If the watchdog (see `start_watchdog`) has detected that the browser uses too much memory or CPU,
+        the browser is restarted before loading the page.
+
+        With `recovery` (see `RecoveryPolicy`), a failed page load is checked with `is_healthy`: if the browser
+        has crashed or the driver does not answer, the browser is replaced (see `recover`) and the page load
+        is retried with a growing delay. A hung page load is detected after the command timeout
+        of the WebDriver client (120 seconds by default).
         """
         url = update_url_params(url, params or {})
-        self._driver.set_page_load_timeout(timeout)
-        self._driver.get(url)
+        if self._watchdog is not None and self._watchdog.restart_needed:
+            self.restart(restore_url=False)
+        if self.recovery is not None and not self._driver_running():
+            self.recover()
+
+        attempt = 0
+        while True:
+            try:
+                self._load(url, timeout, ready)
+                break
+            except (WebDriverException, urllib3.exceptions.HTTPError):
+                # A healthy session has failed to load the page itself, e.g. on timeout
+                if (self.recovery is None or attempt >= self.recovery.max_retries
+                        or self.is_healthy(self.recovery.ping_timeout)):
+                    raise
+                delay = self.recovery.delay(attempt)
+                attempt += 1
+                logger.warning("Retry %s in %.1f seconds after the browser restart (%d/%d)",
+                               url, delay, attempt, self.recovery.max_retries)
+                time.sleep(delay)
+                self.recover()
+
+        if self.recovery is not None:
+            self._recovery_url = self._driver.current_url
+            if self.recovery.restore_cookies:
+                self._recovery_cookies = tuple(self.export_cookies())
+
+    def _load(self, url: str, timeout: float, ready: Callable[[SupportedSeleniumWebDriver], bool] | None) -> None:
+        """Load the page, see `get`."""
+        self.clear_page_cache()
+        # The responses recorded in the page are lost with the navigation
+        self._take_captured_responses()
+        with registry.measure("get", self._metrics_labels):
+            start_time = timeit.default_timer()
+            self._driver.set_page_load_timeout(timeout)
+            self._driver.get(url)
+            if ready:
+                remaining_time = max(timeout - (timeit.default_timer() - start_time), 0)
+                WebDriverWait(self._driver, remaining_time, poll_frequency=0.05).until(
+                    ready, f"Page is not ready in {timeout} seconds: {ready!r}",
+                )
         logger.info("Load %s", url)
+        if self._capture_script is not None and self._capture_script_id is None:
+            # The browser cannot install the script before the page scripts, the responses are recorded from now on
+            self._driver.execute_script(self._capture_script)
+        if self.snapshot_store is not None:
+            self.snapshot_store.save(url, self._driver.page_source, self._driver.current_url)
 
     @property
     def driver(self) -> SupportedSeleniumWebDriver:
@@ -102,9 +408,301 @@ class CommonScraper(BaseScraper, ABC):
     def current_page(self) -> BeautifulSoup:
         """Get the source of the current page.
 
+        The parsed page is cached until the page is changed: another page is loaded, the page is scrolled
+        or its DOM is mutated (tracked with a MutationObserver injected into the page).
+        So repeated reads of an unchanged page cost a single script call. The same object is returned
+        for an unchanged page, do not modify it (or copy it with copy.copy before).
+
         :return: BeautifulSoup object representing a parsed HTML
         """
-        return BeautifulSoup(self._driver.page_source, "lxml")
+        with registry.measure("current_page", self._metrics_labels):
+            page_state = self._driver.execute_script(JS_PAGE_STATE)
+            if self._page_cache is not None and page_state == self._page_cache_key:
+                self._page_cache_hits += 1
+                return self._page_cache
+
+            self._page_cache_misses += 1
+            with registry.measure("page_source", self._metrics_labels) as timer:
+                page_source = self._driver.page_source
+                timer.size = len(page_source)
+            with registry.measure("parse", self._metrics_labels) as timer:
+                self._page_cache = BeautifulSoup(page_source, "lxml")
+                timer.size = len(page_source)
+            self._page_cache_key = page_state
+            return self._page_cache
+
+    def get_page_fragment(self, selector: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Get the source of the elements matching the CSS selector.
+
+        Only the outerHTML of the matching elements is transferred from the browser and parsed,
+        so it is much faster than `current_page` when you need a small part of a large page.
+
+        :param selector: CSS selector of the elements, e.g. 'div.results'
+        :param parse_only: parse only the matching parts of the fragment, e.g. SoupStrainer('a')
+        :return: BeautifulSoup object with the matching elements in the page order
+        """
+        fragment = self._driver.execute_script(JS_GET_PAGE_FRAGMENT, selector)
+        return BeautifulSoup(fragment, "lxml", parse_only=parse_only)
+
+    def extract(self, schema: ExtractionSchema | Schema) -> dict[str, Any]:
+        """Extract the fields described by the schema from the current page with one script call.
+
+        Unlike `find_element` per field or parsing `current_page`, it costs one WebDriver round trip
+        however many fields are extracted, and only the values are transferred from the browser.
+
+        :param schema: compiled schema, or field name -> `extraction.Field` or CSS selector of a text field.
+            Compile the schema once with `ExtractionSchema` when it is used for many pages
+        :return: field name -> value (str, None, dict of the nested fields or list of them)
+        """
+        if not isinstance(schema, ExtractionSchema):
+            schema = ExtractionSchema(schema)
+        with registry.measure("extract", self._metrics_labels):
+            return self._driver.execute_script(JS_EXTRACT, schema.payload)
+
+    @property
+    def page_cache_info(self) -> PageCacheInfo:
+        """Hits and misses of the `current_page` cache."""
+        return PageCacheInfo(self._page_cache_hits, self._page_cache_misses)
+
+    def clear_page_cache(self) -> None:
+        """Drop the parsed page cached by `current_page`."""
+        self._page_cache = None
+        self._page_cache_key = None
+
+    @property
+    def full_reset(self) -> bool:
+        """Whether `reset` deletes the cookies of all domains, not only of the current page domain."""
+        return False
+
+    def reset(self) -> None:
+        """Reset the browser session state so that it can be reused for another job.
+
+        Closes all tabs except the first one, clears localStorage and sessionStorage of the current page,
+        deletes cookies and navigates to a blank page. The response capture is stopped, the job settings
+        `snapshot_store` and `recovery` are dropped.
+
+        WebDriver can only delete the cookies of the current page domain: unless `full_reset` is True
+        (the browser scrapers delete the cookies of all domains when they can), the cookies of other domains
+        are kept. Storage of the origins other than the current page is kept by all browsers.
+        """
+        self.snapshot_store = None
+        self.recovery = None
+        handles = self._driver.window_handles
+        for handle in handles[1:]:
+            self._driver.switch_to.window(handle)
+            self._driver.close()
+        self._driver.switch_to.window(handles[0])
+        self.stop_capture()
+
+        self._driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}",
+        )
+        self._driver.delete_all_cookies()
+        self._driver.get("about:blank")
+        logger.info("Session state has been reset")
+
+    def restart(self, *, restore_url: bool = True) -> None:
+        """Restart the browser to release its memory, keeping the cookies and the current page.
+
+        The browser is started again with the same options and service.
+        Firefox can only export the cookies of the current page domain, Chrome keeps the cookies of all domains.
+
+        :param restore_url: whether to load the current page in the new browser
+        """
+        url = self._driver.current_url
+        cookies = self.export_cookies()
+        logger.info("Restart browser with %d cookies", len(cookies))
+        with contextlib.suppress(WebDriverException):
+            self._take_captured_responses()
+        self._replace_driver(url, cookies, restore_url=restore_url)
+
+    def is_healthy(self, timeout: float = 5.0) -> bool:
+        """Check whether the browser session works: the driver process is running and answers a command in time.
+
+        A crashed browser or tab fails the command, a hung driver does not answer within `timeout`.
+
+        :param timeout: max time (s) to wait for the answer of the driver
+        """
+        if not self._driver_running():
+            logger.warning("Driver process has exited")
+            return False
+        answers: list[bool] = []
+        ping_thread = threading.Thread(target=self._ping, args=(answers,), name="DriverPing", daemon=True)
+        ping_thread.start()
+        ping_thread.join(timeout)
+        if ping_thread.is_alive():
+            logger.warning("Driver has not answered in %.1f seconds", timeout)
+            return False
+        return answers == [True]
+
+    def _ping(self, answers: list[bool]) -> None:
+        try:
+            self._driver.execute_script("return 1;")
+        except UnexpectedAlertPresentException:
+            # A dialog of the page blocks the scripts, but the session works
+            answers.append(True)
+        except WebDriverException as error:
+            logger.warning("Driver has failed the health check: %s", error.msg)
+            answers.append(False)
+        except urllib3.exceptions.HTTPError as error:
+            logger.warning("Driver is unreachable: %s", error)
+            answers.append(False)
+        else:
+            answers.append(True)
+
+    def recover(self) -> None:
+        """Replace a dead or hung browser with a new one started with the same options and service.
+
+        Unlike `restart`, nothing is taken from the old browser: with `recovery`, the cookies of the page
+        last loaded with `get` are restored, otherwise the new browser starts with a clean session.
+        The page is not loaded again.
+        """
+        cookies = list(self._recovery_cookies) if self.recovery is not None and self.recovery.restore_cookies else []
+        logger.warning("Recover browser session with %d cookies", len(cookies))
+        with registry.measure("recover", self._metrics_labels):
+            self._replace_driver(self._recovery_url, cookies, restore_url=False)
+
+    def _replace_driver(self, url: str, cookies: list[dict[str, Any]], *, restore_url: bool) -> None:
+        """Quit the browser and start a new one with the cookies (see `import_cookies`)."""
+        self._quit_driver()
+        self._start_driver()
+        self.clear_page_cache()
+        if self._watchdog is not None:
+            self._watchdog.watch(self._driver_process)
+        self._install_capture()
+
+        if url.startswith(("http://", "https://")):
+            self.import_cookies(url, cookies)
+            if restore_url:
+                self._driver.get(url)
+
+    def export_cookies(self) -> list[dict[str, Any]]:
+        """Get the cookies of the browser, e.g. to pass them to another session with `import_cookies`.
+
+        Firefox can only export the cookies of the current page domain, Chrome exports the cookies of all domains.
+
+        :return: cookies in the format of the browser driver
+        """
+        return self._driver.get_cookies()
+
+    def import_cookies(self, url: str, cookies: list[dict[str, Any]]) -> None:
+        """Add the cookies to the browser.
+
+        WebDriver can only add cookies for the domain of the current page, so the page `url` is loaded first.
+
+        :param url: string of a page URL of the cookies domain
+        :param cookies: cookies in WebDriver format or received from `export_cookies`
+        """
+        if not cookies:
+            return
+        self._driver.get(url)
+        for cookie in cookies:
+            try:
+                self._driver.add_cookie(cookie)
+            except WebDriverException as error:  # noqa: PERF203 - e.g. a cookie of another subdomain
+                logger.warning("Failed to restore cookie %s: %s", cookie.get("name"), error.msg)
+
+    def start_watchdog(self,
+                       max_rss: int | None = None,
+                       max_cpu_percent: float | None = None,
+                       interval: float = 5.0) -> BrowserWatchdog:
+        """Start sampling the memory and CPU usage of the browser, so that it is restarted when it uses too much.
+
+        The browser is restarted transparently (see `restart`) at the beginning of the next `get`
+        after a threshold has been crossed. The samples are also passed to the metrics sinks as gauges,
+        see `metrics.Sample`.
+
+        :param max_rss: max total resident set size of the driver and browser processes (bytes). If None, unlimited
+        :param max_cpu_percent: max total CPU usage of the driver and browser processes (percent of one core)
+            during three consecutive samples. If None, unlimited
+        :param interval: sampling interval (seconds)
+        :return: started watchdog
+        """
+        self.stop_watchdog()
+        self._watchdog = BrowserWatchdog(self._driver_process, max_rss, max_cpu_percent, interval,
+                                         labels=self._metrics_labels)
+        self._watchdog.start()
+        return self._watchdog
+
+    def start_capture(self, url_patterns: Iterable[str], max_body_size: int = 10 * 2 ** 20) -> None:
+        """Record the responses to the fetch/XMLHttpRequest requests of the pages with the matching URLs.
+
+        Infinite feeds usually load their items from a JSON API: take the responses with `captured_responses`
+        after `get` and scrolling instead of parsing the rendered items.
+
+        The requests are recorded by a hook of `fetch` and `XMLHttpRequest` in the page. Chrome installs it
+        before the page scripts of every new document (DevTools Protocol), so the requests made during the page load
+        are recorded too. So does Firefox with WebDriver BiDi enabled (`options.enable_bidi = True`),
+        otherwise only the requests made after `get`, e.g. while scrolling, are recorded.
+
+        :param url_patterns: URL patterns of the requests, '*' is a wildcard (e.g. ['*/api/feed?*'])
+        :param max_body_size: responses with longer bodies are skipped (characters)
+        """
+        self.stop_capture()
+        self._capture_script = f"({JS_CAPTURE_RESPONSES})({json.dumps(list(url_patterns))}, {max_body_size});"
+        self._captured = []
+        self._install_capture()
+
+    def captured_responses(self) -> list[CapturedResponse]:
+        """Take the responses recorded since the previous call, see `start_capture`.
+
+        :return: responses in the order they have been received
+        """
+        if self._capture_script is None:
+            return []
+        self._take_captured_responses()
+        responses, self._captured = self._captured, []
+        return responses
+
+    def stop_capture(self) -> None:
+        """Stop recording the responses, drop the responses not taken with `captured_responses`."""
+        if self._capture_script is None:
+            return
+        if self._capture_script_id is not None:
+            self._remove_init_script(self._capture_script_id)
+            self._capture_script_id = None
+        self._driver.execute_script("const capture = window.__seleniumScraperCapture;"
+                                    "if (capture) { capture.regExps = []; capture.responses = []; }")
+        self._capture_script = None
+        self._captured = []
+
+    def _install_capture(self) -> None:
+        if self._capture_script is None:
+            return
+        self._capture_script_id = self._add_init_script(self._capture_script)
+        self._driver.execute_script(self._capture_script)
+
+    def _take_captured_responses(self) -> None:
+        if self._capture_script is None:
+            return
+        self._captured.extend(
+            CapturedResponse(response["url"], response["status"], response["contentType"], response["body"])
+            for response in self._driver.execute_script(JS_TAKE_CAPTURED_RESPONSES)
+        )
+
+    def _add_init_script(self, source: str) -> Any:
+        """Run the script in every new document before the page scripts, if the browser supports it.
+
+        WebDriver BiDi (script.addPreloadScript) is used when the session has been started with it
+        and selenium supports it (4.44 and later).
+
+        :return: id of the script for `_remove_init_script`, None if not supported
+        """
+        if not self._driver.caps.get("webSocketUrl"):
+            return None
+        if not hasattr(getattr(self._driver, "script", None), "add_preload_script"):
+            return None
+        return self._driver.script.add_preload_script(f"() => {{ {source} }}")["script"]
+
+    def _remove_init_script(self, script_id: Any) -> None:
+        """Stop running the script added with `_add_init_script` in new documents."""
+        self._driver.script.remove_preload_script(script=script_id)
+
+    def stop_watchdog(self) -> None:
+        """Stop the watchdog started with `start_watchdog`."""
+        if self._watchdog is not None:
+            self._watchdog.stop()
+            self._watchdog = None
 
     def scroll_down(self, method: str = ScrollMethods.end_key) -> None:
         """Scroll current page down once. This is suitable for static pages.
@@ -126,60 +724,184 @@ class CommonScraper(BaseScraper, ABC):
             Most often 'js_smooth' and 'end_key' should be the same, but in case of some inaccuracies on some pages,
             you can try to replace them.
         """
-        if method == ScrollMethods.js_instant:
-            self._driver.execute_script(
-                'window.scrollTo({left: 0, top: document.body.scrollHeight, behavior: "instant"});',
-            )
-        elif method == ScrollMethods.js_smooth:
-            self._driver.execute_script(
-                'window.scrollTo({left: 0, top: document.body.scrollHeight, behavior: "smooth"});',
-            )
-        elif method == ScrollMethods.end_key:
-            self._driver.find_element(By.TAG_NAME, "html").send_keys(Keys.END)
-        else:
-            msg = "Invalid page scroll method"
-            raise ValueError(msg)
+        with registry.measure("scroll_down", self._metrics_labels):
+            if method == ScrollMethods.js_instant:
+                self._driver.execute_script(
+                    'window.scrollTo({left: 0, top: document.body.scrollHeight, behavior: "instant"});',
+                )
+            elif method == ScrollMethods.js_smooth:
+                self._driver.execute_script(
+                    'window.scrollTo({left: 0, top: document.body.scrollHeight, behavior: "smooth"});',
+                )
+            elif method == ScrollMethods.end_key:
+                self._driver.find_element(By.TAG_NAME, "html").send_keys(Keys.END)
+            else:
+                msg = "Invalid page scroll method"
+                raise ValueError(msg)
+        self.clear_page_cache()
         logger.info("Page has been scrolled down")
 
-    def scroll_infinite_page(self, limit: int = 3, timeout: float = 5, method: str = ScrollMethods.end_key) -> None:
+    def scroll_infinite_page(self,  # noqa: PLR0913
+                             limit: int = 3,
+                             timeout: float = 5,
+                             method: str = ScrollMethods.end_key,
+                             wait_method: str = WaitMethods.mutations,
+                             quiet_period: float = 0.3) -> None:
         """Scroll current page down for `limit` times (for infinite pages).
 
         :param limit: number of scrolls
         :param timeout: max waiting time (s)
         :param method: way to scroll the page
+        :param wait_method: way to wait for new content after each scroll
+        :param quiet_period: (for WaitMethods.mutations) time (s) without changes after which
+            the content is considered loaded
 
         You can specify `limit` > 1 - the number of times the page will be scrolled down.
         If no new content is loaded for more than `timeout` seconds, the loop will end.
         Available scrolling methods can be found in the `BaseScraper.scroll_down` method.
+
+        There are 2 ways to wait for new content (`wait_method`):
+
+        - WaitMethods.mutations: a MutationObserver and a counter of pending fetch/XMLHttpRequest requests
+            are injected into the page. Each scroll ends as soon as the page has changed and then has been quiet
+            (no DOM mutations and no pending requests) for `quiet_period` seconds.
+            Pros: No polling, the content is detected even if the page height does not change.
+            Cons: Any change of the page (e.g. a ticking clock) is considered new content.
+
+        - WaitMethods.scroll_height: the page height is polled until it grows.
+        """
+        with registry.measure("scroll_infinite_page", self._metrics_labels) as timer:
+            scrolls = 0
+            while limit:
+                limit -= 1
+                scrolls += 1
+                if not self._scroll_and_wait(method, timeout, wait_method, quiet_period):
+                    break
+            timer.size = scrolls
+        self.clear_page_cache()
+
+    def iter_infinite_page(self,  # noqa: PLR0913
+                           selector: str,
+                           limit: int | None = None,
+                           timeout: float = 5,
+                           method: str = ScrollMethods.end_key,
+                           wait_method: str = WaitMethods.mutations,
+                           quiet_period: float = 0.3,
+                           *,
+                           prune: bool = False) -> Iterator[BeautifulSoup]:
+        """Scroll current page down and yield the new elements matching the CSS selector (for infinite pages).
+
+        :param selector: CSS selector of the items, e.g. 'div.post'
+        :param limit: max number of scrolls. If None, scroll until no new content is loaded
+        :param timeout: max waiting time (s) for new content after each scroll
+        :param method: way to scroll the page, see `scroll_down`
+        :param wait_method: way to wait for new content after each scroll, see `scroll_infinite_page`
+        :param quiet_period: (for WaitMethods.mutations) time (s) without changes after which
+            the content is considered loaded
+        :param prune: remove the yielded elements from the page, so that memory usage does not grow while scrolling.
+            Note that some pages may break when their elements are removed
+        :return: iterator of BeautifulSoup objects, one per element, in the page order
+
+        Only the elements appended since the previous scroll are transferred from the browser and parsed,
+        so it is much cheaper than parsing the whole page after `scroll_infinite_page`.
+        """
+        while True:
+            elements, last_height = self._driver.execute_script(JS_GET_NEW_ELEMENTS, selector, prune)
+            logger.info("%d new elements found", len(elements))
+            for element in elements:
+                yield BeautifulSoup(element, "lxml")
+
+            if limit is not None:
+                if not limit:
+                    break
+                limit -= 1
+            if not self._scroll_and_wait(method, timeout, wait_method, quiet_period, last_height):
+                break
+        self.clear_page_cache()
+
+    def _scroll_and_wait(self,  # noqa: PLR0913
+                         method: str,
+                         timeout: float,
+                         wait_method: str,
+                         quiet_period: float,
+                         last_height: int | None = None) -> bool:
+        """Scroll current page down once and wait for new content.
+
+        :param last_height: (for WaitMethods.scroll_height) page height before the scroll, if already known
+        :return: whether new content has been loaded in `timeout` seconds
         """
-        while limit:
-            last_height = self._driver.execute_script("return document.body.scrollHeight")
+        if wait_method == WaitMethods.mutations:
+            self._driver.execute_script(JS_WATCH_CHANGES)
             self.scroll_down(method)
-            limit -= 1
+            # The script itself waits for `timeout`, the driver must not interrupt it earlier.
+            # The script timeout of the session is raised for this call only
+            script_timeout = self._driver.timeouts.script
+            if script_timeout < timeout + 1:
+                self._driver.set_script_timeout(timeout + 1)
             try:
-                wait = WebDriverWait(self._driver, timeout)
-                js_wait_condition = f"return document.body.scrollHeight > {last_height}"
-                wait.until(
-                    partial(
-                        lambda driver, wait_condition: driver.execute_script(wait_condition),
-                        wait_condition=js_wait_condition,
-                    ),
-                )
-            except TimeoutException:
-                logger.warning("New content has not been loaded in %f seconds", timeout)
-                break
+                loaded = self._driver.execute_async_script(JS_WAIT_FOR_CHANGES, quiet_period * 1000, timeout * 1000)
+            finally:
+                if script_timeout < timeout + 1:
+                    self._driver.set_script_timeout(script_timeout)
+        elif wait_method == WaitMethods.scroll_height:
+            if last_height is None:
+                last_height = self._driver.execute_script("return document.body.scrollHeight")
+            self.scroll_down(method)
+            loaded = self._wait_for_new_height(last_height, timeout)
+        else:
+            msg = "Invalid wait method"
+            raise ValueError(msg)
+
+        if not loaded:
+            logger.warning("New content has not been loaded in %f seconds", timeout)
+        return loaded
+
+    def _wait_for_new_height(self, last_height: int, timeout: float) -> bool:
+        """Wait until the page height becomes greater than `last_height`.
 
-    def get_all_links(self, schemes: tuple[str, ...] | None = PageLinks.default_schemes) -> PageLinks:
+        :return: whether the page height has grown in `timeout` seconds
+        """
+        try:
+            wait = WebDriverWait(self._driver, timeout)
+            js_wait_condition = f"return document.body.scrollHeight > {last_height}"
+            wait.until(
+                partial(
+                    lambda driver, wait_condition: driver.execute_script(wait_condition),
+                    wait_condition=js_wait_condition,
+                ),
+            )
+        except TimeoutException:
+            return False
+        return True
+
+    def get_all_links(self,
+                      schemes: tuple[str, ...] | None = PageLinks.default_schemes,
+                      method: str = LinkExtractionMethods.js) -> PageLinks:
         """Get a helpers.urls.PageLinks object with all links on the current page.
 
         :param schemes: Schemes tuple by which links will be filtered.
             If None, all links will be left. If specified, links with different schemes will be excluded
             (e.g. ('ftp', 'http', 'https', 'ws', 'wss', 'git', 'git+ssh')). Default: ('http', 'https')
-        """
-        current_page_links = PageLinks(self._driver.current_url, schemes)
+        :param method: way to collect the links
+
+        There are 2 ways to collect the links (`method`):
 
-        for link in self.current_page.find_all("a"):
-            raw_link = link.get("href")
-            current_page_links.add_link(raw_link)
+        - LinkExtractionMethods.js: links are collected in the browser with a single script call
+            and are already resolved to absolute URLs by the browser.
+            Pros: Highest speed, only the links are transferred from the browser.
 
+        - LinkExtractionMethods.soup: the whole page source is parsed with BeautifulSoup (see `current_page`).
+            Slower on large pages, but works with any page source.
+        """
+        with registry.measure("get_all_links", self._metrics_labels) as timer:
+            if method == LinkExtractionMethods.js:
+                page_url, raw_links = self._driver.execute_script(JS_GET_ALL_LINKS)
+                current_page_links = PageLinks(page_url, schemes)
+                current_page_links.add_links(raw_links)
+            elif method == LinkExtractionMethods.soup:
+                current_page_links = get_page_links(self._driver.current_url, self.current_page, schemes)
+            else:
+                msg = "Invalid link extraction method"
+                raise ValueError(msg)
+            timer.size = len(current_page_links.internal) + len(current_page_links.external)
         return current_page_links
@@ -0,0 +1,254 @@
+# Absolute URLs of all <a href> on the page except links to the same document ('', '#anchor')
+JS_GET_ALL_LINKS = """
+const links = [];
+for (const link of document.querySelectorAll("a[href]")) {
+    const rawLink = link.getAttribute("href").trim();
+    if (rawLink && !rawLink.startsWith("#") && typeof link.href === "string") {
+        links.push(link.href);
+    }
+}
+return [document.URL, links];
+"""
+
+# Identity of the current document and the number of its mutations. The token changes with every new document
+JS_PAGE_STATE = """
+let state = window.__seleniumScraperPage;
+if (!state) {
+    state = window.__seleniumScraperPage = {token: Math.random().toString(36).slice(2), mutations: 0};
+    new MutationObserver((records) => { state.mutations += records.length; }).observe(
+        document, {childList: true, subtree: true, attributes: true, characterData: true},
+    );
+}
+return [state.token, state.mutations];
+"""
+
+# outerHTML of the elements matching the CSS selector, except the elements nested in other matching elements
+JS_GET_PAGE_FRAGMENT = """
+const selector = arguments[0];
+const fragments = [];
+for (const element of document.querySelectorAll(selector)) {
+    if (!element.parentElement || !element.parentElement.closest(selector)) {
+        fragments.push(element.outerHTML);
+    }
+}
+return fragments.join("");
+"""
+
+# outerHTML of the elements matching the CSS selector which have not been returned before and the page height.
+# With `prune`, the returned elements are removed from the page, except the last one that keeps the scroll position
+JS_GET_NEW_ELEMENTS = """
+const [selector, prune] = arguments;
+const seenAttribute = "data-selenium-scraper-seen";
+if (prune) {
+    const seenElements = document.querySelectorAll(`[${seenAttribute}]`);
+    for (let i = 0; i < seenElements.length - 1; i++) {
+        seenElements[i].remove();
+    }
+}
+const elements = [];
+for (const element of document.querySelectorAll(selector)) {
+    if (!element.hasAttribute(seenAttribute)) {
+        elements.push(element.outerHTML);
+        element.setAttribute(seenAttribute, "");
+    }
+}
+return [elements, document.body.scrollHeight];
+"""
+
+# Start tracking changes of the page: DOM mutations and pending fetch/XMLHttpRequest requests.
+# Tracking is installed once per document, every call resets the mutation counter
+JS_WATCH_CHANGES = """
+let changes = window.__seleniumScraperChanges;
+if (!changes) {
+    changes = window.__seleniumScraperChanges = {mutations: 0, pendingRequests: 0, lastChange: 0};
+    const onChange = () => { changes.lastChange = performance.now(); };
+    new MutationObserver((records) => {
+        changes.mutations += records.length;
+        onChange();
+    }).observe(document, {childList: true, subtree: true, characterData: true});
+
+    const originalFetch = window.fetch;
+    window.fetch = function (...args) {
+        changes.pendingRequests++;
+        return originalFetch.apply(this, args).finally(() => {
+            changes.pendingRequests--;
+            onChange();
+        });
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        changes.pendingRequests++;
+        this.addEventListener("loadend", () => {
+            changes.pendingRequests--;
+            onChange();
+        }, {once: true});
+        return originalSend.apply(this, args);
+    };
+}
+changes.mutations = 0;
+changes.lastChange = performance.now();
+"""
+
+# Asynchronous script: wait until the page has changed and then has been quiet (no DOM mutations and no pending
+# requests) for `quietPeriod` ms. Returns false if it has not happened in `timeout` ms
+JS_WAIT_FOR_CHANGES = """
+const [quietPeriod, timeout, callback] = arguments;
+const changes = window.__seleniumScraperChanges;
+const start = performance.now();
+if (!changes) {
+    // Another document has been loaded
+    return callback(true);
+}
+(function check() {
+    const now = performance.now();
+    if (changes.mutations && !changes.pendingRequests && now - changes.lastChange >= quietPeriod) {
+        callback(true);
+    } else if (now - start >= timeout) {
+        callback(false);
+    } else {
+        setTimeout(check, Math.min(50, quietPeriod));
+    }
+})();
+"""
+
+# Whether the document has been parsed and no resource (including fetch/XMLHttpRequest tracked by JS_WATCH_CHANGES)
+# has finished loading for `quietPeriod` ms
+JS_NETWORK_IDLE = """
+const quietPeriod = arguments[0];
+if (document.readyState === "loading") {
+    return false;
+}
+const changes = window.__seleniumScraperChanges;
+if (changes && changes.pendingRequests) {
+    return false;
+}
+const [navigation] = performance.getEntriesByType("navigation");
+let lastActivity = navigation ? navigation.domContentLoadedEventEnd : 0;
+for (const entry of performance.getEntriesByType("resource")) {
+    lastActivity = Math.max(lastActivity, entry.responseEnd);
+}
+return performance.now() - lastActivity >= quietPeriod;
+"""
+
+# Fields of the page described by `ExtractionSchema.payload`: {name: value}, see `extraction.Field`
+JS_EXTRACT = """
+const [schema] = arguments;
+const urlAttributes = ["href", "src"];
+const select = (root, field) => {
+    if (field.xpath) {
+        const result = document.evaluate(field.selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const count = field.many ? result.snapshotLength : Math.min(result.snapshotLength, 1);
+        return Array.from({length: count}, (_, i) => result.snapshotItem(i));
+    }
+    if (field.many) {
+        return Array.from(root.querySelectorAll(field.selector));
+    }
+    const element = root.querySelector(field.selector);
+    return element ? [element] : [];
+};
+const value = (node, field) => {
+    if (field.fields) {
+        return extract(node, field.fields);
+    }
+    if (node.nodeType !== Node.ELEMENT_NODE || field.attribute === "text") {
+        // XPath may select attribute and text nodes
+        return node.textContent.trim();
+    }
+    if (field.attribute === "html") {
+        return node.innerHTML;
+    }
+    const attribute = node.getAttribute(field.attribute);
+    if (attribute !== null && urlAttributes.includes(field.attribute)) {
+        try {
+            return new URL(attribute.trim(), document.baseURI).href;
+        } catch (error) {
+            return attribute;
+        }
+    }
+    return attribute;
+};
+const extract = (root, fields) => {
+    const result = {};
+    for (const field of fields) {
+        const nodes = select(root, field);
+        if (field.many) {
+            result[field.name] = nodes.map((node) => value(node, field));
+        } else {
+            result[field.name] = nodes.length ? value(nodes[0], field) : null;
+        }
+    }
+    return result;
+};
+return extract(document, schema);
+"""
+
+# Function (patterns, maxBodySize) recording the bodies of the fetch/XMLHttpRequest responses with the URLs
+# matching the patterns ('*' is a wildcard). It is installed once per document, repeated calls update the patterns
+JS_CAPTURE_RESPONSES = """
+function (patterns, maxBodySize) {
+    const toRegExp = (pattern) => new RegExp(
+        "^" + pattern.split("*").map((part) => part.replace(/[.+?^${}()|[\\]\\\\]/g, "\\\\$&")).join(".*") + "$",
+    );
+    let capture = window.__seleniumScraperCapture;
+    if (!capture) {
+        capture = window.__seleniumScraperCapture = {regExps: [], maxBodySize: 0, responses: []};
+        const matches = (url) => capture.regExps.some((regExp) => regExp.test(url));
+        const record = (url, status, contentType, body) => {
+            if (body.length <= capture.maxBodySize) {
+                capture.responses.push({url, status, contentType: contentType || "", body});
+            }
+        };
+
+        const originalFetch = window.fetch;
+        window.fetch = function (...args) {
+            const promise = originalFetch.apply(this, args);
+            promise.then((response) => {
+                if (matches(response.url)) {
+                    response.clone().text().then(
+                        (body) => record(response.url, response.status, response.headers.get("content-type"), body),
+                        () => {},
+                    );
+                }
+            }, () => {});
+            return promise;
+        };
+        const originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function (...args) {
+            this.addEventListener("load", () => {
+                if (!matches(this.responseURL)) {
+                    return;
+                }
+                let body = null;
+                if (this.responseType === "" || this.responseType === "text") {
+                    body = this.responseText;
+                } else if (this.responseType === "json") {
+                    body = JSON.stringify(this.response);
+                }
+                if (body !== null) {
+                    record(this.responseURL, this.status, this.getResponseHeader("content-type"), body);
+                }
+            });
+            return originalSend.apply(this, args);
+        };
+    }
+    capture.regExps = patterns.map(toRegExp);
+    capture.maxBodySize = maxBodySize;
+}
+"""
+
+# Responses recorded by JS_CAPTURE_RESPONSES since the previous call
+JS_TAKE_CAPTURED_RESPONSES = """
+const capture = window.__seleniumScraperCapture;
+if (!capture) {
+    return [];
+}
+const responses = capture.responses;
+capture.responses = [];
+return responses;
+"""
+
+# Mark the current document before a navigation, so that its readiness is not mistaken for the new page's
+JS_MARK_NAVIGATION = "window.__seleniumScraperNavigating = true;"
+
+# document.readyState of the new document of the tab, null while the old document is still there
+JS_TAB_READY_STATE = "return window.__seleniumScraperNavigating ? null : document.readyState;"
@@ -0,0 +1,414 @@
+import contextlib
+import multiprocessing
+import pickle
+import queue
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+from urllib import parse
+
+from .crawler import CrawlResult, PageHandler, crawl_page, next_links
+from .helpers.url_sets import url_hash
+from .helpers.urls import canonicalize_url
+from .logger import logger
+from .scheduler import HostScheduler
+from .scraper import CommonScraper
+
+# States of the URLs in the frontier database
+_QUEUED, _IN_PROGRESS, _DONE = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    shard INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS urls_queue ON urls (shard, state, depth, id);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+class ShardedFrontier:
+    """Persistent queue of URLs to be crawled, shared by processes through a SQLite database.
+
+    URLs are partitioned into `shards` by the hash of the host, every shard must be crawled by one worker
+    (see `crawl_shards`), so that all pages of a host are loaded by the same browser session.
+    Like `Frontier`, URLs are canonicalized, queued only once and given out breadth-first within a shard.
+
+    The crawl state is kept in the database: an interrupted crawl continues from where it stopped.
+    The object can be passed to other processes, every process opens its own connection.
+    """
+
+    def __init__(self,
+                 path: str | Path,
+                 shards: int = 1,
+                 max_depth: int | None = None,
+                 max_pages: int | None = None):
+        """Initialize ShardedFrontier, create the database if it does not exist.
+
+        :param path: path to the database file. Use a local disk: SQLite locking is unreliable on network filesystems
+        :param shards: number of shards; must be the same for all processes using the database
+        :param max_depth: URLs deeper than `max_depth` links from the start URLs are not queued. If None, unlimited
+        :param max_pages: max number of URLs given out by `pop` in all processes. If None, unlimited
+        """
+        self._path = Path(path)
+        self._shards = shards
+        self._max_depth = max_depth
+        self._max_pages = max_pages
+        self._connection: sqlite3.Connection | None = None
+
+        with self._transaction() as connection:
+            connection.execute("INSERT OR IGNORE INTO meta VALUES ('shards', ?)", (shards,))
+            stored_shards = connection.execute("SELECT value FROM meta WHERE name = 'shards'").fetchone()[0]
+        if stored_shards != shards:
+            msg = f"Database {self._path} has {stored_shards} shards, not {shards}"
+            raise ValueError(msg)
+
+    @property
+    def shards(self) -> int:
+        """Number of shards."""
+        return self._shards
+
+    @property
+    def popped(self) -> int:
+        """Number of URLs given out by `pop` in all processes."""
+        return self._meta("popped")
+
+    @property
+    def closed(self) -> bool:
+        """Whether the frontier has been closed."""
+        with self._transaction() as connection:
+            return self._is_closed(connection)
+
+    def shard_of(self, url: str) -> int:
+        """Shard of the URL: the same for all URLs of the host."""
+        return url_hash(parse.urlsplit(url).hostname or "") % self._shards
+
+    def push(self, url: str, depth: int = 0) -> bool:
+        """Add URL to the queue if it has not been seen before.
+
+        :param url: string of absolute URL
+        :param depth: number of links from the start URL
+        :return: whether the URL was queued
+        """
+        return self.push_many([url], depth) == 1
+
+    def push_many(self, urls: Iterable[str], depth: int = 0) -> int:
+        """Add URLs to the queue in one transaction, skip the URLs seen before.
+
+        :param urls: strings of absolute URLs
+        :param depth: number of links from the start URL
+        :return: number of queued URLs
+        """
+        if self._max_depth is not None and depth > self._max_depth:
+            return 0
+        rows = [(url, self.shard_of(url), depth) for url in map(canonicalize_url, urls)]
+        with self._transaction() as connection:
+            return connection.executemany("INSERT OR IGNORE INTO urls (url, shard, depth) VALUES (?, ?, ?)",
+                                          rows).rowcount
+
+    def pop(self, shards: Iterable[int]) -> tuple[str, int] | None:
+        """Take the next URL of the shards without waiting.
+
+        Every URL taken must be marked with `task_done` after its links have been pushed.
+
+        :param shards: shards to take the URL from
+        :return: (url, depth) or None if the shards have no queued URLs or the frontier is exhausted
+        """
+        shard_list = list(shards)
+        placeholders = ", ".join("?" * len(shard_list))
+        query = (f"SELECT id, url, depth FROM urls WHERE shard IN ({placeholders}) AND state = ? "  # noqa: S608
+                 "ORDER BY depth, id LIMIT 1")
+        with self._transaction() as connection:
+            if self._is_closed(connection) or self._is_exhausted(connection):
+                return None
+            row = connection.execute(query, (*shard_list, _QUEUED)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE urls SET state = ? WHERE id = ?", (_IN_PROGRESS, row[0]))
+            connection.execute("INSERT INTO meta VALUES ('popped', 1) "
+                               "ON CONFLICT (name) DO UPDATE SET value = value + 1")
+        return row[1], row[2]
+
+    def task_done(self, url: str) -> None:
+        """Mark the URL taken with `pop` as crawled."""
+        with self._transaction() as connection:
+            connection.execute("UPDATE urls SET state = ? WHERE url = ?", (_DONE, url))
+
+    def release(self, shards: Iterable[int]) -> int:
+        """Queue again the URLs of the shards taken but not crawled, e.g. by a crashed worker.
+
+        :return: number of released URLs
+        """
+        shard_list = list(shards)
+        placeholders = ", ".join("?" * len(shard_list))
+        query = f"UPDATE urls SET state = ? WHERE shard IN ({placeholders}) AND state = ?"  # noqa: S608
+        with self._transaction() as connection:
+            return connection.execute(query, (_QUEUED, *shard_list, _IN_PROGRESS)).rowcount
+
+    def is_finished(self) -> bool:
+        """Whether no more URLs will be given out: the frontier is closed or exhausted, or all URLs are crawled."""
+        with self._transaction() as connection:
+            pending = connection.execute("SELECT 1 FROM urls WHERE state != ? LIMIT 1", (_DONE,)).fetchone()
+            return self._is_closed(connection) or self._is_exhausted(connection) or pending is None
+
+    def close(self) -> None:
+        """Stop giving out URLs in all processes."""
+        with self._transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('closed', 1)")
+
+    def reopen(self) -> None:
+        """Resume giving out URLs after `close`."""
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM meta WHERE name = 'closed'")
+
+    def __len__(self) -> int:
+        """Number of queued URLs."""
+        with self._transaction() as connection:
+            return connection.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (_QUEUED,)).fetchone()[0]
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle without the connection: it cannot be shared between processes."""
+        return {**self.__dict__, "_connection": None}
+
+    @staticmethod
+    def _is_closed(connection: sqlite3.Connection) -> bool:
+        return connection.execute("SELECT 1 FROM meta WHERE name = 'closed'").fetchone() is not None
+
+    def _is_exhausted(self, connection: sqlite3.Connection) -> bool:
+        if self._max_pages is None:
+            return False
+        popped = connection.execute("SELECT value FROM meta WHERE name = 'popped'").fetchone()
+        return popped is not None and popped[0] >= self._max_pages
+
+    def _meta(self, name: str) -> int:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, timeout=60, isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.executescript(_SCHEMA)
+        # The write lock is taken at once, so that concurrent pops never take the same URL
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+def crawl_shards(frontier: ShardedFrontier,  # noqa: PLR0913
+                 shards: Iterable[int],
+                 scraper: CommonScraper,
+                 handler: PageHandler | None = None,
+                 *,
+                 follow_external: bool = False,
+                 timeout: float = 5.0,
+                 poll_interval: float = 0.5,
+                 scheduler: HostScheduler | None = None) -> Iterator[CrawlResult]:
+    """Crawl the URLs of the shards with one browser session until the frontier is finished.
+
+    The links of the crawled pages are pushed to the frontier, to any shard. While the own shards are empty
+    and other workers are crawling, new URLs are polled every `poll_interval` seconds.
+    Run it on other hosts with the same frontier to scale out, every shard must be crawled by one worker.
+
+    :param frontier: shared frontier
+    :param shards: shards of this worker; their URLs left in progress by a previous worker are queued again
+    :param scraper: browser session
+    :param handler: function (scraper, url) -> data, see `Crawler`
+    :param follow_external: whether to follow links to other sites
+    :param timeout: page load timeout (seconds)
+    :param poll_interval: interval of polling the frontier while the shards are empty (seconds)
+    :param scheduler: per-host limits of the page loads, see `Crawler`
+    :return: iterator of results in the order the pages are crawled
+    """
+    shards = list(shards)
+    released = frontier.release(shards)
+    if released:
+        logger.info("%d URLs of shards %s are queued again", released, shards)
+
+    while True:
+        task = frontier.pop(shards)
+        if task is None:
+            if frontier.is_finished():
+                return
+            time.sleep(poll_interval)
+            continue
+
+        url, depth = task
+        try:
+            result, links = crawl_page(scraper, url, depth, handler, timeout, scheduler)
+            if links is not None:
+                frontier.push_many(next_links(links, follow_external=follow_external), depth + 1)
+        finally:
+            frontier.task_done(url)
+        yield result
+
+
+class ShardedCrawler:
+    """Crawler running the browser sessions in several processes sharing a `ShardedFrontier`.
+
+    Unlike `Crawler`, the sessions are not limited by the GIL of one process: every worker process
+    owns one session and crawls its shards with `crawl_shards`.
+
+    Example:
+        from functools import partial
+        from selenium_scraper import Scraper, ShardedCrawler
+
+        def handler(scraper, url):
+            return scraper.current_page.title.text
+
+        if __name__ == '__main__':
+            crawler = ShardedCrawler(partial(Scraper.chrome, headless=True), handler, database='crawl.db',
+                                     processes=4, max_pages=1000)
+            for result in crawler.crawl(['https://example.com']):
+                print(result.url, result.data)
+
+    `scraper_factory` and `handler` are passed to the worker processes, so they must be picklable:
+    module-level functions, classes or `functools.partial` of them. So must be the handler results.
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 scraper_factory: Callable[[], CommonScraper],
+                 handler: PageHandler | None = None,
+                 *,
+                 database: str | Path,
+                 processes: int = 2,
+                 shards: int | None = None,
+                 max_depth: int | None = None,
+                 max_pages: int | None = None,
+                 follow_external: bool = False,
+                 timeout: float = 5.0,
+                 max_restarts: int = 3,
+                 start_method: str = "spawn",
+                 scheduler_factory: Callable[[], HostScheduler] | None = None):
+        """Initialize ShardedCrawler.
+
+        :param scraper_factory: function creating a browser session, called in every worker process
+        :param handler: function (scraper, url) -> data, called for each loaded page.
+            Its result is returned in `CrawlResult.data`
+        :param database: path to the frontier database, see `ShardedFrontier`.
+            If it exists, the crawl stored in it continues
+        :param processes: number of worker processes (browser sessions)
+        :param shards: number of shards, at least `processes`. If None, equals `processes`
+        :param max_depth: max number of links from the start URLs. If None, unlimited
+        :param max_pages: max number of pages to be loaded. If None, unlimited
+        :param follow_external: whether to follow links to other sites
+        :param timeout: page load timeout (seconds)
+        :param max_restarts: max number of restarts of crashed worker processes, then the crawl is stopped
+        :param start_method: multiprocessing start method. 'spawn' is safe with the threads of the parent process
+        :param scheduler_factory: function creating per-host limits of the page loads in every worker process,
+            e.g. `partial(HostScheduler, rate=2)`. As all URLs of a host are in one shard, the limits of a host
+            are applied by one process
+        """
+        shards = shards or processes
+        if shards < processes:
+            msg = f"Number of shards ({shards}) is less than number of processes ({processes})"
+            raise ValueError(msg)
+        self._scraper_factory = scraper_factory
+        self._handler = handler
+        self._processes = processes
+        self._follow_external = follow_external
+        self._timeout = timeout
+        self._max_restarts = max_restarts
+        self._scheduler_factory = scheduler_factory
+        self._context = multiprocessing.get_context(start_method)
+        self.frontier = ShardedFrontier(database, shards, max_depth, max_pages)
+
+    def crawl(self, start_urls: Iterable[str]) -> Iterator[CrawlResult]:
+        """Crawl the sites starting from `start_urls`.
+
+        :param start_urls: URLs of the pages to start from, skipped if already seen in the database
+        :return: iterator of results in the order they are received from the workers
+        """
+        self.frontier.reopen()
+        self.frontier.push_many(start_urls)
+        results = self._context.Queue()
+        shard_groups = [range(worker_index, self.frontier.shards, self._processes)
+                        for worker_index in range(self._processes)]
+        workers = {worker_index: self._start_worker(shard_groups[worker_index], results)
+                   for worker_index in range(self._processes)}
+        restarts = 0
+
+        try:
+            while workers:
+                try:
+                    item = results.get(timeout=1)
+                except queue.Empty:
+                    item = None
+                if isinstance(item, CrawlResult):
+                    yield item
+                elif isinstance(item, int):
+                    # The worker has finished its shards
+                    workers.pop(item).join()
+
+                for worker_index, worker in list(workers.items()):
+                    if worker.is_alive() or not results.empty():
+                        continue
+                    if restarts >= self._max_restarts:
+                        logger.error("Worker of shards %s has crashed, the crawl is stopped",
+                                     list(shard_groups[worker_index]))
+                        self.frontier.close()
+                        del workers[worker_index]
+                        continue
+                    restarts += 1
+                    logger.warning("Worker of shards %s has crashed (exit code %s), restarting",
+                                   list(shard_groups[worker_index]), worker.exitcode)
+                    workers[worker_index] = self._start_worker(shard_groups[worker_index], results)
+        finally:
+            self.frontier.close()
+            # The queue is drained, otherwise the workers block on putting the results of the last pages
+            while any(worker.is_alive() for worker in workers.values()):
+                with contextlib.suppress(queue.Empty):
+                    results.get(timeout=0.1)
+
+    def _start_worker(self, shards: range, results: "multiprocessing.Queue[CrawlResult | int]") -> BaseProcess:
+        worker = self._context.Process(  # type: ignore[attr-defined]
+            target=_run_worker,
+            args=(self.frontier, shards, self._scraper_factory, self._handler, results),
+            kwargs={"follow_external": self._follow_external, "timeout": self._timeout,
+                    "scheduler_factory": self._scheduler_factory},
+            name=f"ShardedCrawler-{shards.start}",
+            daemon=True,
+        )
+        worker.start()
+        return worker
+
+
+def _run_worker(frontier: ShardedFrontier,  # noqa: PLR0913
+                shards: range,
+                scraper_factory: Callable[[], CommonScraper],
+                handler: PageHandler | None,
+                results: "multiprocessing.Queue[CrawlResult | int]",
+                *,
+                follow_external: bool,
+                timeout: float,
+                scheduler_factory: Callable[[], HostScheduler] | None) -> None:
+    """Worker process of `ShardedCrawler`: puts the results and then the index of the worker to the queue."""
+    scheduler = scheduler_factory() if scheduler_factory is not None else None
+    with scraper_factory() as scraper:
+        for result in crawl_shards(frontier, shards, scraper, handler, follow_external=follow_external,
+                                   timeout=timeout, scheduler=scheduler):
+            results.put(_picklable(result))
+    results.put(shards.start)
+
+
+def _picklable(result: CrawlResult) -> CrawlResult:
+    """Replace the error of the result which cannot be sent to the parent process."""
+    if result.error is not None:
+        try:
+            pickle.dumps(result.error)
+        except Exception:  # noqa: BLE001 - any error of the exception pickling
+            return CrawlResult(result.url, result.depth, result.data, RuntimeError(repr(result.error)))
+    return result
@@ -0,0 +1,196 @@
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from .helpers.urls import canonicalize_url, update_url_params
+from .logger import logger
+from .static import StaticPageScraper
+
+
+class SnapshotNotFoundError(LookupError):
+    """The page has not been recorded in the snapshot store."""
+
+
+class Snapshot(NamedTuple):
+    """Rendered page recorded by `CommonScraper.get`."""
+    url: str
+    final_url: str
+    page_source: str
+    created_at: float
+
+
+class SnapshotStore:
+    """On-disk store of rendered pages.
+
+    Snapshots are gzip-compressed JSON files named by the hash of the canonical URL with params
+    (see `helpers.urls.canonicalize_url`), so the same page requested with differently ordered params
+    is stored once. Files are written atomically, so a store can be shared by several processes.
+
+    Record pages with a browser:
+        store = SnapshotStore('.snapshots', ttl=24 * 3600)
+        scraper = Scraper.chrome(headless=True)
+        scraper.snapshot_store = store
+        scraper.get('https://github.com/nparamonov/SeleniumScraper')
+
+    Replay them without a browser:
+        scraper = Scraper.replay(store)
+        scraper.get('https://github.com/nparamonov/SeleniumScraper')
+        links = scraper.get_all_links()
+    """
+
+    file_suffix = ".json.gz"
+
+    def __init__(self, directory: str | Path, ttl: float | None = None, max_size: int | None = None):
+        """Initialize SnapshotStore.
+
+        :param directory: path to the store directory, created if it does not exist
+        :param ttl: snapshots older than `ttl` seconds are not returned and are evicted. If None, unlimited
+        :param max_size: max total size of the snapshot files (bytes), the least recently used files are evicted
+            when it is exceeded. If None, unlimited
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._files())
+
+    @property
+    def size(self) -> int:
+        """Total size of the snapshot files (bytes)."""
+        return self._size
+
+    @staticmethod
+    def key(url: str, params: dict[str, str] | None = None) -> str:
+        """Key of the snapshot: hash of the canonical URL with params.
+
+        :param url: string of target URL
+        :param params: dict containing query params for url
+        """
+        canonical_url = canonicalize_url(update_url_params(url, params or {}))
+        return hashlib.sha256(canonical_url.encode()).hexdigest()
+
+    def save(self, url: str, page_source: str, final_url: str | None = None) -> Snapshot:
+        """Record the rendered page.
+
+        :param url: requested URL with params
+        :param page_source: rendered source of the page
+        :param final_url: URL of the page after redirects. If None, the same as `url`
+        """
+        snapshot = Snapshot(url, final_url or url, page_source, time.time())
+        path = self._path(self.key(url))
+        path.parent.mkdir(exist_ok=True)
+
+        data = gzip.compress(json.dumps(snapshot._asdict()).encode(), compresslevel=6)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as temp_file:
+            temp_file.write(data)
+        old_size = path.stat().st_size if path.exists() else 0
+        Path(temp_file.name).replace(path)
+        with self._lock:
+            self._size += len(data) - old_size
+        logger.info("Save snapshot of %s (%d bytes)", url, len(data))
+
+        if self._max_size is not None and self._size > self._max_size:
+            self.evict()
+        return snapshot
+
+    def load(self, url: str, params: dict[str, str] | None = None) -> Snapshot | None:
+        """Get the recorded page.
+
+        :param url: string of target URL
+        :param params: dict containing query params for url
+        :return: snapshot or None if the page has not been recorded, has expired or its file is corrupt
+        """
+        path = self._path(self.key(url, params))
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            snapshot = Snapshot(**json.loads(gzip.decompress(data)))
+        except (gzip.BadGzipFile, EOFError, zlib.error, ValueError, TypeError) as error:
+            # E.g. a file truncated by a crash or written by an incompatible version
+            logger.warning("Corrupt snapshot of %s is removed: %r", url, error)
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._size -= len(data)
+            return None
+
+        if self._is_expired(snapshot.created_at):
+            return None
+        # The access time is used for LRU eviction, the modification time remains the creation time.
+        # The file may have been evicted by another process since it has been read
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        return snapshot
+
+    def evict(self) -> None:
+        """Remove expired snapshots and the least recently used ones above `max_size`."""
+        files = sorted(((path, path.stat()) for path in self._files()), key=lambda item: item[1].st_atime)
+        size = sum(stat.st_size for _, stat in files)
+        for path, stat in files:
+            if not self._is_expired(stat.st_mtime) and (self._max_size is None or size <= self._max_size):
+                continue
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+        with self._lock:
+            self._size = size
+        logger.info("Snapshot store size after eviction: %d bytes", size)
+
+    def clear(self) -> None:
+        """Remove all snapshots."""
+        for path in self._files():
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._size = 0
+
+    def __contains__(self, url: str) -> bool:
+        """Whether the page is recorded and has not expired."""
+        return self.load(url) is not None
+
+    def _path(self, key: str) -> Path:
+        return Path(self._directory, key[:2], key + self.file_suffix)
+
+    def _files(self) -> list[Path]:
+        return list(self._directory.glob("*/*" + self.file_suffix))
+
+    def _is_expired(self, timestamp: float) -> bool:
+        return self._ttl is not None and time.time() - timestamp > self._ttl
+
+
+class ReplayScraper(StaticPageScraper):
+    """Scraper serving the pages recorded in the SnapshotStore, without a browser.
+
+    Use it to iterate on parsers and to run regression tests in seconds: `get`, `current_page`,
+    `get_all_links` and `get_page_fragment` behave as in the browser scrapers on the recorded pages.
+    """
+
+    def __init__(self, store: SnapshotStore):
+        """Initialize ReplayScraper.
+
+        :param store: store with recorded pages
+        """
+        super().__init__()
+        self._store = store
+
+    def get(self, url: str, params: dict[str, str] | None = None, *_args: object, **_kwargs: object) -> None:
+        """Load a recorded page. Other arguments of `CommonScraper.get` are accepted and ignored.
+
+        :param url: string of target URL
+        :param params: dict containing query params for url
+        """
+        url = update_url_params(url, params or {})
+        snapshot = self._store.load(url)
+        if snapshot is None:
+            msg = f"Page {url} has not been recorded"
+            raise SnapshotNotFoundError(msg)
+        self._set_page(snapshot.final_url, snapshot.page_source)
+        logger.info("Replay %s", url)
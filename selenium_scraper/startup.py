@@ -0,0 +1,174 @@
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.common.service import Service
+
+from .logger import logger
+
+# Chrome switches disabling the work done at the browser startup which a scraper does not need
+CHROME_STARTUP_ARGUMENTS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--metrics-recording-only",
+)
+# Firefox preferences with the same purpose
+FIREFOX_STARTUP_PREFERENCES: dict[str, str | int | bool] = {
+    "app.update.auto": False,
+    "app.update.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.aboutwelcome.enabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "extensions.update.enabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "browser.safebrowsing.update.enabled": False,
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    "browser.newtabpage.activity-stream.feeds.system.topstories": False,
+}
+# Lock and crash report files of the template which must not be copied to the sessions
+_PROFILE_IGNORE_PATTERNS = ("Singleton*", "lock", ".parentlock", "parent.lock", "Crashpad", "crashes")
+
+ProfileInitializer = Callable[[str, Path], None]
+
+
+def init_chrome_profile(browser_path: str, directory: Path) -> None:
+    """Start Chrome once with the profile, so that its first run initialization is done.
+
+    The browser must exit successfully within 60 seconds, otherwise subprocess.SubprocessError is raised.
+    """
+    subprocess.run([browser_path, "--headless", f"--user-data-dir={directory}", *CHROME_STARTUP_ARGUMENTS,  # noqa: S603
+                    "--dump-dom", "about:blank"],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60, check=True)
+
+
+def init_firefox_profile(browser_path: str, directory: Path) -> None:
+    """Start Firefox once with the profile, so that its first run initialization is done.
+
+    The browser must exit successfully within 60 seconds, otherwise subprocess.SubprocessError is raised.
+    """
+    user_preferences = "".join(f"user_pref({json.dumps(name)}, {json.dumps(value)});\n"
+                               for name, value in FIREFOX_STARTUP_PREFERENCES.items())
+    Path(directory, "user.js").write_text(user_preferences, encoding="utf-8")
+    with tempfile.TemporaryDirectory() as screenshot_directory:
+        subprocess.run([browser_path, "--headless", "--profile", str(directory),  # noqa: S603
+                        "--screenshot", str(Path(screenshot_directory, "blank.png")), "about:blank"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60, check=True)
+
+
+class StartupCache:
+    """Cache of the work done at every browser start.
+
+    - Driver and browser paths: Selenium Manager is not run again to find them, neither in this process
+        nor in other processes using the same cache directory.
+    - Profile template: the browser profile is initialized (first run) once, then every session gets a copy of it.
+
+    Pass the same cache to every scraper:
+        cache = StartupCache()
+        scraper = Scraper.chrome(headless=True, startup_cache=cache)
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        """Initialize StartupCache.
+
+        :param directory: path to the cache directory, created if it does not exist.
+            If None, '~/.cache/selenium_scraper' is used.
+            Delete the directory to reset the cache, e.g. after the browser has been updated
+        """
+        self._directory = Path(directory) if directory else Path.home() / ".cache" / "selenium_scraper"
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._paths_file = self._directory / "paths.json"
+        self._lock = threading.Lock()
+        self._paths: dict[str, dict[str, str]] = {}
+
+    @property
+    def directory(self) -> Path:
+        """Path to the cache directory."""
+        return self._directory
+
+    def resolve_paths(self, service: Service, options: ArgOptions) -> None:
+        """Set the cached driver path to `service` and browser path to `options`, find and cache them if missing.
+
+        The paths given explicitly in `service` and `options` are kept.
+        """
+        key = options.capabilities["browserName"] + ":" + (options.browser_version or "")
+        with self._lock:
+            paths = self._paths.get(key) or self._load_paths().get(key)
+            if paths is None or not all(Path(path).is_file() for path in paths.values() if path):
+                finder = DriverFinder(service, options)
+                paths = {"driver_path": finder.get_driver_path(), "browser_path": finder.get_browser_path()}
+                self._save_paths(key, paths)
+                logger.info("Driver and browser paths are cached: %s", paths)
+            self._paths[key] = paths
+
+        if not service.path:
+            service.path = paths["driver_path"]
+        if not getattr(options, "binary_location", None) and paths["browser_path"]:
+            options.binary_location = paths["browser_path"]  # type: ignore[attr-defined]
+
+    def new_profile(self, name: str, browser_path: str, init_profile: ProfileInitializer) -> Path:
+        """Copy the profile template to a new temporary directory, create the template if missing.
+
+        If the template cannot be initialized, its directory is removed and RuntimeError is raised.
+
+        :param name: name of the template, e.g. 'chrome'
+        :param browser_path: path to the browser executable used to create the template
+        :param init_profile: function (browser_path, directory) initializing a new profile in the directory,
+            raising subprocess.SubprocessError or OSError if it fails
+        :return: path to the profile directory; delete it after the session
+        """
+        template = self._directory / "profiles" / name
+        if not template.is_dir():
+            self._create_template(template, browser_path, init_profile)
+
+        profile = Path(tempfile.mkdtemp(prefix=f"selenium_scraper_{name}_"))
+        shutil.copytree(template, profile, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns(*_PROFILE_IGNORE_PATTERNS))
+        return profile
+
+    @staticmethod
+    def _create_template(template: Path, browser_path: str, init_profile: ProfileInitializer) -> None:
+        template.parent.mkdir(parents=True, exist_ok=True)
+        # The template is created aside and renamed, so that concurrent processes never copy a half-created one
+        new_template = Path(tempfile.mkdtemp(dir=template.parent, prefix=f".{template.name}_"))
+        logger.info("Create profile template %s", template)
+        try:
+            init_profile(browser_path, new_template)
+        except (subprocess.SubprocessError, OSError) as error:
+            # A half-initialized profile would be copied to every session
+            shutil.rmtree(new_template, ignore_errors=True)
+            msg = f"Failed to create profile template {template}"
+            raise RuntimeError(msg) from error
+        try:
+            new_template.rename(template)
+        except OSError:
+            # Another process has created the template first
+            shutil.rmtree(new_template, ignore_errors=True)
+
+    def _load_paths(self) -> dict[str, dict[str, str]]:
+        try:
+            return json.loads(self._paths_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_paths(self, key: str, paths: dict[str, str]) -> None:
+        all_paths = self._load_paths()
+        all_paths[key] = paths
+        with tempfile.NamedTemporaryFile("w", dir=self._directory, delete=False, encoding="utf-8") as paths_file:
+            json.dump(all_paths, paths_file, indent=2)
+        Path(paths_file.name).replace(self._paths_file)
@@ -0,0 +1,83 @@
+from typing import Any
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .extraction import ExtractionSchema, Schema
+from .helpers.urls import PageLinks
+from .mapping import LinkExtractionMethods
+from .scraper import get_page_links
+
+
+class StaticPageScraper:
+    """Read-only scraper interface (`current_page`, `get_all_links`, ...) over an already rendered page source.
+
+    It is used by the scrapers which do not need a browser for the current page, e.g. `ReplayScraper`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scraper without a page."""
+        self._url = "about:blank"
+        self._page_source = "<html><head></head><body></body></html>"
+        self._page: BeautifulSoup | None = None
+
+    def _set_page(self, url: str, page_source: str) -> None:
+        """Replace the current page."""
+        self._url = url
+        self._page_source = page_source
+        self._page = None
+
+    @property
+    def current_url(self) -> str:
+        """URL of the current page (after redirects)."""
+        return self._url
+
+    @property
+    def page_source(self) -> str:
+        """Source of the current page."""
+        return self._page_source
+
+    @property
+    def current_page(self) -> BeautifulSoup:
+        """Get the source of the current page.
+
+        The page is parsed once, the same object is returned on every access. Do not modify it.
+
+        :return: BeautifulSoup object representing a parsed HTML
+        """
+        if self._page is None:
+            self._page = BeautifulSoup(self._page_source, "lxml")
+        return self._page
+
+    def get_page_fragment(self, selector: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        """Get the source of the elements matching the CSS selector, see `CommonScraper.get_page_fragment`.
+
+        :param selector: CSS selector of the elements, e.g. 'div.results'
+        :param parse_only: parse only the matching parts of the fragment, e.g. SoupStrainer('a')
+        :return: BeautifulSoup object with the matching elements in the page order
+        """
+        elements = self.current_page.select(selector)
+        matching = {id(element) for element in elements}
+        fragment = "".join(str(element) for element in elements
+                           if not any(id(parent) in matching for parent in element.parents))
+        return BeautifulSoup(fragment, "lxml", parse_only=parse_only)
+
+    def extract(self, schema: ExtractionSchema | Schema) -> dict[str, Any]:
+        """Extract the fields described by the schema from the current page, see `CommonScraper.extract`.
+
+        :param schema: compiled schema, or field name -> `extraction.Field` or CSS selector of a text field.
+            XPath fields are not supported
+        :return: field name -> value
+        """
+        if not isinstance(schema, ExtractionSchema):
+            schema = ExtractionSchema(schema)
+        return schema.extract_soup(self.current_page, self._url)
+
+    def get_all_links(self,
+                      schemes: tuple[str, ...] | None = PageLinks.default_schemes,
+                      method: str = LinkExtractionMethods.soup) -> PageLinks:  # noqa: ARG002
+        """Get a helpers.urls.PageLinks object with all links on the current page.
+
+        :param schemes: Schemes tuple by which links will be filtered, see `CommonScraper.get_all_links`
+        :param method: ignored, the links are always collected from the page source
+        """
+        return get_page_links(self._url, self.current_page, schemes)
@@ -0,0 +1,219 @@
+import time
+import timeit
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from .logger import logger
+from .metrics import Measurement, registry
+from .scraper import CommonScraper, SupportedSeleniumWebDriver
+from .scripts import JS_MARK_NAVIGATION, JS_TAB_READY_STATE
+
+TabHandler = Callable[[CommonScraper, str], Any]
+
+
+@dataclass(frozen=True)
+class TabResult:
+    """Result of a page loaded in a tab."""
+
+    url: str
+    data: Any = None
+    error: Exception | None = None
+
+
+@dataclass
+class _Tab:
+    handle: str
+    url: str | None = None
+    started_at: float = 0.0
+
+
+class TabMultiplexer:
+    """Several pages loading at once in the tabs of one browser session.
+
+    Every browser session is a process tree taking hundreds of megabytes, while a tab of the same browser
+    takes a fraction of it. The multiplexer opens `tabs` tabs in the session, starts loading a page in every tab
+    and passes the pages to the handler in the order they become ready, then loads the next URLs in the free tabs.
+
+    The navigations only overlap with the page load strategy 'none' (see the scraper init): otherwise the browser
+    returns from every navigation after the page has loaded, and the tabs load one by one.
+    The pages are loaded with the WebDriver navigation, not `CommonScraper.get`: the snapshot store,
+    the response capture and the watchdog restarts do not apply to them.
+
+    Example:
+        def extract_title(scraper, url):
+            return scraper.current_page.title.text
+
+        with Scraper.chrome(headless=True, page_load_strategy='none') as scraper:
+            with TabMultiplexer(scraper, tabs=4) as tabs:
+                for result in tabs.run(urls, extract_title):
+                    print(result.url, result.data)
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 scraper: CommonScraper,
+                 tabs: int = 4,
+                 *,
+                 timeout: float = 5.0,
+                 ready: Callable[[SupportedSeleniumWebDriver], bool] | None = None,
+                 poll_interval: float = 0.05):
+        """Initialize TabMultiplexer. The tabs are opened on the first `run`.
+
+        :param scraper: browser session; its current tab is the first tab
+        :param tabs: number of pages loaded at the same time
+        :param timeout: page load timeout (seconds)
+        :param ready: readiness condition of the page (see `selenium_scraper.conditions`), polled in the new document
+            of the tab. If None, the page is ready after the 'load' event
+        :param poll_interval: pause between the rounds of readiness checks when no page is ready (seconds)
+        """
+        if tabs < 1:
+            msg = "Number of tabs must be at least 1"
+            raise ValueError(msg)
+        self._scraper = scraper
+        self._tabs_count = tabs
+        self._timeout = timeout
+        self._ready = ready
+        self._poll_interval = poll_interval
+        self._tabs: list[_Tab] = []
+
+        page_load_strategy = scraper.driver.caps.get("pageLoadStrategy")
+        if page_load_strategy != "none":
+            logger.warning("Page load strategy is %r, not 'none': the tabs load the pages one by one",
+                           page_load_strategy)
+
+    def run(self, urls: Iterable[str], handler: TabHandler) -> Iterator[TabResult]:
+        """Load the pages in the tabs and pass each ready page to the handler.
+
+        :param urls: URLs of the pages, the iterable is consumed lazily
+        :param handler: function (scraper, url) -> data, called while the scraper is switched to the tab
+            of the ready page (`current_page`, `get_all_links`, `extract` work on it).
+            Its result is returned in `TabResult.data`
+        :return: iterator of results in the order the pages become ready
+        """
+        self._open_tabs()
+        driver = self._scraper.driver
+        # The timeout of the session is restored when the run ends
+        page_load_timeout = driver.timeouts.page_load
+        driver.set_page_load_timeout(self._timeout)
+        urls_iterator = iter(urls)
+        try:
+            while True:
+                for tab in self._tabs:
+                    url = next(urls_iterator, None) if tab.url is None else None
+                    if url is not None and (error := self._start(tab, url)) is not None:
+                        yield TabResult(url, error=error)
+
+                busy_tabs = [(tab, tab.url) for tab in self._tabs if tab.url is not None]
+                if not busy_tabs:
+                    return
+                ready_count = 0
+                for tab, url in busy_tabs:
+                    result = self._poll(tab, url, handler)
+                    if result is not None:
+                        ready_count += 1
+                        yield result
+                if not ready_count:
+                    time.sleep(self._poll_interval)
+        finally:
+            for tab in self._tabs:
+                tab.url = None
+            driver.switch_to.window(self._tabs[0].handle)
+            driver.set_page_load_timeout(page_load_timeout)
+
+    def close(self) -> None:
+        """Close the tabs opened by the multiplexer, the first tab is left open."""
+        if not self._tabs:
+            return
+        driver = self._scraper.driver
+        for tab in self._tabs[1:]:
+            driver.switch_to.window(tab.handle)
+            driver.close()
+        driver.switch_to.window(self._tabs[0].handle)
+        self._tabs = []
+
+    def __enter__(self) -> "TabMultiplexer":
+        """Use the multiplexer as a context manager, the tabs are closed on exit."""
+        return self
+
+    def __exit__(self,
+                 exc_type: type[BaseException] | None,
+                 exc_val: BaseException | None,
+                 exc_tb: TracebackType | None) -> None:
+        """Close the tabs."""
+        self.close()
+
+    def _open_tabs(self) -> None:
+        driver = self._scraper.driver
+        if not self._tabs:
+            self._tabs.append(_Tab(driver.current_window_handle))
+        while len(self._tabs) < self._tabs_count:
+            driver.switch_to.new_window("tab")
+            self._tabs.append(_Tab(driver.current_window_handle))
+        logger.debug("%d tabs are open", len(self._tabs))
+
+    def _start(self, tab: _Tab, url: str) -> Exception | None:
+        """Start loading the page in the tab.
+
+        :return: error if the navigation has failed
+        """
+        driver = self._scraper.driver
+        tab.url, tab.started_at = url, timeit.default_timer()
+        try:
+            driver.switch_to.window(tab.handle)
+            driver.execute_script(JS_MARK_NAVIGATION)
+            driver.get(url)
+        except TimeoutException:
+            # The browser has waited for the page with another page load strategy, it is checked by `_poll`
+            pass
+        except WebDriverException as error:
+            logger.warning("Failed to load %s: %s", url, error.msg)
+            tab.url = None
+            return error
+        return None
+
+    def _poll(self, tab: _Tab, url: str, handler: TabHandler) -> TabResult | None:
+        """Check whether the page of the tab is ready and pass it to the handler.
+
+        :return: result of the page, None if it is not ready yet
+        """
+        driver = self._scraper.driver
+        try:
+            driver.switch_to.window(tab.handle)
+            ready = self._is_ready(driver)
+            elapsed = timeit.default_timer() - tab.started_at
+            if not ready and elapsed < self._timeout:
+                return None
+            tab.url = None
+            self._record(elapsed)
+            if not ready:
+                driver.execute_script("window.stop();")
+                logger.warning("Page %s is not ready in %s seconds", url, self._timeout)
+                return TabResult(url, error=TimeoutException(f"Page is not ready in {self._timeout} seconds"))
+            logger.info("Load %s in tab %s", url, tab.handle)
+            return TabResult(url, handler(self._scraper, url))
+        except WebDriverException as error:
+            tab.url = None
+            logger.warning("Failed to load %s: %s", url, error.msg)
+            return TabResult(url, error=error)
+        except Exception as error:  # noqa: BLE001 - errors of the user handler must not stop the other tabs
+            logger.warning("Failed to handle %s: %r", url, error)
+            return TabResult(url, error=error)
+
+    def _is_ready(self, driver: SupportedSeleniumWebDriver) -> bool:
+        try:
+            ready_state = driver.execute_script(JS_TAB_READY_STATE)
+        except WebDriverException:
+            # The document is being replaced
+            return False
+        if ready_state is None:
+            return False
+        if self._ready is None:
+            return ready_state == "complete"
+        return self._ready(driver)
+
+    def _record(self, duration: float) -> None:
+        if registry.enabled:
+            registry.record(Measurement("tab_get", duration, None, self._scraper._metrics_labels))  # noqa: SLF001
@@ -0,0 +1,139 @@
+import collections
+import threading
+import time
+from typing import NamedTuple
+
+import psutil
+
+from .logger import logger
+from .metrics import Labels, Sample, registry
+
+
+class ResourceSample(NamedTuple):
+    """Resource usage of the driver process with the browser processes."""
+    rss: int
+    cpu_percent: float
+    processes: int
+    timestamp: float
+
+
+class BrowserWatchdog:
+    """Background sampler of the memory and CPU usage of the driver/browser process tree.
+
+    The watchdog only raises the `restart_needed` flag when a threshold is crossed, the browser is restarted
+    by the scraper itself at the next safe point: the next `CommonScraper.get`. Use `CommonScraper.start_watchdog`.
+    """
+
+    def __init__(self,  # noqa: PLR0913
+                 process: psutil.Process,
+                 max_rss: int | None = None,
+                 max_cpu_percent: float | None = None,
+                 interval: float = 5.0,
+                 cpu_patience: int = 3,
+                 labels: Labels = ()):
+        """Initialize BrowserWatchdog.
+
+        :param process: driver process, the browser processes are its children
+        :param max_rss: max total resident set size of the process tree (bytes). If None, unlimited
+        :param max_cpu_percent: max total CPU usage of the process tree (percent of one core). If None, unlimited
+        :param interval: sampling interval (seconds)
+        :param cpu_patience: number of consecutive samples above `max_cpu_percent` needed for a restart,
+            so that short spikes (e.g. page rendering) are tolerated
+        :param labels: labels of the gauge samples, see `metrics.Sample`
+        """
+        self._max_rss = max_rss
+        self._max_cpu_percent = max_cpu_percent
+        self._interval = interval
+        self._cpu_patience = cpu_patience
+        self._labels = labels
+
+        self._lock = threading.Lock()
+        self._process = process
+        self._processes: dict[int, psutil.Process] = {}
+        self._cpu_overloads = 0
+        self._restart_needed = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.samples: collections.deque[ResourceSample] = collections.deque(maxlen=100)
+
+    @property
+    def restart_needed(self) -> bool:
+        """Whether a threshold has been crossed since the browser has been started."""
+        return self._restart_needed.is_set()
+
+    @property
+    def last_sample(self) -> ResourceSample | None:
+        """The latest resource usage sample."""
+        return self.samples[-1] if self.samples else None
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="BrowserWatchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def watch(self, process: psutil.Process) -> None:
+        """Switch to the process of the restarted browser and reset the `restart_needed` flag."""
+        with self._lock:
+            self._process = process
+            self._processes.clear()
+            self._cpu_overloads = 0
+            self._restart_needed.clear()
+
+    def sample(self) -> ResourceSample:
+        """Measure the resource usage of the process tree and check the thresholds."""
+        with self._lock:
+            resource_sample = self._measure()
+            self.samples.append(resource_sample)
+
+            if self._max_cpu_percent is not None and resource_sample.cpu_percent > self._max_cpu_percent:
+                self._cpu_overloads += 1
+            else:
+                self._cpu_overloads = 0
+
+            if not self._restart_needed.is_set():
+                if self._max_rss is not None and resource_sample.rss > self._max_rss:
+                    logger.warning("Browser RSS %d bytes exceeds %d bytes, restart is needed",
+                                   resource_sample.rss, self._max_rss)
+                    self._restart_needed.set()
+                elif self._cpu_overloads >= self._cpu_patience:
+                    logger.warning("Browser CPU usage %.0f%% exceeds %.0f%%, restart is needed",
+                                   resource_sample.cpu_percent, self._max_cpu_percent)
+                    self._restart_needed.set()
+
+        if registry.enabled:
+            registry.record_sample(Sample("browser_rss_bytes", resource_sample.rss, self._labels))
+            registry.record_sample(Sample("browser_cpu_percent", resource_sample.cpu_percent, self._labels))
+            registry.record_sample(Sample("browser_processes", resource_sample.processes, self._labels))
+        return resource_sample
+
+    def _measure(self) -> ResourceSample:
+        try:
+            tree = [self._process, *self._process.children(recursive=True)]
+        except psutil.Error:
+            tree = []
+
+        # psutil measures CPU usage between calls on the same Process object, so the objects are kept
+        processes = {process.pid: self._processes.get(process.pid, process) for process in tree}
+        self._processes = processes
+        rss = 0
+        cpu_percent = 0.0
+        for process in processes.values():
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    cpu_percent += process.cpu_percent()
+            except psutil.Error:  # noqa: PERF203 - the process has exited
+                continue
+        return ResourceSample(rss, cpu_percent, len(processes), time.time())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self._interval)
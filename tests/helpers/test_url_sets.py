@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from selenium_scraper.helpers.url_sets import BloomUrlSet, ExactUrlSet, HashedUrlSet, UrlSet
+
+URLS = [f"https://example.com/page{i}" for i in range(1000)]
+
+
+@pytest.mark.parametrize("url_set", [ExactUrlSet(), HashedUrlSet(buffer_size=64, max_runs=4), BloomUrlSet(10000)],
+                         ids=["exact", "hashed", "bloom"])
+def test_add(url_set: UrlSet) -> None:
+    """Check that every URL is new once."""
+    assert all(url_set.add(url) for url in URLS)
+    assert not any(url_set.add(url) for url in URLS)
+    assert all(url in url_set for url in URLS)
+    assert len(url_set) == len(URLS)
+
+
+def test_hashed_spill(tmp_path: Path) -> None:
+    """Check that the hashes above the memory limit are moved to the disk and still found."""
+    url_set = HashedUrlSet(tmp_path, memory_limit=800, buffer_size=50, max_runs=2)
+    for url in URLS:
+        url_set.add(url)
+
+    assert url_set.memory_size <= 800
+    assert list(tmp_path.iterdir())
+    assert all(url in url_set for url in URLS)
+    assert "https://example.com/other" not in url_set
+    assert len(url_set) == len(URLS)
+
+    url_set.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_bloom_error_rate() -> None:
+    """Check that the rate of new URLs considered seen is close to the given one."""
+    url_set = BloomUrlSet(capacity=10000, error_rate=0.01)
+    for i in range(10000):
+        url_set.add(f"https://example.com/seen{i}")
+
+    false_positives = sum(f"https://example.com/new{i}" in url_set for i in range(10000))
+    assert false_positives < 300
+    assert url_set.memory_size < 10000 * 1.3
@@ -0,0 +1,13 @@
+from selenium_scraper.helpers.urls import canonicalize_url
+
+
+def test_canonicalize_case_and_default_port() -> None:
+    """Check that the scheme and host are lowercased and the default port is removed."""
+    assert canonicalize_url("HTTPS://Example.COM:443/Page") == "https://example.com/Page"
+    assert canonicalize_url("http://example.com:8080/page") == "http://example.com:8080/page"
+
+
+def test_canonicalize_query_and_fragment() -> None:
+    """Check that query params are sorted and the fragment is removed."""
+    assert canonicalize_url("https://example.com?b=2&a=1#top") == "https://example.com/?a=1&b=2"
+    assert canonicalize_url("https://example.com/page?b=2&a=1") == canonicalize_url("https://example.com/page?a=1&b=2")
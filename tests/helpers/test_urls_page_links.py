@@ -14,3 +14,32 @@ def test_links() -> None:
                                    "https://github.com/nparamonov/SeleniumScraper"}
     assert page_links.internal == {"https://example.com/page1/page3",
                                    "https://example.com/about", "https://example.com/"}
+
+
+def test_absolute_internal_links() -> None:
+    """Check that absolute links to the same site are internal."""
+    page_links = PageLinks("https://example.com/page1/page2")
+    page_links.add_link("https://example.com/about")
+    page_links.add_link("//example.com/contacts")
+
+    assert page_links.internal == {"https://example.com/about", "https://example.com/contacts"}
+    assert page_links.external == set()
+
+
+def test_add_links() -> None:
+    """Check that adding the links at once gives the same result as one by one."""
+    page_links = PageLinks("https://example.com/page1/page2")
+    page_links.add_links(LINKS)
+
+    assert page_links.external == {"https://github.com/nparamonov",
+                                   "https://github.com/nparamonov/SeleniumScraper"}
+    assert page_links.internal == {"https://example.com/page1/page3",
+                                   "https://example.com/about", "https://example.com/"}
+
+
+def test_canonicalize() -> None:
+    """Check that the links differing only in the fragment or the query order are kept once."""
+    page_links = PageLinks("https://example.com/page1/page2", canonicalize=True)
+    page_links.add_links(["/about#team", "/about?b=2&a=1", "https://EXAMPLE.com:443/about?a=1&b=2", "/about"])
+
+    assert page_links.internal == {"https://example.com/about", "https://example.com/about?a=1&b=2"}
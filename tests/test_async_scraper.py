@@ -0,0 +1,123 @@
+import asyncio
+import time
+from functools import partial
+
+import pytest
+
+from selenium_scraper import AsyncScraper, AsyncScraperPool, CommonScraper, Scraper
+
+
+def test_async_get_pong(scraper: CommonScraper, base_url: str) -> None:
+    """Check awaitable versions of `scraper.get` and `scraper.current_page`."""
+    async def main() -> str:
+        async_scraper = AsyncScraper(scraper)
+        await async_scraper.get(base_url + "/ping")
+        page = await async_scraper.current_page()
+        await async_scraper.detach()
+        return page.text
+
+    assert asyncio.run(main()) == "pong"
+
+
+def test_async_call_timeout(scraper: CommonScraper) -> None:
+    """Check that a long call is limited by timeout and the next calls wait for it."""
+    async def main() -> None:
+        async_scraper = AsyncScraper(scraper)
+        with pytest.raises(asyncio.TimeoutError):
+            await async_scraper.run(time.sleep, 1, timeout=0.1)
+        start_time = time.monotonic()
+        await async_scraper.run(time.sleep, 0)
+        assert time.monotonic() - start_time > 0.5
+        await async_scraper.detach()
+
+    asyncio.run(main())
+
+
+def test_async_pool_concurrent_leases(base_url: str) -> None:
+    """Check that several sessions of the pool are used concurrently."""
+    async def fetch(pool: AsyncScraperPool) -> str:
+        async with pool.lease() as async_scraper:
+            await async_scraper.get(base_url + "/ping")
+            await async_scraper.run(time.sleep, 1)
+            return (await async_scraper.current_page()).text
+
+    async def main() -> None:
+        async with AsyncScraperPool(partial(Scraper.chrome, headless=True), size=2) as pool:
+            start_time = time.monotonic()
+            assert list(await asyncio.gather(fetch(pool), fetch(pool))) == ["pong", "pong"]
+            # Both sessions sleep for 1 second at the same time
+            assert time.monotonic() - start_time < 2
+
+    asyncio.run(main())
+
+
+class FakeScraper:
+    """Scraper without a browser for the pool tests."""
+
+    full_reset = True
+
+    def reset(self) -> None:
+        """Reset the session state."""
+
+    def close(self, _timeout: float = 0) -> None:
+        """Quit the browser."""
+
+
+def test_async_call_zero_timeout() -> None:
+    """Check that an explicit zero timeout is not replaced with the default timeout."""
+    async def main() -> None:
+        async_scraper = AsyncScraper(FakeScraper(), timeout=10)  # type: ignore[arg-type]
+        with pytest.raises(asyncio.TimeoutError):
+            await async_scraper.run(time.sleep, 0.2, timeout=0)
+        await async_scraper.detach()
+
+    asyncio.run(main())
+
+
+def test_async_pool_lease_timeout() -> None:
+    """Check that waiting for a busy pool raises asyncio.TimeoutError."""
+    async def main() -> None:
+        async with AsyncScraperPool(FakeScraper, size=1) as pool:  # type: ignore[arg-type]
+            sync_pool = pool._pool  # noqa: SLF001
+            assert sync_pool is not None
+            # The session is taken past the async pool, so that the lease times out in `ScraperPool.acquire`
+            scraper = sync_pool.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                async with pool.lease(timeout=0.2):
+                    pass
+            sync_pool.release(scraper)
+
+    asyncio.run(main())
+
+
+def test_async_pool_cancelled_lease() -> None:
+    """Check that the session acquired for a cancelled lease is returned to the pool."""
+    async def main() -> None:
+        async with AsyncScraperPool(FakeScraper, size=1) as pool:  # type: ignore[arg-type]
+            sync_pool = pool._pool  # noqa: SLF001
+            assert sync_pool is not None
+            scraper = sync_pool.acquire()
+
+            async def lease() -> None:
+                async with pool.lease():
+                    pass
+
+            task = asyncio.create_task(lease())
+            # The lease waits in `ScraperPool.acquire` on the worker thread
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert sync_pool.idle == 0
+
+            # The worker thread gets the session after the cancellation and returns it to the pool
+            sync_pool.release(scraper)
+            for _ in range(50):
+                if sync_pool.idle:
+                    break
+                await asyncio.sleep(0.05)
+            assert sync_pool.idle == 1
+            async with pool.lease(timeout=1):
+                pass
+
+    asyncio.run(main())
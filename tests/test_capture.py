@@ -0,0 +1,55 @@
+import time
+
+from selenium_scraper import CommonScraper, Scraper
+from selenium_scraper.conditions import JsPredicate
+from selenium_scraper.scraper import CapturedResponse
+
+FEED_READY = JsPredicate("return document.querySelectorAll('.post').length === 4")
+
+
+def wait_for_responses(scraper: CommonScraper, count: int, timeout: float = 5) -> list[CapturedResponse]:
+    """Take the captured responses until there are `count` of them."""
+    responses: list[CapturedResponse] = []
+    start_time = time.monotonic()
+    while len(responses) < count and time.monotonic() - start_time < timeout:
+        responses += scraper.captured_responses()
+        time.sleep(0.05)
+    return responses
+
+
+def test_capture_after_load(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the matching fetch and XMLHttpRequest responses are captured after the page has been loaded."""
+    scraper.start_capture(["*/api/feed_items?offset=1*"])
+    scraper.get(base_url + "/json_feed", ready=FEED_READY)
+    scraper.captured_responses()
+    scraper.driver.execute_script("""
+        fetch("/api/feed_items?offset=10");
+        fetch("/api/feed_items?offset=20");
+        const request = new XMLHttpRequest();
+        request.open("GET", "/api/feed_items?offset=12");
+        request.send();
+    """)
+
+    responses = wait_for_responses(scraper, 2)
+    assert sorted(response.url for response in responses) == [base_url + "/api/feed_items?offset=10",
+                                                              base_url + "/api/feed_items?offset=12"]
+    assert all(response.status == 200 and "json" in response.content_type for response in responses)
+    assert {response.json()["items"][0]["id"] for response in responses} == {10, 12}
+
+    scraper.stop_capture()
+    scraper.driver.execute_script('fetch("/api/feed_items?offset=14")')
+    assert wait_for_responses(scraper, 1, timeout=0.5) == []
+
+
+def test_capture_during_load(base_url: str) -> None:
+    """Check that Chrome captures the responses to the requests made by the page while it is loading."""
+    with Scraper.chrome(headless=True) as scraper:
+        scraper.start_capture(["*/api/feed_items*"])
+        scraper.get(base_url + "/json_feed", ready=FEED_READY)
+        responses = wait_for_responses(scraper, 2)
+
+        assert [response.json()["items"] for response in responses] == [
+            [{"id": 0, "title": "Post 0"}, {"id": 1, "title": "Post 1"}],
+            [{"id": 2, "title": "Post 2"}, {"id": 3, "title": "Post 3"}],
+        ]
+        scraper.stop_capture()
@@ -0,0 +1,90 @@
+import threading
+from collections.abc import Generator
+from functools import partial
+from typing import Any
+
+import pytest
+
+from selenium_scraper import CommonScraper, Crawler, Frontier, Scraper, ScraperPool
+from selenium_scraper.helpers.url_sets import HashedUrlSet
+
+
+def test_frontier_deduplication() -> None:
+    """Check that equivalent URLs are queued only once."""
+    frontier = Frontier()
+    assert frontier.push("https://example.com/page?a=1&b=2")
+    assert not frontier.push("HTTPS://example.com:443/page?b=2&a=1#top")
+    assert len(frontier) == 1
+
+
+def test_frontier_hashed_url_set() -> None:
+    """Check the deduplication with the compact URL set."""
+    frontier = Frontier(seen=HashedUrlSet(buffer_size=2))
+    assert all(frontier.push(f"https://example.com/page{i}") for i in range(5))
+    assert not any(frontier.push(f"https://example.com/page{i}#top") for i in range(5))
+    assert len(frontier) == 5
+
+
+def test_frontier_breadth_first_and_limits() -> None:
+    """Check breadth-first order, depth and page limits."""
+    frontier = Frontier(max_depth=1, max_pages=2)
+    frontier.push("https://example.com/deep", 1)
+    frontier.push("https://example.com/", 0)
+    assert not frontier.push("https://example.com/too_deep", 2)
+
+    assert frontier.pop() == ("https://example.com/", 0)
+    frontier.task_done()
+    assert frontier.pop() == ("https://example.com/deep", 1)
+    frontier.task_done()
+    frontier.push("https://example.com/other", 1)
+    assert frontier.pop() is None
+
+
+def test_frontier_priority() -> None:
+    """Check that URLs with the lowest priority value are taken first."""
+    frontier = Frontier(priority=lambda url, _depth: 0 if "important" in url else 1)
+    frontier.push("https://example.com/", 0)
+    frontier.push("https://example.com/important", 3)
+    assert frontier.pop() == ("https://example.com/important", 3)
+
+
+def test_frontier_waits_for_pages_in_progress() -> None:
+    """Check that `pop` waits for links of the pages being crawled and finishes when there are none."""
+    frontier = Frontier()
+    frontier.push("https://example.com/")
+    assert frontier.pop() == ("https://example.com/", 0)
+
+    def crawl_page() -> None:
+        frontier.push("https://example.com/next", 1)
+        frontier.task_done()
+
+    threading.Timer(0.1, crawl_page).start()
+    assert frontier.pop() == ("https://example.com/next", 1)
+    frontier.task_done()
+    assert frontier.pop() is None
+
+
+@pytest.fixture(scope="module")
+def pool() -> Generator[ScraperPool, Any, None]:
+    """Pool with two headless Chrome sessions."""
+    with ScraperPool(partial(Scraper.chrome, headless=True), size=2) as scraper_pool:
+        yield scraper_pool
+
+
+def test_crawl_site(pool: ScraperPool, base_url: str) -> None:
+    """Check crawling of the local web application with two sessions."""
+    def handler(scraper: CommonScraper, _url: str) -> str:
+        return scraper.driver.current_url
+
+    crawler = Crawler(pool, handler, max_depth=1)
+    results = list(crawler.crawl([base_url + "/page_with_various_links"]))
+
+    assert {result.url for result in results} == {base_url + "/page_with_various_links", base_url + "/",
+                                                   base_url + "/about", base_url + "/page3"}
+    assert all(result.error is None and result.data == result.url for result in results)
+
+
+def test_crawl_max_pages(pool: ScraperPool, base_url: str) -> None:
+    """Check that the number of loaded pages is limited."""
+    results = list(Crawler(pool, max_pages=2).crawl([base_url + "/page_with_various_links"]))
+    assert len(results) == 2
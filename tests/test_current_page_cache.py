@@ -0,0 +1,42 @@
+from selenium_scraper import CommonScraper
+from selenium_scraper.mapping import ScrollMethods
+
+
+def test_current_page_cache_hit(scraper: CommonScraper, base_url: str) -> None:
+    """Check that an unchanged page is parsed once."""
+    scraper.get(base_url + "/ping")
+    hits, misses = scraper.page_cache_info
+
+    page = scraper.current_page
+    assert scraper.current_page is page
+    assert scraper.page_cache_info == (hits + 1, misses + 1)
+
+
+def test_current_page_cache_dom_mutation(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the cache is invalidated by changes of the page made in the browser."""
+    scraper.get(base_url + "/ping")
+    assert scraper.current_page.text == "pong"
+
+    scraper.driver.execute_script("document.body.append('!')")
+    assert scraper.current_page.text == "pong!"
+
+
+def test_current_page_cache_navigation(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the cache is invalidated by loading another page, including direct driver calls."""
+    scraper.get(base_url + "/ping")
+    ping_page = scraper.current_page
+
+    scraper.get(base_url + "/page_with_various_links")
+    assert scraper.current_page is not ping_page
+
+    scraper.driver.get(base_url + "/ping")
+    assert scraper.current_page.text == "pong"
+
+
+def test_current_page_cache_scroll(scraper: CommonScraper, base_url: str) -> None:
+    """Check that content loaded by scrolling is not missed."""
+    scraper.get(base_url + "/infinite_page")
+    n_paragraphs = len(scraper.current_page.find_all("div", {"class": "paragraph"}))
+
+    scraper.scroll_infinite_page(1, 2, ScrollMethods.js_instant)
+    assert len(scraper.current_page.find_all("div", {"class": "paragraph"})) > n_paragraphs
@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import Any
+
+from selenium_scraper import CommonScraper, ExtractionSchema, Field
+from selenium_scraper.snapshots import ReplayScraper, SnapshotStore
+
+SCHEMA = ExtractionSchema({
+    "title": "h1",
+    "missing": ".missing",
+    "products": Field(".product", many=True, fields={
+        "id": Field(".", attribute="data-id", xpath=True),
+        "name": "a.name",
+        "url": Field("a.name", attribute="href"),
+        "price": Field(".price", attribute="data-value"),
+        "tags": Field(".tags li", many=True),
+    }),
+})
+
+
+def expected_data(base_url: str) -> dict[str, Any]:
+    """Data of the page with products."""
+    return {
+        "title": "Products",
+        "missing": None,
+        "products": [
+            {"id": "1", "name": "Chair", "url": base_url + "/products/1", "price": "25.00",
+             "tags": ["wood", "kitchen"]},
+            {"id": "2", "name": "Table", "url": base_url + "/products/2", "price": "99.90",
+             "tags": []},
+        ],
+    }
+
+
+def test_extract(scraper: CommonScraper, base_url: str) -> None:
+    """Check extraction of single, list and nested fields with CSS and XPath selectors."""
+    scraper.get(base_url + "/page_with_products")
+    assert scraper.extract(SCHEMA) == expected_data(base_url)
+
+
+def test_extract_dict_schema(scraper: CommonScraper, base_url: str) -> None:
+    """Check that a schema can be passed as a dict and XPath may select attributes."""
+    scraper.get(base_url + "/page_with_products")
+    data = scraper.extract({"names": Field("//a[@class='name']/text()", many=True, xpath=True),
+                            "first_id": Field("//div[@class='product']/@data-id", xpath=True)})
+    assert data == {"names": ["Chair", "Table"], "first_id": "1"}
+
+
+def test_extract_soup(tmp_path: Path, base_url: str) -> None:
+    """Check that the same schema gives the same data from a parsed page, except XPath fields."""
+    store = SnapshotStore(tmp_path)
+    page_source = Path("tests/web_app/templates/page_with_products.html").read_text(encoding="utf-8")
+    store.save(base_url + "/page_with_products", page_source)
+    replay_scraper = ReplayScraper(store)
+    replay_scraper.get(base_url + "/page_with_products")
+
+    schema = {name: field for name, field in SCHEMA.fields.items() if name != "products"}
+    assert replay_scraper.extract(schema) == {"title": "Products", "missing": None}
+    products = replay_scraper.extract({"products": Field(".product", many=True, fields={
+        "url": Field("a.name", attribute="href"), "tags": Field(".tags li", many=True)})})
+    assert products == {"products": [{"url": base_url + "/products/1", "tags": ["wood", "kitchen"]},
+                                     {"url": base_url + "/products/2", "tags": []}]}
@@ -1,10 +1,14 @@
+import pytest
+
 from selenium_scraper import CommonScraper
+from selenium_scraper.mapping import LinkExtractionMethods
 
 
-def test_get_links_from_current_page(scraper: CommonScraper, base_url: str) -> None:
+@pytest.mark.parametrize("method", [LinkExtractionMethods.js, LinkExtractionMethods.soup])
+def test_get_links_from_current_page(scraper: CommonScraper, base_url: str, method: str) -> None:
     """Check page with various links."""
     scraper.get(base_url + "/page_with_various_links")
-    links = scraper.get_all_links()
+    links = scraper.get_all_links(method=method)
     assert links.external == {"http://github.com/nparamonov",
                               "https://github.com/nparamonov/SeleniumScraper"}
     assert links.internal == {base_url + "/page3",
@@ -17,3 +21,20 @@ def test_get_links_from_page_without_links(scraper: CommonScraper, base_url: str
     links = scraper.get_all_links()
     assert len(links.internal) == 0
     assert len(links.external) == 0
+
+
+def test_get_links_methods_are_equal(scraper: CommonScraper, base_url: str) -> None:
+    """Check that links collected in the browser and from the page source are the same."""
+    scraper.get(base_url + "/page_with_many_links", {"count": "300"})
+    js_links = scraper.get_all_links(method=LinkExtractionMethods.js)
+    soup_links = scraper.get_all_links(method=LinkExtractionMethods.soup)
+    assert js_links.internal == soup_links.internal
+    assert js_links.external == soup_links.external
+    assert len(js_links.internal) == 200
+
+
+def test_get_links_wrong_method(scraper: CommonScraper, base_url: str) -> None:
+    """Check wrong link extraction method."""
+    scraper.get(base_url + "/page_with_various_links")
+    with pytest.raises(ValueError, match="Invalid link extraction method"):
+        scraper.get_all_links(method="my_method")
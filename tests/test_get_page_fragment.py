@@ -0,0 +1,33 @@
+from bs4 import SoupStrainer
+
+from selenium_scraper import CommonScraper
+
+
+def test_get_page_fragment(scraper: CommonScraper, base_url: str) -> None:
+    """Check that only the matching elements are returned."""
+    scraper.get(base_url + "/page_with_many_links", {"count": "10"})
+    fragment = scraper.get_page_fragment("div.item:nth-child(-n+3)")
+
+    items = fragment.find_all("div", {"class": "item"})
+    assert [item.p.text for item in items] == ["Item 0", "Item 1", "Item 2"]
+
+
+def test_get_page_fragment_nested_elements(scraper: CommonScraper, base_url: str) -> None:
+    """Check that elements nested in other matching elements are not duplicated."""
+    scraper.get(base_url + "/page_with_many_links", {"count": "10"})
+    fragment = scraper.get_page_fragment("body, div.item")
+    assert len(fragment.find_all("div", {"class": "item"})) == 10
+
+
+def test_get_page_fragment_parse_only(scraper: CommonScraper, base_url: str) -> None:
+    """Check parsing with SoupStrainer."""
+    scraper.get(base_url + "/page_with_many_links", {"count": "10"})
+    fragment = scraper.get_page_fragment("div.item", parse_only=SoupStrainer("a"))
+    assert len(fragment.find_all("a")) == 10
+    assert fragment.find("p") is None
+
+
+def test_get_page_fragment_no_elements(scraper: CommonScraper, base_url: str) -> None:
+    """Check selector without matching elements."""
+    scraper.get(base_url + "/ping")
+    assert scraper.get_page_fragment("div.missing").text == ""
@@ -0,0 +1,43 @@
+import timeit
+from collections.abc import Callable
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from selenium_scraper import CommonScraper, Scraper
+from selenium_scraper.conditions import JsPredicate, NetworkIdle, SelectorPresent
+from selenium_scraper.mapping import PageLoadStrategies
+
+BROWSERS = [Scraper.chrome, Scraper.firefox]
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+@pytest.mark.parametrize("strategy", [PageLoadStrategies.eager, PageLoadStrategies.none])
+def test_get_ready_before_load(browser: Callable[..., CommonScraper], base_url: str, strategy: str) -> None:
+    """Check that `get` returns as soon as the element is on the page, without waiting for a slow image."""
+    scraper = browser(headless=True, page_load_strategy=strategy)
+
+    s_t = timeit.default_timer()
+    scraper.get(base_url + "/page_with_slow_resource", {"delay": "3"}, ready=SelectorPresent("h1.title"))
+    e_t = timeit.default_timer()
+
+    assert e_t - s_t < 3
+    assert scraper.current_page.select_one("h1.title") is not None
+
+
+def test_get_ready_js_predicate(scraper: CommonScraper, base_url: str) -> None:
+    """Check readiness condition with JavaScript code."""
+    scraper.get(base_url + "/page_with_various_links", ready=JsPredicate("return document.links.length === 7"))
+    assert len(scraper.current_page.find_all("a")) == 7
+
+
+def test_get_ready_network_idle(scraper: CommonScraper, base_url: str) -> None:
+    """Check that network idle condition is met on a loaded page."""
+    scraper.get(base_url + "/page_with_resources", ready=NetworkIdle(0.1))
+    assert scraper.driver.execute_script("return document.readyState") == "complete"
+
+
+def test_get_not_ready(scraper: CommonScraper, base_url: str) -> None:
+    """Check that `get` raises TimeoutException if the page is not ready in time."""
+    with pytest.raises(TimeoutException, match="Page is not ready"):
+        scraper.get(base_url + "/ping", timeout=1, ready=SelectorPresent("div.missing"))
@@ -0,0 +1,146 @@
+from typing import Any
+
+import pytest
+from bs4 import BeautifulSoup
+
+from selenium_scraper import CommonScraper, HybridScraper
+from selenium_scraper.hybrid import same_content
+
+
+def test_hybrid_static_host(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the pages of a static host are loaded over HTTP after the probe."""
+    hybrid = HybridScraper(scraper)
+    hybrid.get(base_url + "/page_with_products")
+    assert hybrid.host_modes == {"127.0.0.1": False}
+    assert scraper.driver.current_url == base_url + "/page_with_products"
+
+    hybrid.get(base_url + "/page_with_various_links")
+    assert scraper.driver.current_url == base_url + "/page_with_products"
+    assert hybrid.current_url == base_url + "/page_with_various_links"
+    scraper.get(base_url + "/page_with_various_links")
+    browser_links = scraper.get_all_links()
+    links = hybrid.get_all_links()
+    assert links.internal == browser_links.internal
+    assert links.external == browser_links.external
+    hybrid.close()
+
+
+def test_hybrid_browser_host(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the pages of a host failed the probe are loaded with the browser."""
+    hybrid = HybridScraper(scraper, check=lambda _http_page, _rendered_page: False)
+    hybrid.get(base_url + "/page_with_products")
+    assert hybrid.host_modes == {"127.0.0.1": True}
+
+    hybrid.get(base_url + "/page_with_various_links")
+    assert scraper.driver.current_url == base_url + "/page_with_various_links"
+    assert hybrid.current_page is scraper.current_page
+    assert hybrid.extract({"title": "title"}) == scraper.extract({"title": "title"})
+    hybrid.close()
+
+
+def test_hybrid_non_html_response(scraper: CommonScraper, base_url: str) -> None:
+    """Check that responses other than HTML pages are loaded with the browser."""
+    hybrid = HybridScraper(scraper)
+    hybrid.set_host_mode("127.0.0.1", needs_browser=False)
+    hybrid.get(base_url + "/throttled")
+    assert scraper.driver.current_url == base_url + "/throttled"
+    hybrid.get(base_url + "/api/feed_items")
+    assert scraper.driver.current_url == base_url + "/api/feed_items"
+    hybrid.close()
+
+
+def test_hybrid_cookies(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the cookies are shared between the browser session and the HTTP requests."""
+    scraper.get(base_url + "/ping")
+    scraper.driver.add_cookie({"name": "session", "value": "abc"})
+    hybrid = HybridScraper(scraper)
+    hybrid.set_host_mode("127.0.0.1", needs_browser=False)
+    try:
+        hybrid.get(base_url + "/cookies")
+        assert [item.text for item in hybrid.current_page.select(".cookie")] == ["session=abc"]
+
+        # The cookie set by the HTTP response is passed to the browser
+        hybrid.set_host_mode("127.0.0.1", needs_browser=True)
+        hybrid.get(base_url + "/cookies")
+        assert [item.text for item in hybrid.current_page.select(".cookie")] == ["served=1", "session=abc"]
+    finally:
+        scraper.driver.delete_all_cookies()
+        hybrid.close()
+
+
+def test_same_content() -> None:
+    """Check the default probe: the rendered page must not have much more text or links."""
+    static_page = BeautifulSoup('<body><p>Some text</p><a href="/about">About</a>'
+                                "<script>render();</script></body>", "lxml")
+    rendered_page = BeautifulSoup('<body><p>Some text</p><a href="/about">About</a></body>', "lxml")
+    assert same_content(static_page, rendered_page)
+
+    empty_page = BeautifulSoup('<body><div id="app"></div><script>render();</script></body>', "lxml")
+    assert not same_content(empty_page, rendered_page)
+
+    more_links_page = BeautifulSoup('<body><p>Some text</p><a href="/about">About</a><a href="/1"></a>'
+                                    '<a href="/2"></a></body>', "lxml")
+    assert not same_content(static_page, more_links_page)
+
+
+class FakeDriver:
+    """WebDriver without a browser."""
+
+    def execute_script(self, _script: str) -> str:
+        """Return the user agent."""
+        return "FakeBrowser"
+
+
+class FakeBrowser:
+    """Scraper without a browser keeping the cookies of all domains."""
+
+    def __init__(self) -> None:
+        """Start without cookies."""
+        self.driver = FakeDriver()
+        self.cookies: list[dict[str, Any]] = []
+        self.urls: list[str] = []
+
+    def get(self, url: str, **_kwargs: Any) -> None:
+        """Load the page."""
+        self.urls.append(url)
+
+    def export_cookies(self) -> list[dict[str, Any]]:
+        """Get the cookies."""
+        return list(self.cookies)
+
+
+def test_hybrid_cookies_deleted() -> None:
+    """Check that the cookies deleted by the browser or by the HTTP responses are not sent."""
+    browser = FakeBrowser()
+    browser.cookies = [{"name": "session", "value": "abc", "domain": "example.com", "path": "/"},
+                       {"name": "theme", "value": "dark", "domain": "example.com", "path": "/"}]
+    hybrid = HybridScraper(browser)  # type: ignore[arg-type]
+    hybrid._copy_session()  # noqa: SLF001
+    assert hybrid._headers("https://example.com/")["Cookie"] == "session=abc; theme=dark"  # noqa: SLF001
+
+    hybrid._store_cookies("https://example.com/", [  # noqa: SLF001
+        "theme=; Expires=Thu, 01 Jan 1970 00:00:00 GMT; Path=/",
+        "served=1; Path=/",
+    ])
+    browser.cookies = browser.cookies[1:]
+    hybrid._copy_session()  # noqa: SLF001
+    # 'session' is deleted by the browser, 'theme' by the response and 'served' is not passed to the browser yet
+    assert hybrid._headers("https://example.com/")["Cookie"] == "served=1"  # noqa: SLF001
+    hybrid.close()
+
+
+def test_hybrid_failed_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a host which pages cannot be loaded over HTTP is not probed again."""
+    browser = FakeBrowser()
+    hybrid = HybridScraper(browser, http_timeout=1)  # type: ignore[arg-type]
+    # Nothing listens on the discard port
+    hybrid.get("http://127.0.0.1:9/page")
+    assert hybrid.host_modes == {"127.0.0.1": True}
+
+    def http_get(*_args: Any) -> bool:
+        pytest.fail("The host is probed again")
+
+    monkeypatch.setattr(hybrid, "_http_get", http_get)
+    hybrid.get("http://127.0.0.1:9/other")
+    assert browser.urls == ["http://127.0.0.1:9/page", "http://127.0.0.1:9/other"]
+    hybrid.close()
@@ -0,0 +1,32 @@
+from selenium_scraper import CommonScraper
+from selenium_scraper.mapping import ScrollMethods
+
+
+def test_iter_infinite_page(scraper: CommonScraper, base_url: str) -> None:
+    """Check that every element is yielded once and in the page order."""
+    n_scrolls = 3
+
+    scraper.get(base_url + "/infinite_page")
+    paragraphs = [element.text for element in
+                  scraper.iter_infinite_page("div.paragraph", n_scrolls, 2, ScrollMethods.js_instant)]
+
+    assert len(paragraphs) > n_scrolls
+    assert paragraphs == [str(number) for number in range(1, len(paragraphs) + 1)]
+
+
+def test_iter_infinite_page_prune(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the yielded elements are removed from the page."""
+    n_scrolls = 3
+
+    scraper.get(base_url + "/infinite_page")
+    paragraphs = list(scraper.iter_infinite_page("div.paragraph", n_scrolls, 2, ScrollMethods.js_instant, prune=True))
+
+    assert len(paragraphs) > n_scrolls
+    assert len(scraper.current_page.find_all("div", {"class": "paragraph"})) < len(paragraphs)
+
+
+def test_iter_infinite_page_timeout(scraper: CommonScraper, base_url: str) -> None:
+    """Check that scrolling stops when no new content is loaded."""
+    scraper.get(base_url + "/page_with_many_links", {"count": "5"})
+    items = list(scraper.iter_infinite_page("div.item", timeout=0.5))
+    assert len(items) == 5
@@ -0,0 +1,127 @@
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+
+from selenium_scraper import CommonScraper
+from selenium_scraper.metrics import (
+    CallbackSink,
+    Histogram,
+    HistogramSink,
+    Measurement,
+    PrometheusSink,
+    Sample,
+    registry,
+)
+
+
+@pytest.fixture()
+def sink() -> Generator[HistogramSink, Any, None]:
+    """Histogram sink added to the registry for the duration of the test."""
+    histogram_sink = HistogramSink()
+    registry.add_sink(histogram_sink)
+    try:
+        yield histogram_sink
+    finally:
+        registry.remove_sink(histogram_sink)
+
+
+def test_registry_disabled() -> None:
+    """Check that nothing is measured without sinks."""
+    assert not registry.enabled
+    with registry.measure("get") as timer:
+        timer.size = 1
+    assert registry.measure("get") is registry.measure("parse")
+
+
+def test_callback_sink() -> None:
+    """Check that the callback gets every measurement with its size and labels."""
+    measurements: list[Measurement] = []
+    callback_sink = CallbackSink(measurements.append)
+    registry.add_sink(callback_sink)
+    try:
+        with registry.measure("parse", (("browser", "chrome"),)) as timer:
+            timer.size = 42
+    finally:
+        registry.remove_sink(callback_sink)
+
+    assert len(measurements) == 1
+    assert measurements[0].name == "parse"
+    assert measurements[0].size == 42
+    assert measurements[0].labels == (("browser", "chrome"),)
+    assert measurements[0].duration >= 0
+
+
+def test_histogram() -> None:
+    """Check counts, mean and quantiles of the histogram."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for duration in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe(duration, 10)
+
+    assert histogram.bucket_counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.size == 40
+    assert histogram.mean == pytest.approx(1.4)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1) == float("inf")
+
+
+def test_histogram_sink_labels(sink: HistogramSink) -> None:
+    """Check that histograms are kept per labels and merged on request."""
+    sink.record(Measurement("get", 0.2, None, (("browser", "chrome"),)))
+    sink.record(Measurement("get", 0.4, None, (("browser", "firefox"),)))
+
+    assert sink.histogram("get").count == 2
+    assert sink.histogram("get", browser="chrome").sum == pytest.approx(0.2)
+    assert sink.histogram("parse").count == 0
+
+
+def test_prometheus_exposition() -> None:
+    """Check the Prometheus text format."""
+    prometheus_sink = PrometheusSink(buckets=(0.1, 1.0))
+    prometheus_sink.record(Measurement("page_source", 0.5, 1000, (("browser", "chrome"),)))
+    prometheus_sink.record(Measurement("page_source", 0.05, 500, (("browser", "firefox"),)))
+
+    assert prometheus_sink.exposition() == (
+        "# TYPE selenium_scraper_page_source_seconds histogram\n"
+        'selenium_scraper_page_source_seconds_bucket{browser="chrome",le="0.1"} 0\n'
+        'selenium_scraper_page_source_seconds_bucket{browser="chrome",le="1.0"} 1\n'
+        'selenium_scraper_page_source_seconds_bucket{browser="chrome",le="+Inf"} 1\n'
+        'selenium_scraper_page_source_seconds_sum{browser="chrome"} 0.5\n'
+        'selenium_scraper_page_source_seconds_count{browser="chrome"} 1\n'
+        'selenium_scraper_page_source_seconds_bucket{browser="firefox",le="0.1"} 1\n'
+        'selenium_scraper_page_source_seconds_bucket{browser="firefox",le="1.0"} 1\n'
+        'selenium_scraper_page_source_seconds_bucket{browser="firefox",le="+Inf"} 1\n'
+        'selenium_scraper_page_source_seconds_sum{browser="firefox"} 0.05\n'
+        'selenium_scraper_page_source_seconds_count{browser="firefox"} 1\n'
+        "# TYPE selenium_scraper_page_source_size_total counter\n"
+        'selenium_scraper_page_source_size_total{browser="chrome"} 1000\n'
+        'selenium_scraper_page_source_size_total{browser="firefox"} 500\n'
+    )
+
+
+def test_prometheus_gauges() -> None:
+    """Check that the last values of the gauges are exposed."""
+    prometheus_sink = PrometheusSink()
+    prometheus_sink.record_sample(Sample("browser_rss_bytes", 1000, (("browser", "chrome"),)))
+    prometheus_sink.record_sample(Sample("browser_rss_bytes", 2000, (("browser", "chrome"),)))
+
+    assert prometheus_sink.gauge("browser_rss_bytes") == 2000
+    assert prometheus_sink.exposition() == (
+        "# TYPE selenium_scraper_browser_rss_bytes gauge\n"
+        'selenium_scraper_browser_rss_bytes{browser="chrome"} 2000\n'
+    )
+
+
+def test_scraper_metrics(scraper: CommonScraper, base_url: str, sink: HistogramSink) -> None:
+    """Check that navigation, page source transfer, parsing and link extraction are measured."""
+    scraper.get(base_url + "/page_with_various_links")
+    page_source_length = len(str(scraper.current_page))
+    links = scraper.get_all_links()
+
+    browser = scraper.driver.capabilities["browserName"]
+    assert sink.histogram("get", browser=browser).count == 1
+    assert sink.histogram("page_source", browser=browser).size > page_source_length / 2
+    assert sink.histogram("parse").count == 1
+    assert sink.histogram("get_all_links").size == len(links.internal) + len(links.external)
@@ -0,0 +1,96 @@
+from collections.abc import Generator
+from functools import partial
+from typing import Any
+
+import pytest
+
+from selenium_scraper import ParsePipeline, Scraper, ScraperPool
+from selenium_scraper.static import StaticPageScraper
+
+PAGE_SOURCE = '<html><body><a href="/1">1</a><a href="/2">2</a></body></html>'
+
+
+class FakeDriver:
+    """Driver of `FakeScraper` with a loaded page."""
+
+    current_url = "about:blank"
+    page_source = PAGE_SOURCE
+
+
+class FakeScraper:
+    """Scraper without a browser, failing to load the URLs containing 'broken' with OSError."""
+
+    full_reset = True
+
+    def __init__(self) -> None:
+        """Initialize FakeScraper."""
+        self.driver = FakeDriver()
+
+    def get(self, url: str, **_kwargs: object) -> None:
+        """Load the page."""
+        if "broken" in url:
+            msg = "Snapshot store is not writable"
+            raise OSError(msg)
+        self.driver.current_url = url
+
+    def reset(self) -> None:
+        """Reset the session state."""
+
+    def close(self, _timeout: float = 0) -> None:
+        """Quit the browser."""
+
+
+def extract_links_count(scraper: StaticPageScraper, _url: str) -> int:
+    """Extractor running in a worker process, so it is defined at the module level."""
+    return len(scraper.current_page.find_all("a"))
+
+
+@pytest.fixture(scope="module")
+def pool() -> Generator[ScraperPool, Any, None]:
+    """Pool with two headless Chrome sessions."""
+    with ScraperPool(partial(Scraper.chrome, headless=True), size=2) as scraper_pool:
+        yield scraper_pool
+
+
+def test_pipeline_ordered(pool: ScraperPool, base_url: str) -> None:
+    """Check that the results are parsed in worker processes and returned in the order of URLs."""
+    urls = [f"{base_url}/page_with_many_links?count={count}" for count in range(1, 11)]
+    results = list(ParsePipeline(pool, extract_links_count, processes=2, max_pending=4).run(urls))
+
+    assert [result.url for result in results] == urls
+    assert [result.data for result in results] == list(range(1, 11))
+    assert all(result.error is None for result in results)
+
+
+def test_pipeline_unordered(pool: ScraperPool, base_url: str) -> None:
+    """Check that all results are returned when they are delivered as soon as they are parsed."""
+    urls = [f"{base_url}/page_with_many_links?count={count}" for count in range(1, 11)]
+    results = list(ParsePipeline(pool, extract_links_count, processes=2, ordered=False).run(urls))
+    assert sorted(result.data for result in results) == list(range(1, 11))
+
+
+def test_pipeline_errors(pool: ScraperPool, base_url: str) -> None:
+    """Check that fetch and parse errors are returned in the results."""
+    urls = ["http://127.0.0.1:1/", base_url + "/page_with_various_links"]
+    results = list(ParsePipeline(pool, extract_links_count, processes=1).run(urls))
+
+    assert results[0].error is not None
+    assert results[1].error is None
+    assert results[1].data
+
+
+def test_pipeline_fetch_unexpected_error() -> None:
+    """Check that errors other than WebDriverException are returned in the results and do not stop the pipeline."""
+    urls = ["https://example.com/1", "https://example.com/broken", "https://example.com/3"]
+    with ScraperPool(FakeScraper, size=1) as fake_pool:  # type: ignore[arg-type]
+        results = list(ParsePipeline(fake_pool, extract_links_count, processes=1).run(urls))
+
+    assert [result.url for result in results] == urls
+    assert isinstance(results[1].error, OSError)
+    assert [results[0].data, results[2].data] == [2, 2]
+
+
+def test_pipeline_max_pending(pool: ScraperPool) -> None:
+    """Check that `max_pending` must allow every session to fetch a page."""
+    with pytest.raises(ValueError, match="max_pending"):
+        ParsePipeline(pool, extract_links_count, max_pending=1)
@@ -0,0 +1,147 @@
+import time
+from collections.abc import Generator
+from functools import partial
+from typing import Any
+
+import pytest
+
+from selenium_scraper import CommonScraper, RecoveryPolicy, Scraper, ScraperPool
+from selenium_scraper import pool as pool_module
+
+
+@pytest.fixture(scope="module")
+def pool() -> Generator[ScraperPool, Any, None]:
+    """Pool with one warm headless Chrome session."""
+    with ScraperPool(partial(Scraper.chrome, headless=True), size=1) as scraper_pool:
+        yield scraper_pool
+
+
+def test_pool_lease(pool: ScraperPool, base_url: str) -> None:
+    """Check that a leased scraper works and is returned to the pool."""
+    with pool.lease() as scraper:
+        assert isinstance(scraper, CommonScraper)
+        assert pool.idle == 0
+        scraper.get(base_url + "/ping")
+        assert scraper.current_page.text == "pong"
+    assert pool.idle == 1
+
+
+def test_pool_reset_between_leases(pool: ScraperPool, base_url: str) -> None:
+    """Check that cookies, extra tabs, the response capture and the job settings do not leak to the next lease."""
+    with pool.lease() as scraper:
+        scraper.get(base_url + "/ping")
+        scraper.driver.add_cookie({"name": "session", "value": "secret"})
+        scraper.driver.switch_to.new_window("tab")
+        scraper.recovery = RecoveryPolicy()
+        scraper.start_capture(["*/api/*"])
+
+    with pool.lease() as scraper:
+        assert len(scraper.driver.window_handles) == 1
+        assert scraper.recovery is None
+        assert scraper._capture_script is None  # noqa: SLF001
+        scraper.get(base_url + "/ping")
+        assert scraper.driver.get_cookies() == []
+
+
+def test_pool_acquire_timeout(pool: ScraperPool) -> None:
+    """Check that waiting for a free scraper is limited by timeout."""
+    with pool.lease(), pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+
+
+def test_pool_recycle_after_max_uses() -> None:
+    """Check that a scraper is replaced with a new one after `max_uses` leases."""
+    with ScraperPool(partial(Scraper.chrome, headless=True), size=1, max_uses=1) as pool:
+        with pool.lease() as scraper:
+            first_pid = scraper.driver.service.process.pid
+        with pool.lease(timeout=30) as scraper:
+            assert scraper.driver.service.process.pid != first_pid
+
+
+def test_pool_wrong_size() -> None:
+    """Check that an empty pool cannot be created."""
+    with pytest.raises(ValueError, match="Pool size must be at least 1"):
+        ScraperPool(partial(Scraper.chrome, headless=True), size=0)
+
+
+class FakeScraper:
+    """Scraper without a browser, recording the started and closed sessions."""
+
+    started: list["FakeScraper"] = []  # noqa: RUF012
+    fail_start = False
+    full_reset = True
+
+    def __init__(self) -> None:
+        """Start a session or fail if `fail_start` is set."""
+        if FakeScraper.fail_start:
+            msg = "Browser has failed to start"
+            raise OSError(msg)
+        self.closed = False
+        FakeScraper.started.append(self)
+
+    def reset(self) -> None:
+        """Reset the session state."""
+
+    def close(self, _timeout: float = 0) -> None:
+        """Quit the browser."""
+        self.closed = True
+
+
+@pytest.fixture()
+def fake_scraper(monkeypatch: pytest.MonkeyPatch) -> type[FakeScraper]:
+    """FakeScraper class with no sessions started and short replacement delays."""
+    monkeypatch.setattr(FakeScraper, "started", [])
+    monkeypatch.setattr(pool_module, "REPLACEMENT_BACKOFF", 0.05)
+    return FakeScraper
+
+
+def test_pool_init_failure_closes_sessions(fake_scraper: type[FakeScraper], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the sessions already started are closed when the pool cannot start all sessions."""
+    def factory() -> FakeScraper:
+        if len(fake_scraper.started) == 2:
+            monkeypatch.setattr(fake_scraper, "fail_start", True)
+        return fake_scraper()
+
+    with pytest.raises(OSError, match="failed to start"):
+        ScraperPool(factory, size=3)  # type: ignore[arg-type]
+    assert len(fake_scraper.started) == 2
+    assert all(scraper.closed for scraper in fake_scraper.started)
+
+
+def test_pool_replacement_retry(fake_scraper: type[FakeScraper], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the waiters fail while no session can be started and the replacement is retried."""
+    with ScraperPool(fake_scraper, size=1, max_uses=1) as pool:  # type: ignore[arg-type]
+        monkeypatch.setattr(fake_scraper, "fail_start", True)
+        with pool.lease():
+            pass
+        with pytest.raises(RuntimeError, match="replacements have failed"):
+            pool.acquire(timeout=5)
+
+        monkeypatch.setattr(fake_scraper, "fail_start", False)
+        deadline = time.monotonic() + 5
+        while not pool.idle and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with pool.lease(timeout=5) as scraper:
+            assert id(scraper) == id(fake_scraper.started[1])
+
+
+def test_pool_idle_session_expired(fake_scraper: type[FakeScraper]) -> None:
+    """Check that a session idle for longer than `max_age` is replaced instead of being leased."""
+    with ScraperPool(fake_scraper, size=1, max_age=0.1) as pool:  # type: ignore[arg-type]
+        first_scraper = fake_scraper.started[0]
+        time.sleep(0.2)
+        with pool.lease(timeout=5) as scraper:
+            assert id(scraper) != id(first_scraper)
+        assert first_scraper.closed
+
+
+def test_pool_partial_reset(fake_scraper: type[FakeScraper], monkeypatch: pytest.MonkeyPatch,
+                            caplog: pytest.LogCaptureFixture) -> None:
+    """Check that a session which cannot delete the cookies of all domains is reused with a warning."""
+    monkeypatch.setattr(fake_scraper, "full_reset", False)
+    with ScraperPool(fake_scraper, size=1) as pool:  # type: ignore[arg-type]
+        assert "cannot delete the cookies of all domains" in caplog.text
+        for _ in range(2):
+            with pool.lease(timeout=5) as scraper:
+                assert id(scraper) == id(fake_scraper.started[0])
+        assert len(fake_scraper.started) == 1
@@ -0,0 +1,78 @@
+from collections.abc import Callable
+
+import psutil
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from selenium_scraper import CommonScraper, RecoveryPolicy, Scraper
+
+BROWSERS = [Scraper.chrome, Scraper.firefox]
+
+
+def kill_browser(scraper: CommonScraper) -> None:
+    """Kill the browser processes of the session, the driver is left running."""
+    for process in scraper._driver_process.children(recursive=True):  # noqa: SLF001
+        process.kill()
+    psutil.wait_procs(scraper._driver_process.children(recursive=True), timeout=5)  # noqa: SLF001
+
+
+def test_recovery_policy_delay() -> None:
+    """Check that the delay doubles with every retry up to `max_backoff`."""
+    policy = RecoveryPolicy(backoff=0.5, max_backoff=3.0)
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_is_healthy(scraper: CommonScraper, base_url: str) -> None:
+    """Check that a working session passes the health check."""
+    scraper.get(base_url + "/ping")
+    assert scraper.is_healthy()
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_recover_crashed_browser(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check that `get` restarts the crashed browser, restores the cookies and loads the page."""
+    with browser(headless=True) as scraper:
+        scraper.recovery = RecoveryPolicy(backoff=0.1)
+        scraper.get(base_url + "/ping")
+        scraper.driver.add_cookie({"name": "session", "value": "abc"})
+        scraper.get(base_url + "/ping")
+        driver_pid = scraper.driver.service.process.pid
+
+        kill_browser(scraper)
+        assert not scraper.is_healthy()
+        scraper.get(base_url + "/cookies")
+
+        assert scraper.driver.service.process.pid != driver_pid
+        assert scraper.is_healthy()
+        assert [item.text for item in scraper.current_page.select(".cookie")] == ["session=abc"]
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_recover_exited_driver(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check that a browser with the exited driver is replaced before the page load."""
+    with browser(headless=True) as scraper:
+        scraper.recovery = RecoveryPolicy(backoff=0.1)
+        kill_browser(scraper)
+        scraper._driver_process.kill()  # noqa: SLF001
+        scraper.get(base_url + "/page_with_various_links")
+        assert len(scraper.current_page.find_all("a")) == 7
+
+
+def test_no_recovery_without_policy(base_url: str) -> None:
+    """Check that the errors of a crashed browser are raised without `recovery`."""
+    with Scraper.chrome(headless=True) as scraper:
+        kill_browser(scraper)
+        with pytest.raises(WebDriverException):
+            scraper.get(base_url + "/ping")
+
+
+def test_healthy_session_not_recovered(scraper: CommonScraper, base_url: str) -> None:
+    """Check that page load errors of a working session are raised without the browser restart."""
+    scraper.recovery = RecoveryPolicy(backoff=0.1)
+    driver_pid = scraper.driver.service.process.pid
+    try:
+        with pytest.raises(TimeoutException):
+            scraper.get(base_url + "/page_with_slow_resource", {"delay": "3"}, timeout=1)
+        assert scraper.driver.service.process.pid == driver_pid
+    finally:
+        scraper.recovery = None
@@ -0,0 +1,34 @@
+from collections.abc import Callable
+
+import pytest
+
+from selenium_scraper import CommonScraper, Scraper
+
+BROWSERS = [Scraper.chrome, Scraper.firefox]
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_resources_loaded_by_default(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check that the image and the stylesheet are loaded without blocking."""
+    scraper = browser(headless=True)
+    scraper.get(base_url + "/page_with_resources")
+    assert scraper.driver.execute_script("return document.images[0].naturalWidth") == 1
+    assert scraper.driver.execute_script("return getComputedStyle(document.body).marginTop") == "42px"
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_block_images_and_stylesheets(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check that blocked resources are not loaded."""
+    scraper = browser(headless=True, block_images=True, block_stylesheets=True)
+    scraper.get(base_url + "/page_with_resources")
+    assert scraper.driver.execute_script("return document.images[0].naturalWidth") == 0
+    assert scraper.driver.execute_script("return getComputedStyle(document.body).marginTop") != "42px"
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_blocked_urls(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check blocking by URL pattern."""
+    scraper = browser(headless=True, blocked_urls=["*/static/*"])
+    scraper.get(base_url + "/page_with_resources")
+    assert scraper.driver.execute_script("return document.images[0].naturalWidth") == 0
+    assert scraper.driver.execute_script("return getComputedStyle(document.body).marginTop") != "42px"
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from selenium_scraper import CommonScraper, HostScheduler
+from selenium_scraper.scheduler import TokenBucket
+
+
+def test_token_bucket() -> None:
+    """Check that the burst is given out at once and then tokens are given out at the rate."""
+    bucket = TokenBucket(rate=20, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+
+def test_additive_increase() -> None:
+    """Check that the concurrency limit grows with successful page loads up to the max."""
+    scheduler = HostScheduler(max_concurrency=3)
+    for _ in range(10):
+        with scheduler.slot("https://example.com/"):
+            pass
+
+    assert scheduler.stats()["example.com"].concurrency == 3
+
+
+def test_multiplicative_decrease() -> None:
+    """Check that the concurrency limit is halved after a failure and other hosts are not affected."""
+    scheduler = HostScheduler(initial_concurrency=4)
+    with scheduler.slot("https://example.com/1") as slot:
+        slot.fail()
+    with pytest.raises(TimeoutError), scheduler.slot("https://example.com/2"):
+        raise TimeoutError
+    with scheduler.slot("https://other.example.com/"):
+        pass
+
+    stats = scheduler.stats()
+    assert stats["example.com"].concurrency == 1
+    assert stats["example.com"].failures == 2
+    assert stats["other.example.com"].concurrency == 4
+
+
+def test_latency_overload() -> None:
+    """Check that the concurrency limit is decreased when the page loads become slow."""
+    scheduler = HostScheduler(initial_concurrency=4, latency_tolerance=2)
+    with scheduler.slot("https://example.com/"):
+        time.sleep(0.01)
+    for _ in range(3):
+        with scheduler.slot("https://example.com/"):
+            time.sleep(0.2)
+
+    assert scheduler.stats()["example.com"].concurrency < 4
+
+
+class FakeScraper:
+    """Scraper without a browser loading the pages instantly."""
+
+    def get(self, _url: str, timeout: float = 5.0) -> None:
+        """Load the page."""
+
+
+def test_latency_excludes_error_page_check() -> None:
+    """Check that the time of the error page check is not counted in the page load latency."""
+    def is_error_page(_scraper: CommonScraper) -> bool:
+        time.sleep(0.2)
+        return False
+
+    scheduler = HostScheduler(is_error_page=is_error_page)
+    scheduler.get(FakeScraper(), "https://example.com/")  # type: ignore[arg-type]
+
+    latency = scheduler.stats()["example.com"].latency
+    assert latency is not None
+    assert latency < 0.1
+
+
+def test_concurrency_limit() -> None:
+    """Check that no more than the concurrency limit of page loads of a host run at the same time."""
+    scheduler = HostScheduler(initial_concurrency=2, max_concurrency=2)
+    running = []
+    lock = threading.Lock()
+
+    def load_page() -> None:
+        with scheduler.slot("https://example.com/"):
+            with lock:
+                running.append(scheduler.stats()["example.com"].in_flight)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=load_page) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(running) == 2
+
+
+def test_error_page(scraper: CommonScraper, base_url: str) -> None:
+    """Check that an error page detected after loading is a failure."""
+    scheduler = HostScheduler(initial_concurrency=2,
+                              is_error_page=lambda scraper: "Too Many Requests" in scraper.driver.title)
+    scheduler.get(scraper, base_url + "/page_with_various_links")
+    scheduler.get(scraper, base_url + "/throttled")
+
+    stats = scheduler.stats()["127.0.0.1"]
+    assert stats.failures == 1
+    assert stats.concurrency == 1
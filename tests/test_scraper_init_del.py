@@ -1,9 +1,15 @@
+import gc
+import time
+import timeit
 from typing import Any
+from unittest.mock import Mock
 
 import psutil
 import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 
-from selenium_scraper import Scraper
+from selenium_scraper import ChromeScraper, Scraper, close_all_scrapers
 
 
 def test_scraper_init_del() -> None:
@@ -55,3 +61,45 @@ def test_del_scraper_process_running_children(monkeypatch: pytest.MonkeyPatch) -
         psutil.Process(process)
     # 2 children + 1 self._driver_process.kill()
     assert n_processes + 1 == 0
+
+
+def test_scraper_context_manager() -> None:
+    """Check that the browser is closed at the end of the `with` block."""
+    with Scraper.chrome(headless=True) as scraper:
+        process = scraper.driver.service.process.pid
+    with pytest.raises(psutil.NoSuchProcess):
+        psutil.Process(process)
+    # Repeated close does nothing
+    scraper.close()
+
+
+def test_close_hanging_quit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the processes are killed when `quit` does not finish within the timeout."""
+    scraper = Scraper.chrome(headless=True)
+    process = scraper.driver.service.process.pid
+    monkeypatch.setattr(webdriver.Chrome, "quit", lambda _: time.sleep(10))
+
+    start_time = timeit.default_timer()
+    scraper.close(timeout=0.5)
+    assert timeit.default_timer() - start_time < 3
+    with pytest.raises(psutil.NoSuchProcess):
+        psutil.Process(process).wait(timeout=1)
+
+
+def test_close_all_scrapers() -> None:
+    """Check that all running scrapers are closed."""
+    scrapers = [Scraper.chrome(headless=True) for _ in range(2)]
+    processes = [scraper.driver.service.process.pid for scraper in scrapers]
+    close_all_scrapers()
+    for process in processes:
+        with pytest.raises(psutil.NoSuchProcess):
+            psutil.Process(process)
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_del_scraper_failed_init(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that the exception does not occur in `__del__` if the browser has not been started."""
+    monkeypatch.setattr(ChromeScraper, "_browser", Mock(side_effect=WebDriverException("Failed to start")))
+    with pytest.raises(WebDriverException):
+        Scraper.chrome(headless=True)
+    gc.collect()
@@ -3,16 +3,17 @@ import timeit
 import pytest
 
 from selenium_scraper import CommonScraper
-from selenium_scraper.mapping import ScrollMethods
+from selenium_scraper.mapping import ScrollMethods, WaitMethods
 
 
+@pytest.mark.parametrize("wait_method", [WaitMethods.mutations, WaitMethods.scroll_height])
 @pytest.mark.parametrize("method", [ScrollMethods.end_key, ScrollMethods.js_instant, ScrollMethods.js_smooth])
-def test_scroll_infinite_page_methods(scraper: CommonScraper, base_url: str, method: str) -> None:
+def test_scroll_infinite_page_methods(scraper: CommonScraper, base_url: str, method: str, wait_method: str) -> None:
     """Checks for scrolling down an infinite page with different methods."""
     n_scrolls = 2
 
     scraper.get(base_url + "/infinite_page")
-    scraper.scroll_infinite_page(n_scrolls, 2, method)
+    scraper.scroll_infinite_page(n_scrolls, 2, method, wait_method)
 
     paragraphs = scraper.current_page.find_all("div", {"class": "paragraph"})
     assert len(paragraphs) - 1 >= n_scrolls
@@ -27,6 +28,27 @@ def test_scroll_infinite_page_wrong_method(scraper: CommonScraper, base_url: str
         scraper.scroll_infinite_page(n_scrolls, 2, "my_method")
 
 
+def test_scroll_infinite_page_wrong_wait_method(scraper: CommonScraper, base_url: str) -> None:
+    """Checks for scrolling down an infinite page with wrong wait method."""
+    scraper.get(base_url + "/infinite_page")
+    with pytest.raises(ValueError, match="Invalid wait method"):
+        scraper.scroll_infinite_page(1, 2, ScrollMethods.js_instant, "my_wait_method")
+
+
+def test_scroll_infinite_page_quiet_period(scraper: CommonScraper, base_url: str) -> None:
+    """Checks that scrolling ends when the content settles instead of the timeout."""
+    n_scrolls = 2
+    timeout = 5
+
+    scraper.get(base_url + "/infinite_page")
+    s_t = timeit.default_timer()
+    scraper.scroll_infinite_page(n_scrolls, timeout, ScrollMethods.js_instant, WaitMethods.mutations, 0.2)
+    e_t = timeit.default_timer()
+
+    assert e_t - s_t < timeout
+    assert len(scraper.current_page.find_all("div", {"class": "paragraph"})) - 1 >= n_scrolls
+
+
 def test_scroll_infinite_page_timeout_error(scraper: CommonScraper, base_url: str) -> None:
     """Checks for scrolling down an infinite page which causes TimeoutException."""
     n_scrolls = 2
@@ -40,3 +62,14 @@ def test_scroll_infinite_page_timeout_error(scraper: CommonScraper, base_url: st
 
     duration = int(e_t - s_t)
     assert duration == timeout
+
+
+def test_scroll_infinite_page_script_timeout(scraper: CommonScraper, base_url: str) -> None:
+    """Checks that the script timeout raised for waiting for new content is restored."""
+    scraper.get(base_url + "/infinite_page")
+    scraper.driver.set_script_timeout(1)
+    try:
+        scraper.scroll_infinite_page(1, 2, ScrollMethods.js_instant, WaitMethods.mutations)
+        assert scraper.driver.timeouts.script == 1
+    finally:
+        scraper.driver.set_script_timeout(30)
@@ -0,0 +1,79 @@
+import pickle
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from selenium_scraper import CommonScraper, Scraper, ShardedCrawler, ShardedFrontier
+
+
+def test_frontier_shards(tmp_path: Path) -> None:
+    """Check that URLs of the same host are in the same shard and given out breadth-first."""
+    frontier = ShardedFrontier(tmp_path / "frontier.db", shards=4)
+    assert frontier.push_many(["https://a.example.com/2", "https://a.example.com/1"], depth=1) == 2
+    assert frontier.push("https://a.example.com/")
+    assert not frontier.push("HTTPS://a.example.com:443/#top")
+    shard = frontier.shard_of("https://a.example.com/")
+    assert {frontier.shard_of(f"https://a.example.com/{i}") for i in range(10)} == {shard}
+
+    other_shards = [other_shard for other_shard in range(4) if other_shard != shard]
+    assert frontier.pop(other_shards) is None
+    assert frontier.pop([shard]) == ("https://a.example.com/", 0)
+    assert frontier.pop([shard]) == ("https://a.example.com/2", 1)
+    assert len(frontier) == 1
+
+
+def test_frontier_persistence(tmp_path: Path) -> None:
+    """Check that the crawl state is shared through the database and URLs in progress can be released."""
+    path = tmp_path / "frontier.db"
+    frontier = ShardedFrontier(path)
+    frontier.push_many(["https://example.com/1", "https://example.com/2"])
+    assert frontier.pop([0]) == ("https://example.com/1", 0)
+    frontier.task_done("https://example.com/1")
+    assert frontier.pop([0]) == ("https://example.com/2", 0)
+
+    other_frontier = pickle.loads(pickle.dumps(frontier))  # noqa: S301
+    assert not other_frontier.push("https://example.com/1")
+    assert other_frontier.pop([0]) is None
+    assert not other_frontier.is_finished()
+    assert other_frontier.release([0]) == 1
+    assert other_frontier.pop([0]) == ("https://example.com/2", 0)
+    other_frontier.task_done("https://example.com/2")
+    assert frontier.is_finished()
+    assert frontier.popped == 3
+
+    with pytest.raises(ValueError, match="shards"):
+        ShardedFrontier(path, shards=2)
+
+
+def test_frontier_limits(tmp_path: Path) -> None:
+    """Check the depth and page limits and closing."""
+    frontier = ShardedFrontier(tmp_path / "frontier.db", max_depth=1, max_pages=2)
+    assert not frontier.push("https://example.com/deep", depth=2)
+    frontier.push_many(f"https://example.com/{i}" for i in range(3))
+    assert frontier.pop([0]) is not None
+    frontier.close()
+    assert frontier.closed
+    assert frontier.pop([0]) is None
+    frontier.reopen()
+    assert frontier.pop([0]) is not None
+    assert frontier.pop([0]) is None
+    assert frontier.is_finished()
+
+
+def handler(scraper: CommonScraper, _url: str) -> str:
+    """Handler of the crawled pages, defined at the module level to be passed to the worker processes."""
+    return scraper.driver.current_url
+
+
+def test_sharded_crawl(tmp_path: Path, base_url: str) -> None:
+    """Check crawling of the local web application with two worker processes."""
+    crawler = ShardedCrawler(partial(Scraper.chrome, headless=True), handler,
+                             database=tmp_path / "frontier.db", processes=2, max_depth=1)
+    results = list(crawler.crawl([base_url + "/page_with_various_links"]))
+
+    assert {result.url for result in results} == {base_url + "/page_with_various_links", base_url + "/",
+                                                   base_url + "/about", base_url + "/page3"}
+    assert all(result.error is None and result.data == result.url for result in results)
+    assert crawler.frontier.is_finished()
+    assert list(crawler.crawl([base_url + "/page_with_various_links"])) == []
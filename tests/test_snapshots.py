@@ -0,0 +1,128 @@
+import gzip
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from selenium_scraper import CommonScraper, ReplayScraper, Scraper, SnapshotStore
+from selenium_scraper.snapshots import SnapshotNotFoundError
+
+PAGE_SOURCE = """<html><body>
+<div class="item"><a href="/about">about</a></div>
+<div class="item"><a href="https://github.com/nparamonov">github</a></div>
+</body></html>"""
+
+
+def test_snapshot_store_save_load(tmp_path: Path) -> None:
+    """Check that the page is found by the equivalent URL."""
+    store = SnapshotStore(tmp_path)
+    store.save("https://example.com/page?b=2&a=1", PAGE_SOURCE, "https://example.com/final")
+
+    snapshot = store.load("https://example.com/page", {"a": "1", "b": "2"})
+    assert snapshot is not None
+    assert snapshot.page_source == PAGE_SOURCE
+    assert snapshot.final_url == "https://example.com/final"
+    assert store.load("https://example.com/other") is None
+    assert store.size > 0
+
+
+@pytest.mark.parametrize("data", [b"not gzip", gzip.compress(b"{}")[:-4], gzip.compress(b"{not json"),
+                                  gzip.compress(b'{"page_source": ""}'), gzip.compress(b"[]")])
+def test_snapshot_store_corrupt_file(tmp_path: Path, data: bytes) -> None:
+    """Check that a corrupt snapshot file is removed and treated as not recorded."""
+    store = SnapshotStore(tmp_path)
+    store.save("https://example.com/page", PAGE_SOURCE)
+    path = next(tmp_path.glob("*/*"))
+    path.write_bytes(data)
+
+    assert store.load("https://example.com/page") is None
+    assert not path.exists()
+
+
+def test_snapshot_store_evicted_while_loaded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check that a snapshot removed by another process after it has been read is still returned."""
+    store = SnapshotStore(tmp_path)
+    store.save("https://example.com/page", PAGE_SOURCE)
+    read_bytes = Path.read_bytes
+
+    def read_and_evict(path: Path) -> bytes:
+        data = read_bytes(path)
+        path.unlink()
+        return data
+
+    monkeypatch.setattr(Path, "read_bytes", read_and_evict)
+    snapshot = store.load("https://example.com/page")
+    assert snapshot is not None
+    assert snapshot.page_source == PAGE_SOURCE
+
+
+def test_snapshot_store_ttl(tmp_path: Path) -> None:
+    """Check that expired snapshots are not returned and are evicted."""
+    store = SnapshotStore(tmp_path, ttl=60)
+    store.save("https://example.com/page", PAGE_SOURCE)
+    assert "https://example.com/page" in store
+
+    for path in tmp_path.glob("*/*"):
+        os.utime(path, (time.time(), time.time() - 120))
+    store.evict()
+    assert store.size == 0
+
+
+def test_snapshot_store_max_size(tmp_path: Path) -> None:
+    """Check that the least recently used snapshots are evicted above `max_size`."""
+    store = SnapshotStore(tmp_path)
+    store.save("https://example.com/1", PAGE_SOURCE)
+    # Room for two snapshots, the compressed sizes of the snapshots differ slightly
+    max_size = store.size * 5 // 2
+
+    store = SnapshotStore(tmp_path, max_size=max_size)
+    store.save("https://example.com/2", PAGE_SOURCE)
+    for path in tmp_path.glob("*/*"):
+        os.utime(path, (time.time() - 10, path.stat().st_mtime))
+    assert store.load("https://example.com/1") is not None
+    store.save("https://example.com/3", PAGE_SOURCE)
+
+    assert store.size <= max_size
+    assert "https://example.com/1" in store
+    assert "https://example.com/2" not in store
+    assert "https://example.com/3" in store
+
+
+def test_replay_scraper(tmp_path: Path) -> None:
+    """Check `get`, `current_page`, `get_all_links` and `get_page_fragment` on the recorded page."""
+    store = SnapshotStore(tmp_path)
+    store.save("https://example.com/page?id=1", PAGE_SOURCE, "https://example.com/page/1")
+
+    scraper = Scraper.replay(store)
+    scraper.get("https://example.com/page", {"id": "1"})
+
+    assert len(scraper.current_page.find_all("div", {"class": "item"})) == 2
+    links = scraper.get_all_links()
+    assert links.internal == {"https://example.com/about"}
+    assert links.external == {"https://github.com/nparamonov"}
+    assert len(scraper.get_page_fragment("body, div.item").find_all("a")) == 2
+
+
+def test_replay_scraper_not_recorded(tmp_path: Path) -> None:
+    """Check that the missing page raises SnapshotNotFoundError."""
+    scraper = ReplayScraper(SnapshotStore(tmp_path))
+    with pytest.raises(SnapshotNotFoundError):
+        scraper.get("https://example.com/page")
+
+
+def test_record_and_replay(scraper: CommonScraper, base_url: str, tmp_path: Path) -> None:
+    """Check that pages loaded in the browser are replayed without it."""
+    store = SnapshotStore(tmp_path)
+    scraper.snapshot_store = store
+    try:
+        scraper.get(base_url + "/page_with_various_links")
+    finally:
+        scraper.snapshot_store = None
+    browser_links = scraper.get_all_links()
+
+    replay_scraper = Scraper.replay(store)
+    replay_scraper.get(base_url + "/page_with_various_links")
+    replay_links = replay_scraper.get_all_links()
+    assert replay_links.internal == browser_links.internal
+    assert replay_links.external == browser_links.external
@@ -0,0 +1,79 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from selenium_scraper import ChromeScraper, FirefoxScraper, Scraper, StartupCache
+from selenium_scraper.startup import CHROME_STARTUP_ARGUMENTS
+
+
+def test_startup_cache_paths(tmp_path: Path) -> None:
+    """Check that the resolved paths are cached on disk and set to the service and options."""
+    driver_path = shutil.which("sh") or sys.executable
+    cache = StartupCache(tmp_path)
+    cache.resolve_paths(ChromeService(driver_path), ChromeOptions())
+    assert json.loads(Path(tmp_path, "paths.json").read_text())["chrome:"]["driver_path"] == driver_path
+
+    # Another process with the same cache directory
+    service = ChromeService()
+    StartupCache(tmp_path).resolve_paths(service, ChromeOptions())
+    assert service.path == driver_path
+
+
+def test_startup_cache_profile(tmp_path: Path) -> None:
+    """Check that the template is created once and copied without lock files."""
+    calls = []
+
+    def init_profile(browser_path: str, directory: Path) -> None:
+        calls.append(browser_path)
+        Path(directory, "Local State").write_text("{}")
+        Path(directory, "SingletonLock").write_text("")
+
+    cache = StartupCache(tmp_path)
+    profiles = [cache.new_profile("chrome", "/usr/bin/chrome", init_profile) for _ in range(2)]
+    try:
+        assert calls == ["/usr/bin/chrome"]
+        assert profiles[0] != profiles[1]
+        for profile in profiles:
+            assert Path(profile, "Local State").is_file()
+            assert not Path(profile, "SingletonLock").exists()
+    finally:
+        for profile in profiles:
+            shutil.rmtree(profile)
+
+
+def test_startup_cache_profile_failure(tmp_path: Path) -> None:
+    """Check that a profile which the browser has failed to initialize is not used as the template."""
+    def init_profile(browser_path: str, directory: Path) -> None:
+        Path(directory, "Local State").write_text("{}")
+        raise subprocess.CalledProcessError(1, [browser_path])
+
+    cache = StartupCache(tmp_path)
+    with pytest.raises(RuntimeError, match="Failed to create profile template"):
+        cache.new_profile("chrome", "/usr/bin/chrome", init_profile)
+    assert not list(Path(tmp_path, "profiles").iterdir())
+
+
+@pytest.mark.parametrize("browser", [Scraper.chrome, Scraper.firefox])
+def test_scraper_with_startup_cache(browser: type[ChromeScraper | FirefoxScraper],
+                                    tmp_path: Path,
+                                    base_url: str) -> None:
+    """Check that the scrapers start with the cache and remove their profile copies when closed."""
+    cache = StartupCache(tmp_path)
+    with browser(headless=True, startup_cache=cache) as scraper:
+        scraper.get(base_url + "/page_with_various_links")
+        assert scraper.current_page.select_one("a") is not None
+        profile_dir = scraper._profile_dir  # noqa: SLF001
+        assert profile_dir is not None
+        assert profile_dir.is_dir()
+    assert not profile_dir.exists()
+
+    with browser(headless=True, startup_cache=cache) as scraper:
+        if isinstance(scraper.driver.options, ChromeOptions):
+            assert set(CHROME_STARTUP_ARGUMENTS) <= set(scraper.driver.options.arguments)
+        scraper.get(base_url + "/page_with_various_links")
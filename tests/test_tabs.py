@@ -0,0 +1,67 @@
+import timeit
+from collections.abc import Callable
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from selenium_scraper import CommonScraper, Scraper, TabMultiplexer
+from selenium_scraper.conditions import SelectorPresent
+from selenium_scraper.mapping import PageLoadStrategies
+
+BROWSERS = [Scraper.chrome, Scraper.firefox]
+
+
+def extract_title(scraper: CommonScraper, _url: str) -> str:
+    """Text of the first header of the page."""
+    header = scraper.current_page.h1
+    return header.text if header is not None else ""
+
+
+@pytest.mark.parametrize("browser", BROWSERS)
+def test_tabs_concurrent(browser: Callable[..., CommonScraper], base_url: str) -> None:
+    """Check that the pages are loaded at the same time in the tabs of one browser."""
+    # Different URLs of the slow image, so that the browser does not wait for the cached response
+    urls = [f"{base_url}/page_with_slow_resource?delay=1.{i}" for i in range(4)]
+    with browser(headless=True, page_load_strategy=PageLoadStrategies.none) as scraper:
+        with TabMultiplexer(scraper, tabs=4) as tabs:
+            s_t = timeit.default_timer()
+            results = list(tabs.run(urls, extract_title))
+            e_t = timeit.default_timer()
+            assert len(scraper.driver.window_handles) == 4
+
+        assert len(scraper.driver.window_handles) == 1
+    assert e_t - s_t < 3
+    assert sorted(result.url for result in results) == urls
+    assert all(result.data == "Slow page" and result.error is None for result in results)
+
+
+def test_tabs_more_urls_than_tabs(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the free tabs load the next URLs and the errors of the handler are returned."""
+    def handler(scraper: CommonScraper, url: str) -> int:
+        if url.endswith("/page_with_products"):
+            msg = "Handler error"
+            raise ValueError(msg)
+        links = scraper.get_all_links()
+        return len(links.internal) + len(links.external)
+
+    urls = [base_url + "/page_with_various_links", base_url + "/page_with_products",
+            base_url + "/page_with_many_links?count=9"]
+    with TabMultiplexer(scraper, tabs=2) as tabs:
+        results = {result.url: result for result in tabs.run(urls, handler)}
+
+    assert set(results) == set(urls)
+    assert isinstance(results[base_url + "/page_with_products"].error, ValueError)
+    assert results[base_url + "/page_with_many_links?count=9"].data == 9
+    assert results[base_url + "/page_with_various_links"].error is None
+    assert len(scraper.driver.window_handles) == 1
+
+
+def test_tabs_not_ready(scraper: CommonScraper, base_url: str) -> None:
+    """Check that a page not ready in time is returned with TimeoutException and the session timeout is restored."""
+    page_load_timeout = scraper.driver.timeouts.page_load
+    with TabMultiplexer(scraper, tabs=2, timeout=0.5, ready=SelectorPresent(".missing")) as tabs:
+        results = list(tabs.run([base_url + "/page_with_various_links"], extract_title))
+
+    assert scraper.driver.timeouts.page_load == page_load_timeout
+    assert len(results) == 1
+    assert isinstance(results[0].error, TimeoutException)
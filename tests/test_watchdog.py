@@ -0,0 +1,88 @@
+import time
+
+import psutil
+
+from selenium_scraper import CommonScraper
+from selenium_scraper.metrics import HistogramSink, registry
+from selenium_scraper.watchdog import BrowserWatchdog
+
+
+def test_watchdog_max_rss() -> None:
+    """Check that the restart is requested when RSS exceeds the limit and the flag is reset by `watch`."""
+    process = psutil.Process()
+    watchdog = BrowserWatchdog(process, max_rss=1)
+    sample = watchdog.sample()
+    assert sample.rss > 1
+    assert sample.processes >= 1
+    assert watchdog.last_sample == sample
+    assert watchdog.restart_needed
+
+    watchdog.watch(process)
+    assert not watchdog.restart_needed
+
+
+def test_watchdog_cpu_patience() -> None:
+    """Check that short CPU spikes are tolerated."""
+    watchdog = BrowserWatchdog(psutil.Process(), max_cpu_percent=-1, cpu_patience=3)
+    watchdog.sample()
+    watchdog.sample()
+    assert not watchdog.restart_needed
+    watchdog.sample()
+    assert watchdog.restart_needed
+
+
+def test_watchdog_metrics() -> None:
+    """Check that the samples are passed to the metrics sinks as gauges."""
+    sink = HistogramSink()
+    registry.add_sink(sink)
+    try:
+        BrowserWatchdog(psutil.Process(), labels=(("browser", "test"),)).sample()
+    finally:
+        registry.remove_sink(sink)
+
+    rss = sink.gauge("browser_rss_bytes", browser="test")
+    assert rss is not None
+    assert rss > 0
+    processes = sink.gauge("browser_processes")
+    assert processes is not None
+    assert processes >= 1
+
+
+def test_watchdog_thread() -> None:
+    """Check sampling in the background thread."""
+    watchdog = BrowserWatchdog(psutil.Process(), max_rss=1, interval=0.01)
+    watchdog.start()
+    time.sleep(0.2)
+    watchdog.stop()
+    assert watchdog.restart_needed
+    assert len(watchdog.samples) > 1
+
+
+def test_restart(scraper: CommonScraper, base_url: str) -> None:
+    """Check that the restarted browser has the cookies and the page of the old one."""
+    scraper.get(base_url + "/page_with_various_links")
+    scraper.driver.add_cookie({"name": "session", "value": "42"})
+    old_pid = scraper.driver.service.process.pid
+
+    scraper.restart()
+
+    assert scraper.driver.service.process.pid != old_pid
+    assert scraper.driver.current_url == base_url + "/page_with_various_links"
+    cookie = scraper.driver.get_cookie("session")
+    assert cookie is not None
+    assert cookie["value"] == "42"
+    scraper.reset()
+
+
+def test_get_restarts_browser_over_limit(scraper: CommonScraper, base_url: str) -> None:
+    """Check that `get` restarts the browser when the watchdog has detected too much memory usage."""
+    old_pid = scraper.driver.service.process.pid
+    watchdog = scraper.start_watchdog(max_rss=1, interval=0.05)
+    try:
+        time.sleep(0.2)
+        assert watchdog.restart_needed
+        scraper.get(base_url + "/page_with_various_links")
+        assert scraper.driver.service.process.pid != old_pid
+        assert scraper.current_page.select_one("a") is not None
+    finally:
+        scraper.stop_watchdog()
@@ -1,14 +1,19 @@
 """Web application for tests."""
 
+import asyncio
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI, responses
+from fastapi import Cookie, FastAPI, responses
+from fastapi.staticfiles import StaticFiles
 
 app = FastAPI()
 
 CURRENT_PATH = Path(__file__).absolute().parent
 TEMPLATES_PATH = Path(CURRENT_PATH, "templates")
+STATIC_PATH = Path(CURRENT_PATH, "static")
+
+app.mount("/static", StaticFiles(directory=STATIC_PATH), name="static")
 
 
 def html_response_from_file(file_name: str) -> responses.HTMLResponse:
@@ -40,5 +45,150 @@ def page_with_various_links() -> responses.HTMLResponse:
     return html_response_from_file("page_with_various_links.html")
 
 
+@app.get("/page_with_resources")
+def page_with_resources() -> responses.HTMLResponse:
+    """Returns a page with an image and a stylesheet."""
+    return html_response_from_file("page_with_resources.html")
+
+
+@app.get("/page_with_slow_resource")
+def page_with_slow_resource(delay: float = 2) -> responses.HTMLResponse:
+    """Returns a page with a title and an image loading for `delay` seconds."""
+    return responses.HTMLResponse(f"""<!DOCTYPE html><html><body>
+        <h1 class="title">Slow page</h1><img src="/slow_resource?delay={delay}" alt="slow image">
+    </body></html>""")
+
+
+@app.get("/slow_resource")
+async def slow_resource(delay: float = 2) -> responses.FileResponse:
+    """Returns an image after `delay` seconds."""
+    await asyncio.sleep(delay)
+    return responses.FileResponse(Path(STATIC_PATH, "image.png"))
+
+
+@app.get("/page_with_many_links")
+def page_with_many_links(count: int = 1000) -> responses.HTMLResponse:
+    """Returns a large page with `count` internal and external links."""
+    links = []
+    for i in range(count):
+        if i % 3 == 0:
+            links.append(f'<div class="item"><p>Item {i}</p><a href="/item/{i}">item {i}</a></div>')
+        elif i % 3 == 1:
+            links.append(f'<div class="item"><p>Item {i}</p><a href="/item/{i}?page={i}#details">item {i}</a></div>')
+        else:
+            links.append(f'<div class="item"><p>Item {i}</p><a href="https://example.com/{i}">external {i}</a></div>')
+    return responses.HTMLResponse(f"<!DOCTYPE html><html><body>{''.join(links)}</body></html>")
+
+
+@app.get("/page_with_huge_dom")
+def page_with_huge_dom(depth: int = 4, breadth: int = 10) -> responses.HTMLResponse:
+    """Returns a page with a tree of nested elements: `breadth` children on each of `depth` levels."""
+    def tree(level: int, path: str) -> str:
+        if level == depth:
+            return f'<span class="leaf">Leaf {path}</span>'
+        children = "".join(tree(level + 1, f"{path}.{i}") for i in range(breadth))
+        return f'<div class="node level-{level}">{children}</div>'
+
+    return responses.HTMLResponse(f"<!DOCTYPE html><html><body>{tree(0, '0')}</body></html>")
+
+
+@app.get("/infinite_feed")
+def infinite_feed(latency: float = 0.1, page_size: int = 20, pages: int = 100) -> responses.HTMLResponse:
+    """Returns a feed loading `page_size` items from `/feed_items` when scrolled to the bottom, up to `pages` times.
+
+    Every request of the items takes `latency` seconds.
+    """
+    return responses.HTMLResponse(f"""<!DOCTYPE html><html><body>
+        <div class="feed"></div>
+        <script type="text/javascript">
+            var loadedPages = 0;
+            var loading = false;
+
+            function loadItems() {{
+              if (loading || loadedPages >= {pages}) return;
+              loading = true;
+              fetch('/feed_items?offset=' + loadedPages * {page_size} + '&count={page_size}&latency={latency}')
+                .then(function(response) {{ return response.text(); }})
+                .then(function(items) {{
+                  document.querySelector('.feed').insertAdjacentHTML('beforeend', items);
+                  loadedPages++;
+                  loading = false;
+                }});
+            }}
+
+            window.addEventListener('scroll', function() {{
+              if (window.pageYOffset + window.innerHeight >= document.documentElement.scrollHeight - 10) {{
+                loadItems();
+              }}
+            }});
+            loadItems();
+        </script>
+    </body></html>""")
+
+
+@app.get("/feed_items")
+async def feed_items(offset: int = 0, count: int = 20, latency: float = 0.1) -> responses.HTMLResponse:
+    """Returns `count` feed items after `latency` seconds."""
+    await asyncio.sleep(latency)
+    return responses.HTMLResponse("".join(
+        f'<div class="post" style="height: 200px"><p>Post {i}</p><a href="/post/{i}">post {i}</a></div>'
+        for i in range(offset, offset + count)
+    ))
+
+
+
+@app.get("/page_with_products")
+def page_with_products() -> responses.HTMLResponse:
+    """Returns a page with a list of products for the extraction of structured data."""
+    return html_response_from_file("page_with_products.html")
+
+
+@app.get("/json_feed")
+def json_feed() -> responses.HTMLResponse:
+    """Returns a page rendering the items loaded from the JSON API with fetch and XMLHttpRequest."""
+    return responses.HTMLResponse("""<!DOCTYPE html><html><body>
+        <div id="feed"></div>
+        <script>
+            const render = (items) => {
+                const feed = document.getElementById("feed");
+                for (const item of items) {
+                    feed.insertAdjacentHTML("beforeend", `<p class="post">${item.title}</p>`);
+                }
+            };
+            fetch("/api/feed_items?offset=0").then((response) => response.json()).then((data) => {
+                render(data.items);
+                const request = new XMLHttpRequest();
+                request.open("GET", "/api/feed_items?offset=2");
+                request.onload = () => render(JSON.parse(request.responseText).items);
+                request.send();
+            });
+        </script>
+    </body></html>""")
+
+
+@app.get("/api/feed_items")
+def api_feed_items(offset: int = 0, count: int = 2) -> dict[str, list[dict[str, str | int]]]:
+    """Returns `count` feed items as JSON."""
+    return {"items": [{"id": i, "title": f"Post {i}"} for i in range(offset, offset + count)]}
+
+
+@app.get("/throttled")
+def throttled() -> responses.HTMLResponse:
+    """Returns an error page of a server limiting the request rate."""
+    return responses.HTMLResponse("<!DOCTYPE html><html><head><title>429 Too Many Requests</title></head>"
+                                  "<body><h1>Too Many Requests</h1></body></html>", status_code=429)
+
+
+@app.get("/cookies")
+def cookies(served: str | None = Cookie(None), session: str | None = Cookie(None)) -> responses.HTMLResponse:
+    """Returns a page listing the cookies 'served' and 'session' of the request and sets the cookie 'served'."""
+    request_cookies = {"served": served, "session": session}
+    items = "".join(f'<li class="cookie">{name}={value}</li>' for name, value in request_cookies.items()
+                    if value is not None)
+    response = responses.HTMLResponse(f"<!DOCTYPE html><html><body><ul>{items}</ul></body></html>")
+    response.set_cookie("served", "1")
+    return response
+
+
 if __name__ == "__main__":
     uvicorn.run("app:app", host="127.0.0.1", port=8000)